@@ -0,0 +1,160 @@
+# asset_manager.py
+import pygame
+
+
+class AssetManager:
+    """
+    Process-wide store of loaded images and sounds.
+
+    Every file is read, decoded and converted once; `image` with a `size`
+    scales the cached original once more and keeps that copy too. All
+    callers get the same Surface / Sound objects, so they must treat them
+    as read-only (copy before recolouring or drawing onto one).
+
+    With a texture atlas added (`add_atlas`), images packed into it are
+    sliced out of its pages instead of being read from their own files.
+
+    `stats()` reports how many files were actually loaded versus served
+    from the cache, and roughly how many bytes the cached assets hold.
+    """
+
+    def __init__(self):
+        self._images = {}   # (path, size, alpha) -> Surface
+        self._sounds = {}   # path -> Sound, or None when it failed to load
+        self._frames = {}   # (paths, size, alpha) -> [Surface]
+        self._atlases = []  # texture_atlas.TextureAtlas, searched in order
+        self.loads = 0      # files read from disk
+        self.hits = 0       # requests served from the cache
+        self.failures = 0   # files that were missing or unreadable
+        self.from_atlas = 0 # images sliced out of an atlas
+        self.image_bytes = 0
+        self.sound_bytes = 0
+
+    # -------------------------------------------------------------------------
+    def add_atlas(self, atlas):
+        """Serve the images packed in `atlas` from its pages (None is ignored)."""
+        if atlas is not None:
+            self._atlases.append(atlas)
+            self.image_bytes += atlas.page_bytes()
+
+    def _from_atlas(self, path, alpha):
+        if alpha:
+            for atlas in self._atlases:
+                if path in atlas:
+                    self.from_atlas += 1
+                    return atlas.frame(path)
+        return None
+
+    def image(self, path, size=None, alpha=True, fallback=None):
+        """
+        The image at `path`, converted for the display (with per-pixel alpha
+        unless alpha=False) and scaled to `size` if given.
+
+        A missing file raises like pygame.image.load, unless `fallback`
+        (a Surface, or a function making one) is given; the fallback is then
+        cached under this path so the disk is only tried once.
+        """
+        key = (path, tuple(size) if size else None, alpha)
+        surface = self._images.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        if size:
+            try:
+                original = self.image(path, None, alpha)
+            except (pygame.error, OSError):
+                if fallback is None:
+                    raise
+                original = fallback() if callable(fallback) else fallback
+            surface = pygame.transform.scale(original, key[1])
+        else:
+            surface = self._from_atlas(path, alpha)
+            if surface is not None:
+                # Shares the page's pixels, which add_atlas already counted
+                self._images[key] = surface
+                return surface
+            try:
+                surface = pygame.image.load(path)
+                surface = surface.convert_alpha() if alpha else surface.convert()
+                self.loads += 1
+            except (pygame.error, OSError):
+                self.failures += 1
+                if fallback is None:
+                    raise
+                surface = fallback() if callable(fallback) else fallback
+
+        self._images[key] = surface
+        self.image_bytes += surface.get_width() * surface.get_height() * surface.get_bytesize()
+        return surface
+
+    def frames(self, paths, size=None, alpha=True):
+        """
+        Animation frames loaded from `paths` in order (see `image`). Missing
+        files are reported once and left out of the list, which is shared
+        by every caller asking for the same paths.
+        """
+        key = (tuple(paths), tuple(size) if size else None, alpha)
+        frames = self._frames.get(key)
+        if frames is not None:
+            self.hits += 1
+            return frames
+
+        frames = []
+        for path in key[0]:
+            try:
+                frames.append(self.image(path, size, alpha))
+            except (pygame.error, OSError):
+                print(f"⚠ Missing asset: {path}")
+        self._frames[key] = frames
+        return frames
+
+    def sound(self, path, volume=None):
+        """
+        The Sound at `path`, or None if it can't be loaded (no file, no mixer).
+        `volume` is set when it's first loaded; it applies to every user.
+        """
+        if path in self._sounds:
+            self.hits += 1
+            return self._sounds[path]
+
+        try:
+            sound = pygame.mixer.Sound(path)
+            self.loads += 1
+        except (pygame.error, OSError):
+            self.failures += 1
+            sound = None
+        else:
+            if volume is not None:
+                sound.set_volume(volume)
+            mixer = pygame.mixer.get_init()
+            if mixer:
+                freq, bits, channels = mixer
+                self.sound_bytes += int(sound.get_length() * freq) * (abs(bits) // 8) * channels
+        self._sounds[path] = sound
+        return sound
+
+    # -------------------------------------------------------------------------
+    def clear(self):
+        """Forget every cached asset (they are reloaded on next use)."""
+        self._images.clear()
+        self._sounds.clear()
+        self._frames.clear()
+        self.image_bytes = sum(atlas.page_bytes() for atlas in self._atlases)
+        self.sound_bytes = 0
+
+    def stats(self):
+        return {
+            "images": len(self._images),
+            "sounds": sum(1 for s in self._sounds.values() if s is not None),
+            "loads": self.loads,
+            "hits": self.hits,
+            "failures": self.failures,
+            "from_atlas": self.from_atlas,
+            "image_bytes": self.image_bytes,
+            "sound_bytes": self.sound_bytes,
+        }
+
+
+# Shared by every entity, weapon and level in the game
+ASSETS = AssetManager()
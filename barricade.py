@@ -1,7 +1,13 @@
 # barricade.py
 import pygame
+from asset_manager import ASSETS
 
 class Barricade:
+    # Bumped whenever any barricade opens or closes, so caches built around
+    # the current blocking layout (e.g. the visibility table overlay) can
+    # tell they are stale.
+    state_version = 0
+
     def __init__(self, x, y, width, height, nests_required_to_clear, image_path=None):
         self.rect = pygame.Rect(x, y, width, height)
         self.nests_required_to_clear = nests_required_to_clear
@@ -11,19 +17,25 @@ class Barricade:
 
         if image_path:
             try:
-                self.image = pygame.image.load(image_path).convert_alpha()
-            except:
-                self.image = pygame.Surface((width, height))
-                self.image.fill((120, 70, 30))  # fallback brown barricade
-        else:
+                self.image = ASSETS.image(image_path)
+            except (pygame.error, OSError):
+                pass
+        if self.image is None:
             self.image = pygame.Surface((width, height))
-            self.image.fill((120, 70, 30))
+            self.image.fill((120, 70, 30))  # fallback brown barricade
+
+        # Optional crumble sound (shared by every barricade)
+        self.break_sound = ASSETS.sound("assets/audio/barricade_break.wav")
+
+    @property
+    def active(self):
+        return self._active
 
-        # Optional crumble sound
-        try:
-            self.break_sound = pygame.mixer.Sound("assets/audio/barricade_break.wav")
-        except:
-            self.break_sound = None
+    @active.setter
+    def active(self, value):
+        if getattr(self, "_active", None) != value:
+            self._active = value
+            Barricade.state_version += 1
 
     def update(self, active_nests):
         """Deactivate barricade when enough nests are destroyed."""
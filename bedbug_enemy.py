@@ -3,6 +3,14 @@ import math
 from enemy import Enemy
 
 class BedbugEnemy(Enemy):
+    # Keeps its own image surface: it is recoloured and faded per bug
+    __slots__ = (
+        "damage", "state", "timer", "attack_cooldown", "has_attacked",
+        "detection_range", "attack_range", "windup_time", "attack_duration",
+        "recover_time", "lunge_speed", "vision_angle_threshold", "safe_distance",
+        "max_visible_distance", "min_visible_distance", "current_alpha", "vel_x", "vel_y",
+    )
+
     def __init__(self, x, y):
         super().__init__(x, y, health=100)
         self.speed = 180.0
@@ -79,10 +87,10 @@ class BedbugEnemy(Enemy):
     # State Machine
     # ==========================
 
-    def update(self, dt, player=None, walls=None, barricades=None, **kwargs):
+    def update(self, dt, player=None, walls=None, barricades=None, los=None, **kwargs):
         """Run base movement/LOS handling, then Bedbug-specific behavior."""
         # Run shared movement, wall, barricade, and LOS logic
-        super().update(dt, player=player, walls=walls, barricades=barricades)
+        super().update(dt, player=player, walls=walls, barricades=barricades, los=los)
 
         # --- Bedbug stealth and attack behavior ---
         dist = self.distance_to(player)
@@ -0,0 +1,106 @@
+# benchmarks/bench_entity_memory.py
+"""
+Bytes per entity for the slotted entity classes versus the layout they
+had before (__dict__ per instance, plus the surfaces __init__ used to
+allocate for every instance: Enemy's red placeholder, the solid-colour
+roach/mite squares and each HealthPack's own copy of its sprite).
+
+"before" rebuilds each live instance as a plain object whose __dict__
+holds the same attributes; "after" is the slotted instance itself. Both
+add the pixel bytes of any surface owned by that one instance. Loaded
+animation frames are left out: they are per-type assets, not per-entity
+state.
+
+Run from the repo root:  python benchmarks/bench_entity_memory.py
+"""
+import importlib
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+pygame.init()
+pygame.mixer.init()
+pygame.display.set_mode((1, 1))
+
+
+class _Unslotted:
+    """Stand-in for the old dict-backed layout."""
+
+
+def slot_names(cls):
+    names = []
+    for klass in cls.__mro__:
+        for name in getattr(klass, "__slots__", ()):
+            if name not in names:
+                names.append(name)
+    return names
+
+
+def surface_bytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize() + sys.getsizeof(surface)
+
+
+def before_bytes(obj, eager_surfaces):
+    legacy = _Unslotted()
+    for name in slot_names(type(obj)):
+        try:
+            value = object.__getattribute__(obj, name)
+        except AttributeError:
+            continue
+        legacy.__dict__[name.lstrip("_")] = value
+    size = sys.getsizeof(legacy) + sys.getsizeof(legacy.__dict__)
+    return size + sum(surface_bytes(pygame.Surface(wh)) for wh in eager_surfaces)
+
+
+def after_bytes(obj, own_surfaces):
+    return sys.getsizeof(obj) + sum(surface_bytes(s) for s in own_surfaces)
+
+
+# (module, class, sizes of the surfaces the old __init__ made per instance)
+ENTITIES = [
+    ("enemy", "Enemy", [(30, 30)]),
+    ("rat_enemy", "RatEnemy", [(30, 30)]),
+    ("brood_roach", "BroodRoach", [(30, 30), (40, 40)]),
+    ("brood_roach", "Roachling", [(30, 30), (15, 15)]),
+    ("mighty_mite_enemy", "MightyMite", [(30, 30), (50, 50)]),
+    ("bedbug_enemy", "BedbugEnemy", [(30, 30), (30, 30)]),
+    ("brood_fly", "BroodFly", [(30, 30)]),
+    ("brood_fly", "Larva", [(30, 30)]),
+    ("health_pack", "HealthPack", [(24, 24)]),
+    ("plasma_cannon", "PlasmaPuddle", []),
+]
+
+
+def own_surfaces(obj):
+    """Surfaces that still belong to this one instance (the bedbug recolours its own)."""
+    return [obj.image] if type(obj).__name__ == "BedbugEnemy" else []
+
+
+def main():
+    print(f"{'entity':<14} {'attrs':>5} {'before B':>9} {'after B':>8} {'saved':>6}")
+    for module, name, eager in ENTITIES:
+        try:
+            cls = getattr(importlib.import_module(module), name)
+            obj = cls(100, 100)
+        except Exception as exc:  # e.g. a sound or sprite missing from assets/
+            print(f"{name:<14} skipped: {exc}")
+            continue
+        before = before_bytes(obj, eager)
+        after = after_bytes(obj, own_surfaces(obj))
+        print(f"{name:<14} {len(slot_names(cls)):>5} {before:>9} {after:>8} "
+              f"{1 - after / before:>6.0%}")
+
+    print("\nA horde of 2000 RatEnemy:", end=" ")
+    from rat_enemy import RatEnemy
+    rat = RatEnemy(100, 100)
+    print(f"{before_bytes(rat, [(30, 30)]) * 2000 / 1024:.0f} KiB -> "
+          f"{after_bytes(rat, []) * 2000 / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# benchmarks/bench_line_of_sight.py
+"""
+Compare the exact segment-vs-rect line of sight against the old 8px
+point-stepping version on random enemy/player pairs over the apartment map.
+
+Run from the repo root:  python benchmarks/bench_line_of_sight.py
+"""
+import math
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from apartment_walls import APARTMENT_WALLS
+from spatial_index import WallGrid
+from enemy_ai_utils import has_line_of_sight
+
+
+class _Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+def stepped_line_of_sight(enemy, player, walls):
+    """The previous implementation: 2x2 rect every 8px, tested against every wall."""
+    ex, ey = enemy.x, enemy.y
+    px, py = player.x, player.y
+    dx, dy = px - ex, py - ey
+    dist = math.hypot(dx, dy)
+    if dist < 1e-3:
+        return True
+
+    step = 8
+    steps = max(1, int(dist / step))
+    nx, ny = dx / dist, dy / dist
+
+    for i in range(steps + 1):
+        x = ex + nx * i * step
+        y = ey + ny * i * step
+        point = pygame.Rect(x, y, 2, 2)
+        if any(point.colliderect(w) for w in walls):
+            return False
+
+    return True
+
+
+def make_pairs(count, max_len=600, seed=1):
+    rng = random.Random(seed)
+    pairs = []
+    while len(pairs) < count:
+        ex, ey = rng.uniform(40, 2740), rng.uniform(40, 1560)
+        angle = rng.uniform(0, math.tau)
+        length = rng.uniform(50, max_len)
+        px, py = ex + math.cos(angle) * length, ey + math.sin(angle) * length
+        if 0 < px < 2784 and 0 < py < 1600:
+            pairs.append((_Point(ex, ey), _Point(px, py)))
+    return pairs
+
+
+def main():
+    walls = list(APARTMENT_WALLS)
+    grid = WallGrid(walls)
+    pairs = make_pairs(2000)
+
+    old = [stepped_line_of_sight(e, p, walls) for e, p in pairs]
+    new = [has_line_of_sight(e, p, grid) for e, p in pairs]
+    disagree = sum(1 for a, b in zip(old, new) if a != b)
+    missed = sum(1 for a, b in zip(old, new) if a and not b)
+
+    runs = 3
+    t_old = min(timeit.repeat(lambda: [stepped_line_of_sight(e, p, walls) for e, p in pairs],
+                              number=1, repeat=runs))
+    t_list = min(timeit.repeat(lambda: [has_line_of_sight(e, p, walls) for e, p in pairs],
+                               number=1, repeat=runs))
+    t_grid = min(timeit.repeat(lambda: [has_line_of_sight(e, p, grid) for e, p in pairs],
+                               number=1, repeat=runs))
+
+    n = len(pairs)
+    print(f"{n} rays, {len(walls)} walls")
+    print(f"  stepped (old)      : {t_old / n * 1e6:8.1f} us/ray")
+    print(f"  exact, wall list   : {t_list / n * 1e6:8.1f} us/ray  ({t_old / t_list:5.1f}x)")
+    print(f"  exact, WallGrid DDA: {t_grid / n * 1e6:8.1f} us/ray  ({t_old / t_grid:5.1f}x)")
+    print(f"  disagreements: {disagree} ({missed} walls the stepped version saw through)")
+
+
+if __name__ == "__main__":
+    main()
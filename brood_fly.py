@@ -1,32 +1,43 @@
 import pygame
 import math
 import random
-from enemy_ai_utils import has_line_of_sight
+from enemy_ai_utils import can_see_player
 from enemy import Enemy
+from spatial_index import rect_blocked, spot_clear
+from object_pool import ObjectPool
+from asset_manager import ASSETS
 
 # ---------------------- AUDIO ----------------------
-try:
-    FLY_BUZZ = pygame.mixer.Sound("assets/audio/flyBuzz.wav")
-    FLY_BUZZ.set_volume(0.1)
-except:
-    FLY_BUZZ = None
+FLY_BUZZ = ASSETS.sound("assets/audio/flyBuzz.wav", volume=0.1)
 
 
 # ================================================================
 #  UTILITY: LOAD ANIMATION FRAMES
 # ================================================================
 
+class Animation(list):
+    """Frames of one animation, with `flipped` holding the same frames mirrored left-right."""
+
+    __slots__ = ("flipped",)
+
+
+# (prefix, count, scale) -> Animation, shared by every fly and larva
+_ANIMATIONS = {}
+
+
 def load_animation(prefix, count, scale=None):
-    frames = []
-    for i in range(count):
-        path = f"assets/fly/{prefix}_{i}.png"
-        try:
-            img = pygame.image.load(path).convert_alpha()
-            if scale:
-                img = pygame.transform.scale(img, scale)
-            frames.append(img)
-        except:
-            print(f"Warning: missing animation file {path}")
+    """
+    Load (once) and return the frames assets/fly/{prefix}_0..count-1.png,
+    scaled to `scale`. Facing left is just indexing `.flipped`.
+    """
+    key = (prefix, count, tuple(scale) if scale else None)
+    frames = _ANIMATIONS.get(key)
+    if frames is not None:
+        return frames
+
+    frames = Animation(ASSETS.frames((f"assets/fly/{prefix}_{i}.png" for i in range(count)), scale))
+    frames.flipped = [pygame.transform.flip(img, True, False) for img in frames]
+    _ANIMATIONS[key] = frames
     return frames
 
 
@@ -42,6 +53,10 @@ class AcidProjectile(pygame.sprite.Sprite):
 
         self.image = pygame.Surface((10, 10), pygame.SRCALPHA)
         pygame.draw.circle(self.image, (100, 255, 80), (5, 5), 5)
+        self.reset(x, y, target_pos, speed, lifetime, damage)
+
+    def reset(self, x, y, target_pos, speed=360, lifetime=3.0, damage=8):
+        """Pool hook: aim a (recycled) glob from (x, y) at target_pos."""
         self.rect = self.image.get_rect(center=(x, y))
 
         dx, dy = target_pos[0] - x, target_pos[1] - y
@@ -56,16 +71,24 @@ class AcidProjectile(pygame.sprite.Sprite):
 
         self.timer -= dt
         if self.timer <= 0:
-            self.kill()
+            self.expire()
             return
 
         if player and self.rect.colliderect(player.rect):
             player.take_damage(self.damage)
-            self.kill()
+            self.expire()
             return
 
-        if walls and any(self.rect.colliderect(w) for w in walls):
-            self.kill()
+        if walls and rect_blocked(self.rect, walls):
+            self.expire()
+
+    def expire(self):
+        """Leave every group and go back to the pool."""
+        self.kill()
+        AcidProjectile.pool.release(self)
+
+
+AcidProjectile.pool = ObjectPool(AcidProjectile)
 
 
 # ================================================================
@@ -73,6 +96,12 @@ class AcidProjectile(pygame.sprite.Sprite):
 # ================================================================
 
 class BroodFly(Enemy):
+    __slots__ = (
+        "hitbox_size", "sprite_size", "visual_scale", "animations", "facing_left",
+        "frame_index", "anim_timer", "buzz", "projectiles", "attack_cooldown",
+        "wander_dir", "wander_speed", "wander_timer",
+        "dying", "spawned_larvae", "death_timer", "death_speed",
+    )
 
     DETECTION_RANGE = 600
     MIN_ATTACK_RANGE = 300
@@ -164,11 +193,10 @@ class BroodFly(Enemy):
                 sx = self.x + math.cos(angle) * dist
                 sy = self.y + math.sin(angle) * dist
 
-                rect = pygame.Rect(sx - 12, sy - 12, enemy_size, enemy_size)
-                if walls and any(rect.colliderect(w) for w in walls):
+                if not spot_clear(sx, sy, enemy_size / 2, walls):
                     continue
 
-                enemies.append(Larva(sx, sy))
+                enemies.append(Larva.pool.acquire(sx, sy))
                 break
 
     # ---------------------------------------------------------
@@ -183,13 +211,20 @@ class BroodFly(Enemy):
             else:
                 self.frame_index = (self.frame_index + 1) % len(frames)
 
-        frame = frames[self.frame_index]
-        if self.facing_left:
-            frame = pygame.transform.flip(frame, True, False)
-        self.image = frame
+        self.image = (frames.flipped if self.facing_left else frames)[self.frame_index]
+
+    def skip_animation(self, lag):
+        """Move the idle loop on by `lag` seconds at once (see Enemy.animate_if_visible)."""
+        steps, self.anim_timer = divmod(self.anim_timer + lag, 0.15)
+        self.frame_index = (self.frame_index + int(steps)) % len(self.animations["idle"])
+
+    def on_release(self):
+        """Dropped from the game: globs still in flight go back to their pool (see release_to_pool)."""
+        for glob in self.projectiles.sprites():
+            glob.expire()
 
     # ---------------------------------------------------------
-    def update(self, dt, player=None, walls=None, enemies=None, barricades=None, **kw):
+    def update(self, dt, player=None, walls=None, enemies=None, barricades=None, los=None, **kw):
 
         # Buzz volume
         if player and self.buzz:
@@ -209,7 +244,7 @@ class BroodFly(Enemy):
 
             return
 
-        super().update(dt, player=player, walls=walls, barricades=barricades)
+        super().update(dt, player=player, walls=walls, barricades=barricades, los=los)
         self.projectiles.update(dt, player, walls)
 
         # ======================================================
@@ -226,18 +261,14 @@ class BroodFly(Enemy):
         new_x = self.x + drift.x * self.wander_speed * dt
         new_y = self.y + drift.y * self.wander_speed * dt
 
-        obstacles = list(walls or [])
-        if barricades:
-            obstacles += [b.rect for b in barricades if b.active]
-
         # X movement
         test = pygame.Rect(new_x - 20, self.y - 20, 40, 40)
-        if not any(test.colliderect(o) for o in obstacles):
+        if not rect_blocked(test, walls, barricades):
             self.x = new_x
 
         # Y movement
         test = pygame.Rect(self.x - 20, new_y - 20, 40, 40)
-        if not any(test.colliderect(o) for o in obstacles):
+        if not rect_blocked(test, walls, barricades):
             self.y = new_y
 
         self.rect.center = (self.x, self.y)
@@ -247,19 +278,19 @@ class BroodFly(Enemy):
         # ======================================================
         dx, dy = player.x - self.x, player.y - self.y
         dist = math.hypot(dx, dy)
-        can_see = has_line_of_sight(self, player, walls)
+        can_see = can_see_player(self, player, walls, los=los)
 
         if can_see and dist < self.DETECTION_RANGE:
             self.attack_cooldown -= dt
             if self.attack_cooldown <= 0:
-                self.projectiles.add(AcidProjectile(self.x, self.y, player.rect.center))
+                self.projectiles.add(AcidProjectile.pool.acquire(self.x, self.y, player.rect.center))
                 self.attack_cooldown = self.SHOOT_COOLDOWN
 
         # Small hover bob
         self.y += math.sin(pygame.time.get_ticks() * 0.005 + self.x * 0.01) * 0.4
         self.rect.centery = self.y
 
-        self.animate(dt)
+        self.animate_if_visible(dt)
 
 
 
@@ -268,6 +299,11 @@ class BroodFly(Enemy):
 # ================================================================
 
 class Larva(Enemy):
+    __slots__ = (
+        "sprite_size", "animations", "hitbox_size", "lunging", "windup_timer", "lunge_dir",
+        "state", "frame_index", "anim_speed", "anim_timer", "facing_left",
+        "dying", "death_done",
+    )
 
     DETECT_RANGE = 100
     WINDUP_TIME = 0.75
@@ -275,18 +311,9 @@ class Larva(Enemy):
     DAMAGE = 4
 
     def __init__(self, x, y, scale=1.6):
-        super().__init__(x, y, health=20, speed=100)
-
-        self.hitbox_size = 20
         self.sprite_size = int(24 * scale)
-        self.rect = pygame.Rect(x - 10, y - 10, 20, 20)
-
-        # Attack state
-        self.lunging = False
-        self.windup_timer = 0
-        self.lunge_dir = pygame.Vector2()
 
-        # Animations
+        # Animations (kept when the pool recycles this larva)
         size = (self.sprite_size, self.sprite_size)
         self.animations = {
             "idle":  load_animation("larvaIdle", 6, size),
@@ -294,6 +321,19 @@ class Larva(Enemy):
             "dmg":   load_animation("larvaDmg", 6, size),
             "death": load_animation("larvaDeath", 6, size),
         }
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        """Pool hook: a fresh, full-health larva at (x, y)."""
+        super().__init__(x, y, health=20, speed=100)
+
+        self.hitbox_size = 20
+        self.rect = pygame.Rect(x - 10, y - 10, 20, 20)
+
+        # Attack state
+        self.lunging = False
+        self.windup_timer = 0
+        self.lunge_dir = pygame.Vector2()
 
         self.state = "move"
         self.frame_index = 0
@@ -343,13 +383,15 @@ class Larva(Enemy):
             else:
                 self.frame_index = (self.frame_index + 1) % len(frames)
 
-        frame = frames[self.frame_index]
-        if self.facing_left:
-            frame = pygame.transform.flip(frame, True, False)
-        self.image = frame
+        self.image = (frames.flipped if self.facing_left else frames)[self.frame_index]
+
+    def skip_animation(self, lag):
+        """Move the current loop on by `lag` seconds at once (see Enemy.animate_if_visible)."""
+        steps, self.anim_timer = divmod(self.anim_timer + lag, self.anim_speed)
+        self.frame_index = (self.frame_index + int(steps)) % len(self.animations[self.state])
 
     # ---------------------------------------------------------
-    def update(self, dt, player=None, walls=None, barricades=None, **kw):
+    def update(self, dt, player=None, walls=None, barricades=None, los=None, **kw):
 
         if self.dying:
             self.animate(dt)
@@ -382,17 +424,16 @@ class Larva(Enemy):
                 return
 
             # Hit walls
-            obstacles = list(walls or [])
-            if barricades:
-                obstacles += [b.rect for b in barricades if b.active]
-
-            if any(self.rect.colliderect(o) for o in obstacles):
+            if rect_blocked(self.rect, walls, barricades):
                 self.lunging = False
                 self.state = "idle"
                 return
 
         # NORMAL CHASE
         if not self.lunging:
-            super().update(dt, player=player, walls=walls, barricades=barricades)
+            super().update(dt, player=player, walls=walls, barricades=barricades, los=los)
+
+        self.animate_if_visible(dt)
+
 
-        self.animate(dt)
+Larva.pool = ObjectPool(Larva)
@@ -1,18 +1,27 @@
 import pygame
 import math
 import random
-from enemy import Enemy
+from enemy import Enemy, solid_sprite
+from enemy_ai_utils import chase_target, steer_clear_of_walls
+from spatial_index import rect_blocked
+from object_pool import ObjectPool
 
 
 class BroodRoach(Enemy):
     """Large roach that bursts into several small roachlings on death."""
 
+    __slots__ = (
+        "damage", "state", "timer", "attack_cooldown", "wander_dir", "wander_timer",
+        "last_known_pos", "detection_range", "attack_range", "windup_time",
+        "attack_duration", "recover_time", "lunge_speed", "has_attacked",
+        "spawned_babies", "enemies_ref",
+    )
+
     def __init__(self, x, y):
         super().__init__(x, y, health=120, speed=90.0)
         self.size = 40
         self.damage = 8
-        self.image = pygame.Surface((self.size, self.size))
-        self.image.fill((100, 60, 30))  # dark brown shell
+        self.image = solid_sprite(self.size, (100, 60, 30))  # dark brown shell
         self.rect = self.image.get_rect(center=(x, y))
 
         # Behavior control
@@ -63,20 +72,15 @@ class BroodRoach(Enemy):
         direction = pygame.Vector2(target_pos[0] - self.x, target_pos[1] - self.y)
         if direction.length_squared() == 0:
             return
-        direction = direction.normalize()
+        direction = pygame.Vector2(steer_clear_of_walls(self, *direction.normalize(), walls))
         new_x = self.x + direction.x * speed * dt
         new_y = self.y + direction.y * speed * dt
 
-        # Use unified obstacle list
-        obstacles = list(walls or [])
-        if barricades:
-            obstacles += [b.rect for b in barricades if getattr(b, "active", False)]
-
         rect_x = pygame.Rect(new_x - self.size / 2, self.y - self.size / 2, self.size, self.size)
-        if not any(rect_x.colliderect(o) for o in obstacles):
+        if not rect_blocked(rect_x, walls, barricades):
             self.x = new_x
         rect_y = pygame.Rect(self.x - self.size / 2, new_y - self.size / 2, self.size, self.size)
-        if not any(rect_y.colliderect(o) for o in obstacles):
+        if not rect_blocked(rect_y, walls, barricades):
             self.y = new_y
         self.rect.center = (self.x, self.y)
 
@@ -93,10 +97,10 @@ class BroodRoach(Enemy):
             self.wander_dir = pygame.Vector2(random.uniform(-1, 1), random.uniform(-1, 1)).normalize()
             self.wander_timer = random.uniform(1.5, 3.0)
 
-    def update(self, dt, player=None, walls=None, enemies=None, barricades=None, **kwargs):
+    def update(self, dt, player=None, walls=None, enemies=None, barricades=None, los=None, flow=None, **kwargs):
         """Main AI state machine for BroodRoach, with shared movement handling."""
         # Run base Enemy logic for LOS + collision memory
-        super().update(dt, player=player, walls=walls, barricades=barricades)
+        super().update(dt, player=player, walls=walls, barricades=barricades, los=los, flow=flow)
         self.enemies_ref = enemies
         if enemies is None:
             print("BroodRoach update called without enemies list!")
@@ -120,6 +124,7 @@ class BroodRoach(Enemy):
                 self.state = "wander"
             else:
                 if dist > self.attack_range:
+                    target = chase_target(self, target, self.sees_player, flow)
                     self.move_toward_point(target, self.speed, dt, walls, barricades)
                 else:
                     if self.attack_cooldown <= 0:
@@ -162,19 +167,24 @@ class BroodRoach(Enemy):
         for _ in range(random.randint(4, 6)):
             offset_x = random.randint(-40, 40)
             offset_y = random.randint(-40, 40)
-            enemies.append(Roachling(self.x + offset_x, self.y + offset_y))
+            enemies.append(Roachling.pool.acquire(self.x + offset_x, self.y + offset_y))
             print("Spawned roachlings!", len(enemies))
 
 
 class Roachling(Enemy):
     """Fast, weak, erratic roach that sometimes attacks or flees."""
 
+    __slots__ = ("damage", "state", "timer")
+
     def __init__(self, x, y):
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        """Pool hook: a fresh roachling at (x, y)."""
         super().__init__(x, y, health=15, speed=230.0)
         self.size = 15
         self.damage = 3
-        self.image = pygame.Surface((self.size, self.size))
-        self.image.fill((150, 90, 45))  # lighter brown
+        self.image = solid_sprite(self.size, (150, 90, 45))  # lighter brown
         self.rect = self.image.get_rect(center=(x, y))
 
         # Behavior
@@ -194,15 +204,11 @@ class Roachling(Enemy):
         new_x = self.x + direction.x * self.speed * dt
         new_y = self.y + direction.y * self.speed * dt
 
-        obstacles = list(walls or [])
-        if barricades:
-            obstacles += [b.rect for b in barricades if getattr(b, "active", False)]
-
         rect_x = pygame.Rect(new_x - self.size / 2, self.y - self.size / 2, self.size, self.size)
-        if not any(rect_x.colliderect(o) for o in obstacles):
+        if not rect_blocked(rect_x, walls, barricades):
             self.x = new_x
         rect_y = pygame.Rect(self.x - self.size / 2, new_y - self.size / 2, self.size, self.size)
-        if not any(rect_y.colliderect(o) for o in obstacles):
+        if not rect_blocked(rect_y, walls, barricades):
             self.y = new_y
         self.rect.center = (self.x, self.y)
 
@@ -214,15 +220,11 @@ class Roachling(Enemy):
         new_x = self.x + direction.x * self.speed * dt
         new_y = self.y + direction.y * self.speed * dt
 
-        obstacles = list(walls or [])
-        if barricades:
-            obstacles += [b.rect for b in barricades if getattr(b, "active", False)]
-
         rect_x = pygame.Rect(new_x - self.size / 2, self.y - self.size / 2, self.size, self.size)
-        if not any(rect_x.colliderect(o) for o in obstacles):
+        if not rect_blocked(rect_x, walls, barricades):
             self.x = new_x
         rect_y = pygame.Rect(self.x - self.size / 2, new_y - self.size / 2, self.size, self.size)
-        if not any(rect_y.colliderect(o) for o in obstacles):
+        if not rect_blocked(rect_y, walls, barricades):
             self.y = new_y
         self.rect.center = (self.x, self.y)
 
@@ -247,3 +249,6 @@ class Roachling(Enemy):
             self.move_away(player.rect.center, dt, walls, barricades)
 
         self.update_burning(dt)
+
+
+Roachling.pool = ObjectPool(Roachling)
@@ -0,0 +1,96 @@
+# distance_field.py
+import numpy as np
+
+
+class DistanceField:
+    """
+    Signed distance to the nearest static wall, baked once per level.
+
+    Sampled at the centre of every `cell_size` cell and stored as a NumPy
+    array, so clearance and gradient lookups are O(1). Distances use the
+    Chebyshev (max-axis) metric: walls and hitboxes are all axis-aligned
+    squares/rects, and in that metric a square of half-size h centred on a
+    point fits exactly when the clearance there is >= h. Negative values are
+    inside a wall.
+
+    Barricades open and close, so they are not baked in; callers still test
+    those (a handful of rects) directly.
+    """
+
+    def __init__(self, walls, width, height, cell_size=8):
+        self.cell_size = cell_size
+        self.cols = -(-int(width) // cell_size)
+        self.rows = -(-int(height) // cell_size)
+        # Worst-case error of reading a cell's sample for a point inside it
+        self.slack = cell_size / 2
+
+        xs = (np.arange(self.cols) + 0.5) * cell_size
+        ys = (np.arange(self.rows) + 0.5) * cell_size
+        x = xs[None, :]
+        y = ys[:, None]
+
+        field = np.full((self.rows, self.cols), np.inf)
+        for wall in walls:
+            # Chebyshev signed distance to one box
+            d = np.maximum(np.maximum(wall.left - x, x - wall.right),
+                           np.maximum(wall.top - y, y - wall.bottom))
+            np.minimum(field, d, out=field)
+        self.field = field.astype(np.float32)
+
+        # Unit-free slope per pixel; points away from the nearest wall
+        gy, gx = np.gradient(self.field, cell_size)
+        self.grad_x = gx.astype(np.float32)
+        self.grad_y = gy.astype(np.float32)
+
+    # -------------------------------------------------------------------------
+    def _cell(self, x, y):
+        cx = int(x // self.cell_size)
+        cy = int(y // self.cell_size)
+        if 0 <= cx < self.cols and 0 <= cy < self.rows:
+            return cx, cy
+        return None
+
+    def clearance(self, x, y):
+        """Distance from (x, y) to the nearest wall (negative inside; 0 off the map)."""
+        cell = self._cell(x, y)
+        if cell is None:
+            return 0.0
+        return self.field.item(cell[1], cell[0])
+
+    def clearance_many(self, xs, ys):
+        """Vectorized clearance() for arrays of points."""
+        cx = np.floor(np.asarray(xs) / self.cell_size).astype(np.int64)
+        cy = np.floor(np.asarray(ys) / self.cell_size).astype(np.int64)
+        inside = (cx >= 0) & (cx < self.cols) & (cy >= 0) & (cy < self.rows)
+        out = np.zeros(cx.shape, dtype=np.float32)
+        out[inside] = self.field[cy[inside], cx[inside]]
+        return out
+
+    def gradient(self, x, y):
+        """Unit vector (gx, gy) pointing away from the nearest wall, or (0, 0)."""
+        cell = self._cell(x, y)
+        if cell is None:
+            return 0.0, 0.0
+        gx = self.grad_x.item(cell[1], cell[0])
+        gy = self.grad_y.item(cell[1], cell[0])
+        length = (gx * gx + gy * gy) ** 0.5
+        if length == 0.0:
+            return 0.0, 0.0
+        return gx / length, gy / length
+
+    def gradient_many(self, xs, ys):
+        """Vectorized gradient(): unit (gx, gy) arrays, zero where undefined."""
+        cx = np.floor(np.asarray(xs) / self.cell_size).astype(np.int64)
+        cy = np.floor(np.asarray(ys) / self.cell_size).astype(np.int64)
+        inside = (cx >= 0) & (cx < self.cols) & (cy >= 0) & (cy < self.rows)
+        gx = np.zeros(cx.shape)
+        gy = np.zeros(cx.shape)
+        gx[inside] = self.grad_x[cy[inside], cx[inside]]
+        gy[inside] = self.grad_y[cy[inside], cx[inside]]
+        length = np.hypot(gx, gy)
+        length[length == 0.0] = np.inf
+        return gx / length, gy / length
+
+    def fits(self, x, y, half_size):
+        """True if a square of half-size `half_size` centred on (x, y) clears every wall."""
+        return self.clearance(x, y) - self.slack >= half_size
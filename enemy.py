@@ -1,10 +1,19 @@
 # enemy.py
 import pygame
 import math
-from enemy_ai_utils import has_line_of_sight  # ✅ Use your existing AI utility
+from collections import OrderedDict
+from enemy_ai_utils import can_see_player, chase_target, steer_clear_of_walls  # ✅ Use your existing AI utility
+from spatial_index import rect_blocked
+from stats import ParticleStyle
+from asset_manager import ASSETS
 
 BURN_FRAMES = None
 
+# Cinders drifting up off anything on fire (see ParticleSystem.emit_over)
+BURN_CINDERS = ParticleStyle(color=(255, 110, 20), radius=(1, 3), growth=-1.5, alpha=220,
+                             fade=(200, 300), lifetime=(0.5, 1.0), speed=(30, 70),
+                             spread=0.5, jitter=(8, 4), rate=12.0)
+
 # --- Damage sound ---
 try:
     ENEMY_HIT_SOUND = pygame.mixer.Sound("assets/audio/enemyDamage.wav")
@@ -13,26 +22,87 @@ except:
     ENEMY_HIT_SOUND = None
 
 
+# (size, colour) -> shared filled square
+_SOLID_SPRITES = {}
+
+# World rect the camera shows this frame (set by main.py); None = treat everything as on screen
+_CAMERA_VIEW = None
+
+
+def set_camera_view(rect):
+    global _CAMERA_VIEW
+    _CAMERA_VIEW = rect
+
+
+def in_camera_view(rect):
+    return _CAMERA_VIEW is None or _CAMERA_VIEW.colliderect(rect)
+
+
+def solid_sprite(size, color):
+    """A filled square shared by every enemy drawn with it (never draw onto it)."""
+    key = (size, tuple(color))
+    sprite = _SOLID_SPRITES.get(key)
+    if sprite is None:
+        sprite = pygame.Surface((size, size))
+        sprite.fill(color)
+        _SOLID_SPRITES[key] = sprite
+    return sprite
+
+
+# size -> BURN_FRAMES scaled to size x size, least recently used first
+_SCALED_BURN_FRAMES = OrderedDict()
+MAX_BURN_SIZES = 16  # flame sizes kept at once (~0.5 MB each at nest size)
+
+
 def load_burn_frames():
-    """Preload flame animation frames."""
+    """Preload flame animation frames (the originals; draw code uses burn_frames(size))."""
     global BURN_FRAMES
     BURN_FRAMES = {
-        "start": [pygame.image.load(f"assets/fire/burning_start_{i}.png").convert_alpha() for i in range(4)],
-        "loop":  [pygame.image.load(f"assets/fire/burning_loop_{i}.png").convert_alpha() for i in range(8)],
-        "end":   [pygame.image.load(f"assets/fire/burning_end_{i}.png").convert_alpha() for i in range(5)],
+        "start": [ASSETS.image(f"assets/fire/burning_start_{i}.png") for i in range(4)],
+        "loop":  [ASSETS.image(f"assets/fire/burning_loop_{i}.png") for i in range(8)],
+        "end":   [ASSETS.image(f"assets/fire/burning_end_{i}.png") for i in range(5)],
     }
+    _SCALED_BURN_FRAMES.clear()
+
+
+def burn_frames(size):
+    """
+    {"start"/"loop"/"end": frames} scaled to size x size, shared by every
+    burning thing of that size. Scaled on first use; only the
+    MAX_BURN_SIZES most recently used sizes are kept.
+    """
+    frames = _SCALED_BURN_FRAMES.get(size)
+    if frames is None:
+        frames = {state: [pygame.transform.scale(frame, (size, size)) for frame in originals]
+                  for state, originals in BURN_FRAMES.items()}
+        _SCALED_BURN_FRAMES[size] = frames
+        if len(_SCALED_BURN_FRAMES) > MAX_BURN_SIZES:
+            _SCALED_BURN_FRAMES.popitem(last=False)
+    else:
+        _SCALED_BURN_FRAMES.move_to_end(size)
+    return frames
 
 
 class Enemy:
+    # Hordes keep thousands of enemies alive: no per-instance __dict__.
+    # Subclasses list their own extra attributes in __slots__ too.
+    __slots__ = (
+        "x", "y", "health", "speed", "size", "_image", "rect",
+        "is_burning", "burn_state", "burn_timer", "burn_frame",
+        "last_known", "sees_player",
+        "speed_multiplier", "in_puddle", "puddle_slow", "puddle_tick_timer",
+        "anim_lag",
+    )
+
     def __init__(self, x: float, y: float, health: int = 50, speed: float = 100.0):
         self.x = x
         self.y = y
         self.health = health
         self.speed = speed
         self.size = 30
-        self.image = pygame.Surface((self.size, self.size))
-        self.image.fill((255, 0, 0))
-        self.rect = self.image.get_rect(center=(x, y))
+        self._image = None  # red placeholder, only built if something draws it
+        self.rect = pygame.Rect(0, 0, self.size, self.size)
+        self.rect.center = (x, y)
 
         # Burning animation
         self.is_burning = False
@@ -42,6 +112,7 @@ class Enemy:
 
         # Memory of last seen player position
         self.last_known = None
+        self.sees_player = False
 
         # 🧊 NEW — Plasma puddle slow system
         self.speed_multiplier = 1.0
@@ -49,34 +120,44 @@ class Enemy:
         self.puddle_slow = 1.0
         self.puddle_tick_timer = 0.0
 
+        # Animation time skipped while off screen (see animate_if_visible)
+        self.anim_lag = 0.0
+
+    @property
+    def image(self):
+        if self._image is None:
+            self._image = solid_sprite(self.size, (255, 0, 0))
+        return self._image
+
+    @image.setter
+    def image(self, surface):
+        self._image = surface
 
     # 🧠 Centralized AI + movement for all enemies
-    def update(self, dt: float, player=None, walls=None, barricades=None):
+    def update(self, dt: float, player=None, walls=None, barricades=None, los=None, flow=None):
         """
         Handles AI movement, wall + barricade collisions, and LOS detection.
         Backward compatible with older calls that omit barricades.
+        `los` is the frame's LineOfSightBatch, if main.py resolved one, and
+        `flow` the shared FlowField used to find the player out of sight.
         """
         if not player:
             return
 
-        # --- Combine static walls with active barricades (if any) ---
-        obstacles = list(walls or [])
-        if barricades:
-            obstacles += [b.rect for b in barricades if getattr(b, "active", False)]
-
-        # --- Line of sight using shared AI utility ---
-        can_see = has_line_of_sight(self, player, obstacles)
+        # --- Line of sight using shared AI utility (walls + active barricades) ---
+        can_see = can_see_player(self, player, walls, barricades, los)
+        self.sees_player = can_see
         if can_see:
             self.last_known = (player.x, player.y)
         elif not self.last_known:
             return  # hasn't seen player yet
 
         # --- Move toward target (visible or last known) ---
-        tx, ty = (player.x, player.y) if can_see else self.last_known
+        tx, ty = chase_target(self, (player.x, player.y) if can_see else self.last_known, can_see, flow)
         direction = pygame.Vector2(tx - self.x, ty - self.y)
         if direction.length_squared() == 0:
             return
-        direction = direction.normalize()
+        direction = pygame.Vector2(steer_clear_of_walls(self, *direction.normalize(), walls))
 
         # ✔ USE SPEED MULTIPLIER HERE
         actual_speed = self.speed * self.speed_multiplier
@@ -86,12 +167,12 @@ class Enemy:
 
         # Horizontal collision
         new_rect_x = pygame.Rect(new_x - self.size / 2, self.y - self.size / 2, self.size, self.size)
-        if not any(new_rect_x.colliderect(o) for o in obstacles):
+        if not rect_blocked(new_rect_x, walls, barricades):
             self.x = new_x
 
         # Vertical collision
         new_rect_y = pygame.Rect(self.x - self.size / 2, new_y - self.size / 2, self.size, self.size)
-        if not any(new_rect_y.colliderect(o) for o in obstacles):
+        if not rect_blocked(new_rect_y, walls, barricades):
             self.y = new_y
 
         self.rect.center = (int(self.x), int(self.y))
@@ -100,6 +181,21 @@ class Enemy:
         # 🔄 Reset puddle flags each frame (main.py will set them again)
         self.in_puddle = False
 
+    def animate_if_visible(self, dt):
+        """
+        animate(dt), but only while in the camera view: off screen the time
+        is banked, and on coming back skip_animation(banked) jumps the loop
+        ahead to where it would be. Subclasses using this define both.
+        Only for looping, purely visual animations (not death sequences).
+        """
+        if not in_camera_view(self.rect):
+            self.anim_lag += dt
+            return
+        if self.anim_lag:
+            self.skip_animation(self.anim_lag)
+            self.anim_lag = 0.0
+        self.animate(dt)
+
     # 🧯 Universal burn effects for all enemies
     def update_burning(self, dt):
         if not self.is_burning:
@@ -177,15 +273,15 @@ class Enemy:
 
         rect = self.image.get_rect(center=(screen_x, screen_y))
         surface.blit(self.image, rect)
+        self.draw_burning(surface, screen_x, screen_y)
 
-        # 🔥 Burn overlay
+    def draw_burning(self, surface, screen_x, screen_y):
+        """🔥 Burn overlay, centred a little above (screen_x, screen_y)."""
         if self.is_burning and self.burn_state and BURN_FRAMES:
-            frames = BURN_FRAMES[self.burn_state]
-            frame_index = min(int(self.burn_frame), len(frames) - 1)
-            frame = frames[frame_index]
-
             scale_factor = self.size / 20.0
             scaled_size = int(30 * scale_factor)
-            scaled_frame = pygame.transform.scale(frame, (scaled_size, scaled_size))
+            frames = burn_frames(scaled_size)[self.burn_state]
+            frame_index = min(int(self.burn_frame), len(frames) - 1)
+            scaled_frame = frames[frame_index]
             flame_rect = scaled_frame.get_rect(center=(screen_x, screen_y - self.size // 4))
             surface.blit(scaled_frame, flame_rect)
@@ -1,29 +1,74 @@
 import pygame
 import math
 import random
+from spatial_index import rect_blocked
+from line_of_sight import segment_blocked
 
 
-def has_line_of_sight(enemy, player, walls):
-    """Return True if no wall blocks a straight line between enemy and player."""
-    ex, ey = enemy.x, enemy.y
-    px, py = player.x, player.y
-    dx, dy = px - ex, py - ey
-    dist = math.hypot(dx, dy)
-    if dist < 1e-3:
-        return True
-
-    step = 8
-    steps = max(1, int(dist / step))
-    nx, ny = dx / dist, dy / dist
+def has_line_of_sight(enemy, player, walls, barricades=None):
+    """
+    Return True if no wall (or active barricade) blocks a straight line between
+    enemy and player. When the level's WallGrid carries a baked visibility
+    table most queries are a single lookup; the rest fall back to an exact
+    segment-vs-rect test over the grid cells under the ray.
+    """
+    if barricades is None:
+        barricades = getattr(walls, "active_barricades", None)
+    table = getattr(walls, "visibility", None)
+    if table is not None:
+        verdict = table.lookup(enemy.x, enemy.y, player.x, player.y, barricades)
+        if verdict is not None:
+            return verdict
+    return not segment_blocked(enemy.x, enemy.y, player.x, player.y, walls, barricades)
+
+
+def can_see_player(enemy, player, walls, barricades=None, los=None):
+    """Use this frame's batched result (LineOfSightBatch) when there is one, else trace the ray."""
+    if los is not None:
+        seen = los.sees(enemy)
+        if seen is not None:
+            return seen
+    return has_line_of_sight(enemy, player, walls, barricades)
+
+
+def chase_target(enemy, target, can_see, flow=None):
+    """
+    Point to steer toward while chasing: the target itself when the player is
+    in view, otherwise the next step of the shared FlowField (which routes
+    around walls and through doorways). Falls back to `target`.
+    """
+    if flow is not None and not can_see:
+        step = flow.waypoint(enemy.x, enemy.y)
+        if step is not None:
+            return step
+    return target
 
-    for i in range(steps + 1):
-        x = ex + nx * i * step
-        y = ey + ny * i * step
-        point = pygame.Rect(x, y, 2, 2)
-        if any(point.colliderect(w) for w in walls):
-            return False
 
-    return True
+def steer_clear_of_walls(enemy, dx, dy, walls, reach=20.0):
+    """
+    Bend a unit heading (dx, dy) so the enemy slides along nearby walls
+    instead of pushing into them, using the level's DistanceField.
+    Returns the adjusted unit heading (unchanged far from walls).
+    """
+    field = getattr(walls, "distance", None)
+    if field is None:
+        return dx, dy
+    gap = field.clearance(enemy.x, enemy.y) - getattr(enemy, "size", 0) / 2
+    if gap >= reach:
+        return dx, dy
+
+    gx, gy = field.gradient(enemy.x, enemy.y)
+    into = dx * gx + dy * gy
+    if into >= 0:
+        return dx, dy  # already heading away from the wall
+    # Drop (part of) the component pointing into the wall
+    push = min(1.0, (reach - gap) / reach)
+    sx = dx - gx * into * push
+    sy = dy - gy * into * push
+    length = math.hypot(sx, sy)
+    if length < 1e-6:
+        return dx, dy  # head-on: nothing to slide along
+    return sx / length, sy / length
 
 
 def move_away_from_player(enemy, player, speed, dt, walls=None, barricades=None, jitter=0.1):
@@ -44,20 +89,16 @@ def move_away_from_player(enemy, player, speed, dt, walls=None, barricades=None,
     new_x = enemy.x + direction.x * speed * dt
     new_y = enemy.y + direction.y * speed * dt
 
-    obstacles = list(walls or [])
-    if barricades:
-        obstacles += [b.rect for b in barricades if getattr(b, "active", False)]
-
     # Slide on X
     rect_x = pygame.Rect(new_x - enemy.rect.width / 2, enemy.y - enemy.rect.height / 2,
                          enemy.rect.width, enemy.rect.height)
-    if not any(rect_x.colliderect(o) for o in obstacles):
+    if not rect_blocked(rect_x, walls, barricades):
         enemy.x = new_x
 
     # Slide on Y
     rect_y = pygame.Rect(enemy.x - enemy.rect.width / 2, new_y - enemy.rect.height / 2,
                          enemy.rect.width, enemy.rect.height)
-    if not any(rect_y.colliderect(o) for o in obstacles):
+    if not rect_blocked(rect_y, walls, barricades):
         enemy.y = new_y
 
     enemy.rect.center = (enemy.x, enemy.y)
@@ -88,18 +129,14 @@ def maintain_range_from_player(enemy, player, min_dist, max_dist, speed, dt, wal
         new_x = enemy.x + direction.x * (speed * 0.7) * dt
         new_y = enemy.y + direction.y * (speed * 0.7) * dt
 
-        obstacles = list(walls or [])
-        if barricades:
-            obstacles += [b.rect for b in barricades if getattr(b, "active", False)]
-
         rect_x = pygame.Rect(new_x - enemy.rect.width / 2, enemy.y - enemy.rect.height / 2,
                              enemy.rect.width, enemy.rect.height)
-        if not any(rect_x.colliderect(o) for o in obstacles):
+        if not rect_blocked(rect_x, walls, barricades):
             enemy.x = new_x
 
         rect_y = pygame.Rect(enemy.x - enemy.rect.width / 2, new_y - enemy.rect.height / 2,
                              enemy.rect.width, enemy.rect.height)
-        if not any(rect_y.colliderect(o) for o in obstacles):
+        if not rect_blocked(rect_y, walls, barricades):
             enemy.y = new_y
 
         enemy.rect.center = (enemy.x, enemy.y)
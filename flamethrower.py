@@ -1,7 +1,10 @@
 # flamethrower.py
 import math
 import pygame
+import numpy as np
 from base_weapon import Weapon
+from visibility_polygon import ShadowCaster
+from stats import ParticleStyle
 
 pygame.mixer.init()
 FLAME_START_SOUND = pygame.mixer.Sound("assets/audio/flamethrowerStart.wav")
@@ -12,6 +15,57 @@ FLAME_START_SOUND.set_volume(0.5)
 FLAME_LOOP_SOUND.set_volume(0.4)
 FLAME_END_SOUND.set_volume(0.5)
 
+# Sparks thrown along the flame; they shrink as they cool
+FLAME_EMBERS = ParticleStyle(color=(255, 150, 40), radius=(2, 4), growth=-4.0, alpha=230,
+                             fade=(250, 400), lifetime=(0.4, 0.8), speed=(300, 500), gravity=-60.0)
+
+def enemy_hit_point(enemy):
+    """Where the flame tests an enemy (kept from the original per-enemy loop)."""
+    return enemy.x + enemy.size / 2.0, enemy.y + enemy.size / 2.0
+
+
+class FlameCone:
+    """
+    One tick's flame: origin, aim and the wall-clipped SightPolygon of the
+    cone sector. Built once by Flamethrower.cone() and shared by the damage
+    passes and draw_cone, so what gets burned is exactly what is drawn.
+    """
+
+    def __init__(self, x, y, aim_angle, half_angle, polygon):
+        self.x = x
+        self.y = y
+        self.aim_angle = aim_angle
+        self.half_angle = half_angle
+        self.polygon = polygon
+        self.reach = float(polygon.dists.max())
+
+    def bounds(self, pad=0):
+        """Bounding rect of the flame (for spatial-index queries), grown by pad."""
+        left, top, right, bottom = self.polygon.bounds()
+        return pygame.Rect(left - pad, top - pad, right - left + 2 * pad + 1, bottom - top + 2 * pad + 1)
+
+    def contains(self, px, py):
+        """Single-point version of hits()."""
+        inside, _ = self.polygon.contains([px], [py])
+        return bool(inside[0])
+
+    def hits(self, targets, point=None):
+        """
+        Batched test: [(target, distance)] for targets inside the flame.
+        `point(target)` gives the tested position (default x, y).
+        """
+        targets = list(targets)
+        if not targets:
+            return []
+        if point is None:
+            coords = [(t.x, t.y) for t in targets]
+        else:
+            coords = [point(t) for t in targets]
+        xy = np.array(coords, dtype=np.float64).reshape(-1, 2)
+        inside, dist = self.polygon.contains(xy[:, 0], xy[:, 1])
+        return [(targets[i], float(dist[i])) for i in np.flatnonzero(inside)]
+
+
 class Flamethrower(Weapon):
     def __init__(self,
                  fire_rate=30.0,
@@ -49,6 +103,12 @@ class Flamethrower(Weapon):
         self.fuel_depletion_rate = 30.0  # units per second while firing
         self.fuel_refill_rate = 40.0     # units per second when not firing
 
+        # Cone cache (see cone())
+        self._cone_key = None
+        self._cone = None
+        self._fallback_caster = None
+        self._cone_surf = None  # reused by draw_cone
+
     # -------------------------------------------------------------------------
     def update(self, dt: float):
         super().update(dt)
@@ -75,81 +135,68 @@ class Flamethrower(Weapon):
             self.fuel = min(self.max_fuel, self.fuel + self.fuel_refill_rate * dt)
 
     # -------------------------------------------------------------------------
-    def _raycast(self, x0, y0, dx, dy, max_dist, walls):
-        """Optimized raycast using coarse stepping and bounding box culling."""
-        step = 12  # bigger step = fewer checks
-        dist = 0.0
-
-        # Only consider walls within a local bounding box (near player)
-        ray_box = pygame.Rect(x0 - max_dist, y0 - max_dist, max_dist * 2, max_dist * 2)
-        nearby_walls = [w for w in walls if ray_box.colliderect(w)]
-
-        while dist < max_dist:
-            test_x = x0 + dx * dist
-            test_y = y0 + dy * dist
-            point_rect = pygame.Rect(test_x, test_y, 4, 4)
-            for wall in nearby_walls:
-                if wall.colliderect(point_rect):
-                    return dist
-            dist += step
-
-        return max_dist
-
-
     def _calc_instant_damage(self, distance: float):
         t = max(0.0, min(1.0, distance / max(0.0001, self.max_range)))
         return self.max_damage * (1.0 - t) + self.min_damage * t
 
-    def _point_in_cone(self, src_x, src_y, aim_dx, aim_dy, px, py, visible_range=None):
-        vx = px - src_x
-        vy = py - src_y
-        dist = math.hypot(vx, vy)
-        if dist <= 0:
-            return True, 0.0
-        if visible_range is not None and dist > visible_range:
-            return False, dist
-        elif visible_range is None and dist > self.max_range:
-            return False, dist
-        vxn, vyn = vx / dist, vy / dist
-        aim_len = math.hypot(aim_dx, aim_dy)
-        if aim_len == 0:
-            adx, ady = 0.0, -1.0
-        else:
-            adx, ady = aim_dx / aim_len, aim_dy / aim_len
-        dot = max(-1.0, min(1.0, vxn * adx + vyn * ady))
-        angle = math.acos(dot)
-        return (angle <= self.cone_half_rad), dist
-
     # -------------------------------------------------------------------------
+    def cone(self, src_x, src_y, mouse_pos, walls=None):
+        """
+        This tick's FlameCone (or None with no aim). The shadow cast runs
+        once per position / aim / barricade state; every later call with the
+        same inputs — enemies, nests, drawing — gets the cached cone back.
+        `walls` is normally the level's ObstacleSet, which carries both the
+        ShadowCaster and the active barricades.
+        """
+        barricades = getattr(walls, "barricade_rects", ())
+        key = (src_x, src_y, mouse_pos[0], mouse_pos[1], id(walls), getattr(walls, "version", 0))
+        if key == self._cone_key:
+            return self._cone
+
+        aim_dx = mouse_pos[0] - src_x
+        aim_dy = mouse_pos[1] - src_y
+        cone = None
+        if aim_dx != 0 or aim_dy != 0:
+            aim_angle = math.atan2(aim_dy, aim_dx)
+            polygon = self._caster(walls).cast(
+                src_x, src_y, self.max_range,
+                aim_angle - self.cone_half_rad, aim_angle + self.cone_half_rad,
+                barricades,
+            )
+            cone = FlameCone(src_x, src_y, aim_angle, self.cone_half_rad, polygon)
+
+        self._cone_key = key
+        self._cone = cone
+        return cone
+
+    def _caster(self, walls):
+        """The level's ShadowCaster, or one built (once) for a plain wall list."""
+        caster = getattr(walls, "shadows", None)
+        if caster is None:
+            if self._fallback_caster is None or self._fallback_caster[0] is not walls:
+                self._fallback_caster = (walls, ShadowCaster(walls or []))
+            caster = self._fallback_caster[1]
+        return caster
+
     def can_hit_point(self, src_x, src_y, mouse_pos, target_x, target_y, walls):
         """
         Determines if a target at (target_x, target_y) is within the cone
         and not blocked by walls. Returns (in_cone, distance, visible_range).
         """
-        aim_dx = mouse_pos[0] - src_x
-        aim_dy = mouse_pos[1] - src_y
-        aim_angle = math.atan2(aim_dy, aim_dx)
-        aim_len = math.hypot(aim_dx, aim_dy)
-        if aim_len == 0:
+        cone = self.cone(src_x, src_y, mouse_pos, walls)
+        if cone is None:
             return False, 0.0, 0.0
-        dir_x, dir_y = aim_dx / aim_len, aim_dy / aim_len
-
-        center_dist = self._raycast(src_x, src_y, dir_x, dir_y, self.max_range, walls)
-        left_angle = aim_angle - self.cone_half_rad
-        right_angle = aim_angle + self.cone_half_rad
-        left_dist = self._raycast(src_x, src_y, math.cos(left_angle), math.sin(left_angle),
-                                  self.max_range, walls)
-        right_dist = self._raycast(src_x, src_y, math.cos(right_angle), math.sin(right_angle),
-                                   self.max_range, walls)
-        visible_range = min(center_dist, left_dist, right_dist)
-
-        in_cone, dist = self._point_in_cone(src_x, src_y, aim_dx, aim_dy,
-                                            target_x, target_y, visible_range)
-        return in_cone, dist, visible_range
+        dist = math.hypot(target_x - src_x, target_y - src_y)
+        return cone.contains(target_x, target_y), dist, cone.reach
 
     # -------------------------------------------------------------------------
-    def fire(self, x, y, mouse_pos, bullet_list, mouse_held: bool, enemies: list, burns: dict, walls=None, player=None):
-        """Handles warmup start, continuous damage, and cooldown sounds."""
+    def fire(self, x, y, mouse_pos, bullet_list, mouse_held: bool, enemies: list, burns: dict, walls=None, player=None,
+             enemy_grid=None, particles=None):
+        """
+        Handles warmup start, continuous damage, and cooldown sounds.
+        With `enemy_grid` (main's EntityGrid) only enemies near the cone are tested;
+        with `particles` (a ParticleSystem) each tick throws embers along the flame.
+        """
         if mouse_held:
             # Stop if out of fuel
             if self.fuel <= 0:
@@ -184,19 +231,24 @@ class Flamethrower(Weapon):
                     self.ready_to_fire = False
                     FLAME_END_SOUND.play()
                     return
-                for enemy in list(enemies):
-                    ex = enemy.x + enemy.size / 2.0
-                    ey = enemy.y + enemy.size / 2.0
-                    in_cone, dist, visible_range = self.can_hit_point(
-                        x, y, mouse_pos, ex, ey, walls or []
-                    )
-                    if in_cone:
-                        damage = self._calc_instant_damage(dist)
-                        enemy.take_damage(damage, player)
-                        burns[enemy] = {
-                            "remaining": self.burn_duration,
-                            "dps": self.burn_dps,
-                        }
+                # One visibility query per tick, shared by every target
+                cone = self.cone(x, y, mouse_pos, walls)
+                if cone is not None and particles is not None:
+                    particles.emit(FLAME_EMBERS, x, y, 3, angle=cone.aim_angle,
+                                   spread=cone.half_angle, reach=cone.polygon.reach)
+                if cone is None:
+                    candidates = []
+                elif enemy_grid is not None:
+                    candidates = [e for e in enemy_grid.query_rect(cone.bounds(pad=64)) if e.is_alive()]
+                else:
+                    candidates = list(enemies)
+                for enemy, dist in cone.hits(candidates, enemy_hit_point) if candidates else ():
+                    damage = self._calc_instant_damage(dist)
+                    enemy.take_damage(damage, player)
+                    burns[enemy] = {
+                        "remaining": self.burn_duration,
+                        "dps": self.burn_dps,
+                    }
                 self.timer = self.cooldown
 
         else:
@@ -244,36 +296,21 @@ class Flamethrower(Weapon):
             return
         cam_x, cam_y = camera_offset
         screen_x, screen_y = x - cam_x, y - cam_y
-        screen_mouse_x, screen_mouse_y = mouse_pos[0] - cam_x, mouse_pos[1] - cam_y
-        aim_dx, aim_dy = screen_mouse_x - screen_x, screen_mouse_y - screen_y
-        aim_angle = math.atan2(aim_dy, aim_dx)
-
-        if walls:
-            dir_x, dir_y = math.cos(aim_angle), math.sin(aim_angle)
-            center_dist = self._raycast(x, y, dir_x, dir_y, self.max_range, walls)
-            left_angle = aim_angle - self.cone_half_rad
-            right_angle = aim_angle + self.cone_half_rad
-            left_dist = self._raycast(x, y, math.cos(left_angle), math.sin(left_angle), self.max_range, walls)
-            right_dist = self._raycast(x, y, math.cos(right_angle), math.sin(right_angle), self.max_range, walls)
-            visible_range = min(center_dist, left_dist, right_dist)
-        else:
-            visible_range = self.max_range
-
-        left_angle = aim_angle - self.cone_half_rad
-        right_angle = aim_angle + self.cone_half_rad
-        left_x = screen_x + math.cos(left_angle) * visible_range
-        left_y = screen_y + math.sin(left_angle) * visible_range
-        right_x = screen_x + math.cos(right_angle) * visible_range
-        right_y = screen_y + math.sin(right_angle) * visible_range
+        # Same cached cone the damage pass used this tick
+        cone = self.cone(x, y, mouse_pos, walls)
+        if cone is None:
+            return
 
-        tri_points = [(int(screen_x), int(screen_y)),
-                      (int(left_x), int(left_y)),
-                      (int(right_x), int(right_y))]
+        # Wall-clipped fan: origin + the sight polygon's outline
+        fan_points = [(int(px - cam_x), int(py - cam_y)) for (px, py) in cone.polygon.fan()]
 
         bbox_size = int(self.max_range * 2) + 8
-        surf = pygame.Surface((bbox_size, bbox_size), pygame.SRCALPHA)
+        if self._cone_surf is None:
+            self._cone_surf = pygame.Surface((bbox_size, bbox_size), pygame.SRCALPHA)
+        surf = self._cone_surf
+        surf.fill((0, 0, 0, 0))
         offset_x, offset_y = screen_x - (bbox_size // 2), screen_y - (bbox_size // 2)
-        rel_points = [(px - offset_x, py - offset_y) for (px, py) in tri_points]
+        rel_points = [(px - offset_x, py - offset_y) for (px, py) in fan_points]
         pygame.draw.polygon(surf, self.cone_color, rel_points)
         pygame.draw.polygon(surf, self.outline_color, rel_points, 1)
         surface.blit(surf, (offset_x, offset_y))
@@ -0,0 +1,186 @@
+# flow_field.py
+from collections import deque
+import numpy as np
+
+UNREACHED = -1
+
+# 8-way neighbours (dx, dy); diagonals may not cut past a blocked corner
+NEIGHBOURS = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+
+class FlowField:
+    """
+    Shared pathfinding field toward the player.
+
+    The level is split into square cells; a cell is open when a `body`-sized
+    mover centred on it would not touch any wall or active barricade, so
+    every waypoint is a spot a standard enemy fits (bigger ones slide along
+    walls as before). Walls are at least one cell thick, so nothing leaks
+    through them.
+
+    One BFS from the player's cell gives every open cell its step distance,
+    and each cell then stores which neighbour is one step closer. Chasing
+    enemies just read their cell's next step, so pursuit goes around walls
+    and through doorways at O(1) per enemy.
+
+    `update` is called every frame but only redoes work when the player
+    moves to another cell (BFS) or a barricade opens/closes (blocked grid +
+    BFS, via ObstacleSet.version).
+    """
+
+    def __init__(self, obstacles, width, height, cell_size=32, body=30):
+        self.obstacles = obstacles
+        self.cell_size = cell_size
+        self.body = body
+        # Where a body sits inside its cell, and the point steered to: half a
+        # pixel off so the int() in movers' rects never lands a pixel short
+        self._pad = (cell_size - body) // 2
+        self._centre = self._pad + body / 2 + 0.5
+        self.cols = -(-int(width) // cell_size)
+        self.rows = -(-int(height) // cell_size)
+
+        self.blocked = np.zeros((self.rows, self.cols), dtype=bool)
+        self.dist = np.full((self.rows, self.cols), UNREACHED, dtype=np.int32)
+        self.step_x = np.zeros((self.rows, self.cols), dtype=np.int8)
+        self.step_y = np.zeros((self.rows, self.cols), dtype=np.int8)
+
+        self.target_cell = None
+        self._obstacle_version = None
+
+    # -------------------------------------------------------------------------
+    def cell_of(self, x, y):
+        """(cx, cy) for a point, or None outside the grid."""
+        cx = int(x // self.cell_size)
+        cy = int(y // self.cell_size)
+        if 0 <= cx < self.cols and 0 <= cy < self.rows:
+            return cx, cy
+        return None
+
+    def update(self, target_x, target_y):
+        """Point the field at (target_x, target_y); cheap when nothing changed."""
+        rects = getattr(self.obstacles, "barricade_rects", ())
+        version = getattr(self.obstacles, "version", 0)
+        rebuild = version != self._obstacle_version
+        if rebuild:
+            self._obstacle_version = version
+            self._mark_blocked(list(self.obstacles) + list(rects))
+
+        cell = self.cell_of(target_x, target_y)
+        if cell is None or (cell == self.target_cell and not rebuild):
+            return
+        self.target_cell = cell
+        self._bfs(cell)
+        self._build_steps()
+
+    def waypoint(self, x, y):
+        """
+        Centre of the next cell toward the target, or None when (x, y) is in
+        the target's cell, outside the grid or cut off from the target.
+        """
+        cell = self.cell_of(x, y)
+        if cell is None or cell == self.target_cell:
+            return None
+        cx, cy = cell
+        sx = int(self.step_x[cy, cx])
+        sy = int(self.step_y[cy, cx])
+        if sx == 0 and sy == 0:
+            return None
+        cs = self.cell_size
+        return ((cx + sx) * cs + self._centre, (cy + sy) * cs + self._centre)
+
+    def waypoints(self, xs, ys):
+        """
+        Vectorized waypoint() for arrays of positions: (wx, wy, valid), where
+        rows with valid False have no next step (same cases as None above).
+        """
+        cs = self.cell_size
+        cx = np.floor(np.asarray(xs) / cs).astype(np.int64)
+        cy = np.floor(np.asarray(ys) / cs).astype(np.int64)
+        inside = (cx >= 0) & (cx < self.cols) & (cy >= 0) & (cy < self.rows)
+        sx = np.zeros(cx.shape, dtype=np.int64)
+        sy = np.zeros(cx.shape, dtype=np.int64)
+        sx[inside] = self.step_x[cy[inside], cx[inside]]
+        sy[inside] = self.step_y[cy[inside], cx[inside]]
+        valid = inside & ((sx != 0) | (sy != 0))
+        if self.target_cell is not None:
+            valid &= (cx != self.target_cell[0]) | (cy != self.target_cell[1])
+        return (cx + sx) * cs + self._centre, (cy + sy) * cs + self._centre, valid
+
+    # -------------------------------------------------------------------------
+    def _mark_blocked(self, rects):
+        cs, pad, body = self.cell_size, self._pad, self.body
+        self.blocked[:] = False
+        for rect in rects:
+            # Cells whose body span [c * cs + pad, c * cs + pad + body) overlaps rect
+            c0 = max(0, (rect.left - pad - body) // cs + 1)
+            c1 = min(self.cols, -(-(rect.right - pad) // cs))
+            r0 = max(0, (rect.top - pad - body) // cs + 1)
+            r1 = min(self.rows, -(-(rect.bottom - pad) // cs))
+            if c0 < c1 and r0 < r1:
+                self.blocked[r0:r1, c0:c1] = True
+
+    def _bfs(self, start):
+        cols, rows = self.cols, self.rows
+        # Work on a padded flat copy so the inner loop needs no bounds checks
+        width = cols + 2
+        open_ = np.ones((rows + 2, width), dtype=bool)
+        open_[1:-1, 1:-1] = ~self.blocked
+        open_[0, :] = open_[-1, :] = open_[:, 0] = open_[:, -1] = False
+        open_ = open_.ravel().tolist()
+        dist = [UNREACHED] * ((rows + 2) * width)
+
+        straight = (1, -1, width, -width)
+        diagonal = ((width + 1, 1, width), (width - 1, -1, width),
+                    (-width + 1, 1, -width), (-width - 1, -1, -width))
+
+        sx, sy = start
+        origin = (sy + 1) * width + sx + 1
+        dist[origin] = 0
+        queue = deque([origin])
+        while queue:
+            i = queue.popleft()
+            d = dist[i] + 1
+            for o in straight:
+                j = i + o
+                if open_[j] and dist[j] == UNREACHED:
+                    dist[j] = d
+                    queue.append(j)
+            for o, a, b in diagonal:
+                j = i + o
+                if open_[j] and dist[j] == UNREACHED and open_[i + a] and open_[i + b]:
+                    dist[j] = d
+                    queue.append(j)
+
+        self.dist = np.array(dist, dtype=np.int32).reshape(rows + 2, width)[1:-1, 1:-1]
+
+    def _build_steps(self):
+        """For every cell pick the neighbour with the smallest distance (vectorized)."""
+        rows, cols = self.rows, self.cols
+        far = np.iinfo(np.int32).max
+        dist = np.where(self.dist == UNREACHED, far, self.dist)
+        padded = np.full((rows + 2, cols + 2), far, dtype=np.int32)
+        padded[1:-1, 1:-1] = dist
+        open_pad = np.zeros((rows + 2, cols + 2), dtype=bool)
+        open_pad[1:-1, 1:-1] = ~self.blocked
+
+        def shifted(arr, dx, dy):
+            return arr[1 + dy:rows + 1 + dy, 1 + dx:cols + 1 + dx]
+
+        candidates = []
+        for dx, dy in NEIGHBOURS:
+            d = shifted(padded, dx, dy)
+            if dx and dy:
+                corner_open = shifted(open_pad, dx, 0) & shifted(open_pad, 0, dy)
+                d = np.where(corner_open, d, far)
+            candidates.append(d)
+        candidates = np.stack(candidates)
+
+        best = candidates.argmin(axis=0)
+        best_dist = np.take_along_axis(candidates, best[None], axis=0)[0]
+        # Blocked cells (e.g. an enemy pushed into a wall's edge) also step out
+        # toward their nearest open neighbour
+        improves = (best_dist < dist) & (best_dist != far)
+
+        offsets = np.array(NEIGHBOURS, dtype=np.int8)
+        self.step_x = np.where(improves, offsets[best, 0], 0).astype(np.int8)
+        self.step_y = np.where(improves, offsets[best, 1], 0).astype(np.int8)
@@ -1,3 +1,4 @@
+import numpy as np
 import pygame
 
 class FogOfWar:
@@ -11,6 +12,8 @@ class FogOfWar:
 
         # Optional blurred reveal brush (soft edges)
         self.reveal_brush = self._make_reveal_brush(220)
+        self._brushes = {}         # radius -> reveal_brush scaled to it
+        self._last_reveal = None   # (x, y, radius) of the last stamp
 
     def _make_reveal_brush(self, radius):
         """Create a soft circular brush for smooth fog revealing."""
@@ -21,8 +24,14 @@ class FogOfWar:
         return brush
 
     def reveal_circle(self, x, y, radius=200):
-        """Punches a transparent hole around the player."""
-        brush = pygame.transform.smoothscale(self.reveal_brush, (radius*2, radius*2))
+        """Punches a transparent hole around the player (a repeat of the last stamp is skipped)."""
+        if self._last_reveal == (x, y, radius):
+            return
+        self._last_reveal = (x, y, radius)
+        brush = self._brushes.get(radius)
+        if brush is None:
+            brush = pygame.transform.smoothscale(self.reveal_brush, (radius*2, radius*2))
+            self._brushes[radius] = brush
         self.fog.blit(brush, (x - radius, y - radius), special_flags=pygame.BLEND_RGBA_MIN)
 
     def reveal_rect(self, rect):
@@ -35,3 +44,233 @@ class FogOfWar:
     def reset(self):
         """Restore full fog visibility (reset to completely dark)."""
         self.fog.fill((0, 0, 0, 255))
+        self._last_reveal = None
+
+
+class GridFogOfWar:
+    """
+    Same fog as FogOfWar, stored as one alpha byte per `cell_size` cell.
+
+    Exploration lives in a NumPy grid (a few tens of KB instead of a
+    full-resolution SRCALPHA surface). reveal_circle() stamps a mask
+    precomputed per radius with an element-wise minimum, which is what
+    FogOfWar's BLEND_RGBA_MIN brush blit does per pixel. A stamp that would
+    not lower any cell is skipped, as is a repeat from the same cell.
+    reveal_polygon() is the line-of-sight version: it only clears cells
+    inside the player's SightPolygon, so walls keep what is behind them.
+
+    The map is cut into `tile_cells`-square tiles. Each keeps its lowest and
+    highest alpha, so draw() skips fully revealed tiles and fills fully
+    fogged ones; tiles along the edge of the explored area are upscaled
+    (bilinear between cell centres) once and cached. Reveals mark the tiles
+    they change dirty, and only those are recomposited, at most
+    `refresh_budget` per frame. draw() only visits tiles under the camera and
+    drops cached tiles that scrolled away.
+    """
+
+    def __init__(self, width, height, cell_size=8, tile_cells=16, refresh_budget=4):
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.cols = -(-int(width) // cell_size)
+        self.rows = -(-int(height) // cell_size)
+        self.tile_cells = tile_cells
+        self.tile_size = tile_cells * cell_size
+        self.tile_cols = -(-self.cols // tile_cells)
+        self.tile_rows = -(-self.rows // tile_cells)
+
+        # Indexed [col, row] like pygame.surfarray; 255 = fully fogged.
+        # Rounded up to whole tiles; cells past the map edge stay fogged.
+        self.alpha = np.full((self.tile_cols * tile_cells, self.tile_rows * tile_cells), 255, dtype=np.uint8)
+        # Per tile: lowest and highest alpha
+        self._low = np.full((self.tile_cols, self.tile_rows), 255, dtype=np.uint8)
+        self._high = np.full((self.tile_cols, self.tile_rows), 255, dtype=np.uint8)
+
+        self._masks = {}           # radius -> stamp (see _mask)
+        self._last_reveal = None   # (cell x, cell y, radius) of the last stamp
+        self._upscale = self._bilinear_weights()
+        self._tiles = {}           # (tc, tr) -> upscaled edge tile
+        self._dirty = set()        # cached tiles whose cells changed since they were drawn
+        # Dirty tiles recomposited per draw; the rest show their last image a
+        # frame or two longer (fog only ever clears, so they lag, never lie)
+        self.refresh_budget = refresh_budget
+        self._window = None        # tile range draw() last visited
+
+    def _bilinear_weights(self):
+        """
+        (tile_size, tile_cells + 2) matrix taking a tile's cells plus one
+        neighbour on each side to its pixels, interpolating linearly between
+        cell centres. W @ cells @ W.T is the smoothed tile; the neighbours
+        make it blend across tile seams.
+        """
+        n, cs = self.tile_cells, self.cell_size
+        t = (np.arange(n * cs) + 0.5) / cs + 0.5  # pixel centres, in padded cell units
+        k0 = np.floor(t).astype(np.int64)
+        frac = t - k0
+        weights = np.zeros((n * cs, n + 2), dtype=np.float32)
+        weights[np.arange(n * cs), k0] = 1.0 - frac
+        weights[np.arange(n * cs), np.minimum(k0 + 1, n + 1)] += frac
+        return weights
+
+    def _mask(self, radius):
+        """
+        FogOfWar's reveal brush sampled at cell centres, centred on the
+        middle cell: alpha rises linearly from the centre to the rim and is
+        0 in the corners of the brush square.
+        """
+        mask = self._masks.get(radius)
+        if mask is None:
+            reach = int(radius // self.cell_size)
+            offsets = np.arange(-reach, reach + 1) * float(self.cell_size)
+            dist = np.hypot(offsets[:, None], offsets[None, :])
+            mask = np.where(dist < radius, 255.0 * (1.0 - dist / radius), 0.0).astype(np.uint8)
+            self._masks[radius] = mask
+        return mask
+
+    def reveal_circle(self, x, y, radius=200):
+        """Punches a transparent hole around the player."""
+        cx = int(x // self.cell_size)
+        cy = int(y // self.cell_size)
+        if self._last_reveal == (cx, cy, radius):
+            return  # same stamp as last time: nothing new
+        self._last_reveal = (cx, cy, radius)
+
+        mask = self._mask(radius)
+        reach = mask.shape[0] // 2
+        self._stamp(cx - reach, cy - reach, mask)
+
+    def reveal_polygon(self, polygon, radius):
+        """
+        Line-of-sight reveal: clears the cells whose centres lie inside
+        `polygon` (a SightPolygon, e.g. PlayerSight.polygon), from clear at
+        its origin to fully fogged at `radius`, and leaves the rest alone.
+        """
+        cs = self.cell_size
+        left, top, right, bottom = polygon.bounds()
+        c0, r0 = max(int(left // cs), 0), max(int(top // cs), 0)
+        c1, r1 = min(int(right // cs) + 1, self.cols), min(int(bottom // cs) + 1, self.rows)
+        if c0 >= c1 or r0 >= r1:
+            return
+        xs = np.repeat((np.arange(c0, c1) + 0.5) * cs, r1 - r0)
+        ys = np.tile((np.arange(r0, r1) + 0.5) * cs, c1 - c0)
+        inside, dist = polygon.contains(xs, ys)
+        alpha = np.where(inside, np.minimum(dist * (255.0 / radius), 255.0), 255.0)
+        self._stamp(c0, r0, alpha.astype(np.uint8).reshape(c1 - c0, r1 - r0))
+
+    def _stamp(self, c, r, stamp):
+        """Lower the cells under `stamp` (placed with its corner on cell (c, r)) to its values."""
+        c0, c1 = max(c, 0), min(c + stamp.shape[0], self.cols)
+        r0, r1 = max(r, 0), min(r + stamp.shape[1], self.rows)
+        if c0 >= c1 or r0 >= r1:
+            return
+        region = self.alpha[c0:c1, r0:r1]
+        stamp = stamp[c0 - c:c1 - c, r0 - r:r1 - r]
+        lowered = region > stamp
+        cols = np.flatnonzero(lowered.any(axis=1))
+        if not len(cols):
+            return  # already at least this clear
+        rows = np.flatnonzero(lowered.any(axis=0))
+        np.minimum(region, stamp, out=region)
+        self._changed(c0 + int(cols[0]), c0 + int(cols[-1]) + 1, r0 + int(rows[0]), r0 + int(rows[-1]) + 1)
+
+    def reveal_rect(self, rect):
+        """Used to instantly reveal full rooms or nest areas."""
+        rect = pygame.Rect(rect)
+        c0 = max(rect.left // self.cell_size, 0)
+        r0 = max(rect.top // self.cell_size, 0)
+        c1 = min(-(-rect.right // self.cell_size), self.cols)
+        r1 = min(-(-rect.bottom // self.cell_size), self.rows)
+        if c0 < c1 and r0 < r1:
+            self.alpha[c0:c1, r0:r1] = 0
+            self._changed(c0, c1, r0, r1)
+
+    def _changed(self, c0, c1, r0, r1):
+        """Cells [c0, c1) x [r0, r1) were lowered: refresh their tiles' ranges and mark cached tiles dirty."""
+        n = self.tile_cells
+        tc0, tc1 = c0 // n, -(-c1 // n)
+        tr0, tr1 = r0 // n, -(-r1 // n)
+        tiles = self.alpha[tc0 * n:tc1 * n, tr0 * n:tr1 * n].reshape(tc1 - tc0, n, tr1 - tr0, n)
+        self._low[tc0:tc1, tr0:tr1] = tiles.min(axis=(1, 3))
+        self._high[tc0:tc1, tr0:tr1] = tiles.max(axis=(1, 3))
+
+        # A neighbour's smoothing reads one cell into this range, so it is dirty too
+        tc0, tc1 = max(c0 - 1, 0) // n, (c1 // n) + 1
+        tr0, tr1 = max(r0 - 1, 0) // n, (r1 // n) + 1
+        for key in self._tiles:
+            if tc0 <= key[0] < tc1 and tr0 <= key[1] < tr1:
+                self._dirty.add(key)
+
+    # -------------------------------------------------------------------------
+    def _render_tile(self, tc, tr, tile=None):
+        """Tile (tc, tr) upscaled to screen pixels with smoothing (into `tile` if given)."""
+        n = self.tile_cells
+        c0, r0 = tc * n - 1, tr * n - 1
+        cells = self.alpha[max(c0, 0):c0 + n + 2, max(r0, 0):r0 + n + 2].astype(np.float32)
+        if cells.shape != (n + 2, n + 2):
+            # At the outer edge: repeat the border cells
+            cells = np.pad(cells, ((max(-c0, 0), n + 2 - cells.shape[0] - max(-c0, 0)),
+                                   (max(-r0, 0), n + 2 - cells.shape[1] - max(-r0, 0))), mode="edge")
+        smooth = self._upscale @ cells @ self._upscale.T
+        if tile is None:
+            tile = pygame.Surface((self.tile_size, self.tile_size), pygame.SRCALPHA)
+        alpha = pygame.surfarray.pixels_alpha(tile)
+        np.rint(smooth, out=smooth)
+        alpha[:] = smooth
+        del alpha  # unlock the surface before blitting it
+        return tile
+
+    def draw(self, screen, camera_offset):
+        ts = self.tile_size
+        cam_x, cam_y = int(camera_offset[0]), int(camera_offset[1])
+        sw, sh = screen.get_size()
+        tc0, tr0 = max(cam_x // ts, 0), max(cam_y // ts, 0)
+        tc1 = min(-(-(cam_x + sw) // ts), self.tile_cols)
+        tr1 = min(-(-(cam_y + sh) // ts), self.tile_rows)
+        if tc0 >= tc1 or tr0 >= tr1:
+            return
+
+        window = (tc0, tc1, tr0, tr1)
+        if window != self._window:
+            # Keep only the cached tiles still on screen
+            self._window = window
+            self._tiles = {key: tile for key, tile in self._tiles.items()
+                           if tc0 <= key[0] < tc1 and tr0 <= key[1] < tr1}
+            self._dirty &= self._tiles.keys()
+
+        refreshes = 0
+        lows = self._low[tc0:tc1, tr0:tr1].T.tolist()
+        highs = self._high[tc0:tc1, tr0:tr1].T.tolist()
+        for tr in range(tr0, tr1):
+            low, high = lows[tr - tr0], highs[tr - tr0]
+            y = tr * ts - cam_y
+            h = min(ts, self.height - tr * ts)  # stop at the map edge, like the full-size surface
+            run = None  # first column of a run of fully fogged tiles, filled in one go
+            for tc in range(tc0, tc1 + 1):
+                if tc < tc1 and low[tc - tc0] == 255:
+                    if run is None:
+                        run = tc
+                    continue
+                if run is not None:
+                    # Fill cost is mostly per row, so one wide fill beats one per tile
+                    screen.fill((0, 0, 0), (run * ts - cam_x, y, min((tc - run) * ts, self.width - run * ts), h))
+                    run = None
+                if tc == tc1 or high[tc - tc0] == 0:
+                    continue  # fully explored
+                key = (tc, tr)
+                tile = self._tiles.get(key)
+                if tile is None:
+                    tile = self._tiles[key] = self._render_tile(tc, tr)
+                elif key in self._dirty and refreshes < self.refresh_budget:
+                    self._render_tile(tc, tr, tile)
+                    self._dirty.discard(key)
+                    refreshes += 1
+                screen.blit(tile, (tc * ts - cam_x, y), (0, 0, min(ts, self.width - tc * ts), h))
+
+    def reset(self):
+        """Restore full fog visibility (reset to completely dark)."""
+        self.alpha.fill(255)
+        self._low.fill(255)
+        self._high.fill(255)
+        self._tiles.clear()
+        self._dirty.clear()
+        self._last_reveal = None
@@ -1,8 +1,18 @@
 # health_pack.py
 import pygame
 import random
+from asset_manager import ASSETS
+
+
+def _fallback_sprite():
+    sprite = pygame.Surface((24, 24))
+    sprite.fill((200, 30, 30))  # fallback red box
+    return sprite
+
 
 class HealthPack:
+    __slots__ = ("x", "y", "heal_amount", "size", "rect", "collected")
+
     def __init__(self, x, y, heal_amount=35):
         self.x = x
         self.y = y
@@ -11,18 +21,15 @@ class HealthPack:
         self.rect = pygame.Rect(x - self.size/2, y - self.size/2, self.size, self.size)
         self.collected = False
 
-        # Load sprite
-        try:
-            self.image = pygame.image.load("assets/healthPack.png").convert_alpha()
-        except:
-            self.image = pygame.Surface((self.size, self.size))
-            self.image.fill((200, 30, 30))  # fallback red box
+    # Sprite and sound are loaded by the first pack and shared by all of them
+    @property
+    def image(self):
+        return ASSETS.image("assets/healthPack.png", fallback=_fallback_sprite)
 
+    @property
+    def pickup_sound(self):
         # Optional pickup sound
-        try:
-            self.pickup_sound = pygame.mixer.Sound("assets/audio/health_pickup.wav")
-        except:
-            self.pickup_sound = None
+        return ASSETS.sound("assets/audio/health_pickup.wav")
 
     def update(self, player):
         """Check if player collects the health pack."""
@@ -6,6 +6,10 @@ from apartment_walls import APARTMENT_WALLS
 from rat_enemy import RatEnemy
 from bedbug_enemy import BedbugEnemy
 from mighty_mite_enemy import MightyMite
+from spatial_index import WallGrid, ObstacleSet
+from visibility_table import VisibilityTable
+from distance_field import DistanceField
+from visibility_polygon import ShadowCaster
 
 class Level:
     def __init__(self, name, background_path, width, height, enemy_types, spawn_interval, max_enemies, objective_text, walls=None):
@@ -26,6 +30,16 @@ class Level:
         self.enemies = []
         self.completed = False
         self.walls = list(walls) if walls else []
+        # Static walls never move, so index them once for every collision query
+        self.wall_index = WallGrid(self.walls)
+        # ...and bake which parts of the map can see each other
+        self.wall_index.visibility = VisibilityTable(self.walls, self.width, self.height)
+        # ...and how much room there is around every point
+        self.wall_index.distance = DistanceField(self.walls, self.width, self.height)
+        # Wall edges as segments, for visibility polygons (flamethrower, fog)
+        self.wall_index.shadows = ShadowCaster(self.walls)
+        # Walls + barricades, shared read-only by every mover (see set_barricades)
+        self.obstacles = ObstacleSet(self.wall_index)
         
         self.ambient_sound = pygame.mixer.Sound("assets/audio/florescentHum.wav")
         self.ambient_sound.set_volume(0.2)
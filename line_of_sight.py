@@ -0,0 +1,148 @@
+# line_of_sight.py
+import math
+from spatial_index import WallGrid
+
+
+def segment_rect_entry(x0, y0, x1, y1, rect):
+    """
+    Slab test of the segment (x0, y0) -> (x1, y1) against an axis-aligned rect.
+    Returns the parameter t in [0, 1] where the segment first touches the rect,
+    or None if it misses. A segment starting inside the rect returns 0.0.
+    """
+    dx = x1 - x0
+    dy = y1 - y0
+    t_min = 0.0
+    t_max = 1.0
+
+    # X slab
+    if dx == 0.0:
+        if x0 < rect.left or x0 > rect.right:
+            return None
+    else:
+        inv = 1.0 / dx
+        t1 = (rect.left - x0) * inv
+        t2 = (rect.right - x0) * inv
+        if t1 > t2:
+            t1, t2 = t2, t1
+        if t1 > t_min:
+            t_min = t1
+        if t2 < t_max:
+            t_max = t2
+        if t_min > t_max:
+            return None
+
+    # Y slab
+    if dy == 0.0:
+        if y0 < rect.top or y0 > rect.bottom:
+            return None
+    else:
+        inv = 1.0 / dy
+        t1 = (rect.top - y0) * inv
+        t2 = (rect.bottom - y0) * inv
+        if t1 > t2:
+            t1, t2 = t2, t1
+        if t1 > t_min:
+            t_min = t1
+        if t2 < t_max:
+            t_max = t2
+        if t_min > t_max:
+            return None
+
+    return t_min
+
+
+def traverse_cells(x0, y0, x1, y1, cell_size):
+    """
+    Grid DDA (Amanatides & Woo): yield (cell_key, t_enter) for every grid
+    cell the segment passes through, in order along the segment.
+    """
+    cx = int(x0 // cell_size)
+    cy = int(y0 // cell_size)
+    end_cx = int(x1 // cell_size)
+    end_cy = int(y1 // cell_size)
+    dx = x1 - x0
+    dy = y1 - y0
+
+    step_x = 1 if dx > 0 else -1
+    step_y = 1 if dy > 0 else -1
+    if dx != 0:
+        next_x = (cx + (1 if dx > 0 else 0)) * cell_size
+        t_max_x = (next_x - x0) / dx
+        t_delta_x = cell_size / abs(dx)
+    else:
+        t_max_x = t_delta_x = math.inf
+    if dy != 0:
+        next_y = (cy + (1 if dy > 0 else 0)) * cell_size
+        t_max_y = (next_y - y0) / dy
+        t_delta_y = cell_size / abs(dy)
+    else:
+        t_max_y = t_delta_y = math.inf
+
+    t = 0.0
+    while True:
+        yield (cx, cy), t
+        if cx == end_cx and cy == end_cy:
+            return
+        if t_max_x < t_max_y:
+            t = t_max_x
+            t_max_x += t_delta_x
+            cx += step_x
+        else:
+            t = t_max_y
+            t_max_y += t_delta_y
+            cy += step_y
+        if t > 1.0:
+            return
+
+
+def first_hit(x0, y0, x1, y1, walls):
+    """
+    Nearest wall hit along the segment: returns (t, wall) or (None, None).
+    With a WallGrid only the cells under the segment are visited, and the walk
+    stops as soon as no later cell can hold a nearer hit.
+    """
+    best_t = None
+    best_wall = None
+
+    if isinstance(walls, WallGrid):
+        cells = walls.cells
+        for key, t_enter in traverse_cells(x0, y0, x1, y1, walls.cell_size):
+            if best_t is not None and t_enter > best_t:
+                break
+            for wall in cells.get(key, ()):
+                t = segment_rect_entry(x0, y0, x1, y1, wall)
+                if t is not None and (best_t is None or t < best_t):
+                    best_t, best_wall = t, wall
+        return best_t, best_wall
+
+    for wall in walls or ():
+        t = segment_rect_entry(x0, y0, x1, y1, wall)
+        if t is not None and (best_t is None or t < best_t):
+            best_t, best_wall = t, wall
+    return best_t, best_wall
+
+
+def segment_blocked(x0, y0, x1, y1, walls, barricades=None):
+    """
+    True if any wall or active barricade touches the segment.
+    An ObstacleSet passed as `walls` brings its own active barricades.
+    """
+    if barricades is None:
+        barricades = getattr(walls, "active_barricades", None)
+    if barricades:
+        for b in barricades:
+            if b.active and segment_rect_entry(x0, y0, x1, y1, b.rect) is not None:
+                return True
+
+    if isinstance(walls, WallGrid):
+        cells = walls.cells
+        for key, _ in traverse_cells(x0, y0, x1, y1, walls.cell_size):
+            for wall in cells.get(key, ()):
+                if segment_rect_entry(x0, y0, x1, y1, wall) is not None:
+                    return True
+        return False
+
+    for wall in walls or ():
+        if segment_rect_entry(x0, y0, x1, y1, wall) is not None:
+            return True
+    return False
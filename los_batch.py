@@ -0,0 +1,111 @@
+# los_batch.py
+import numpy as np
+from visibility_table import HIDDEN, VISIBLE
+
+
+class LineOfSightBatch:
+    """
+    Per-frame batched line of sight: every enemy/nest -> player ray is gathered
+    once and resolved against all wall rects in one vectorized NumPy slab test.
+    Update methods then read their answer back with `sees(entity)`.
+
+    When the level's WallGrid has a baked VisibilityTable, rays between
+    HIDDEN cells are answered directly and rays between VISIBLE cells only
+    need testing against the active barricades.
+    """
+
+    def __init__(self, walls):
+        self.table = getattr(walls, "visibility", None)
+        self.wall_boxes = np.array(
+            [(w.left, w.top, w.right, w.bottom) for w in walls], dtype=np.float64
+        ).reshape(-1, 4)
+        self.results = {}
+
+    # -------------------------------------------------------------------------
+    def resolve(self, viewers, player, barricades=None):
+        """Compute this frame's line of sight from every viewer to the player."""
+        self.results = {}
+        viewers = list(viewers)
+        if not viewers:
+            return
+
+        ex = np.fromiter((v.x for v in viewers), dtype=np.float64, count=len(viewers))
+        ey = np.fromiter((v.y for v in viewers), dtype=np.float64, count=len(viewers))
+        visible = self.visible_from(ex, ey, player, barricades)
+        self.results = dict(zip(viewers, visible.tolist()))
+
+    def sees(self, entity):
+        """This frame's result for entity, or None if it was not in the batch."""
+        return self.results.get(entity)
+
+    def visible_from(self, ex, ey, player, barricades=None):
+        """
+        Line of sight from arrays of points (ex, ey) to the player; (N,) bool.
+        Used directly by callers that already keep positions in arrays.
+        """
+        ex = np.asarray(ex, dtype=np.float64)
+        ey = np.asarray(ey, dtype=np.float64)
+        px, py = float(player.x), float(player.y)
+
+        barricade_boxes = np.array(
+            [(b.rect.left, b.rect.top, b.rect.right, b.rect.bottom)
+             for b in (barricades or []) if b.active],
+            dtype=np.float64,
+        ).reshape(-1, 4)
+        all_boxes = np.concatenate([self.wall_boxes, barricade_boxes])
+
+        visible = np.ones(len(ex), dtype=bool)
+
+        if self.table is not None:
+            verdict = self._table_verdicts(ex, ey, px, py)
+            visible[verdict == HIDDEN] = False
+            walls_clear = verdict == VISIBLE
+            if len(barricade_boxes):
+                visible[walls_clear] = ~self._blocked(ex[walls_clear], ey[walls_clear], px, py,
+                                                      barricade_boxes)
+            todo = (verdict != HIDDEN) & ~walls_clear
+        else:
+            todo = np.ones(len(ex), dtype=bool)
+
+        if todo.any():
+            visible[todo] = ~self._blocked(ex[todo], ey[todo], px, py, all_boxes)
+        return visible
+
+    # -------------------------------------------------------------------------
+    def _table_verdicts(self, ex, ey, px, py):
+        table = self.table
+        cs = table.cell_size
+        cx = np.floor(ex / cs).astype(np.int64)
+        cy = np.floor(ey / cs).astype(np.int64)
+        inside = (ex >= 0) & (ey >= 0) & (cx < table.cols) & (cy < table.rows)
+
+        verdict = np.full(len(ex), -1, dtype=np.int8)  # -1 = needs the exact test
+        player_cell = table.cell_of(px, py)
+        if player_cell is None:
+            return verdict
+        cells = cy[inside] * table.cols + cx[inside]
+        verdict[inside] = table.table[cells, player_cell]
+        return verdict
+
+    @staticmethod
+    def _blocked(ex, ey, px, py, boxes):
+        """Slab test of N segments (ex, ey) -> (px, py) against M boxes; (N,) bool."""
+        if len(ex) == 0 or len(boxes) == 0:
+            return np.zeros(len(ex), dtype=bool)
+
+        dx = (px - ex)[:, None]
+        dy = (py - ey)[:, None]
+        # Nudge axis-parallel rays off zero so the slab math stays finite
+        dx = np.where(dx == 0.0, 1e-12, dx)
+        dy = np.where(dy == 0.0, 1e-12, dy)
+        x0 = ex[:, None]
+        y0 = ey[:, None]
+
+        tx1 = (boxes[:, 0] - x0) / dx
+        tx2 = (boxes[:, 2] - x0) / dx
+        ty1 = (boxes[:, 1] - y0) / dy
+        ty2 = (boxes[:, 3] - y0) / dy
+
+        t_enter = np.maximum(np.maximum(np.minimum(tx1, tx2), np.minimum(ty1, ty2)), 0.0)
+        t_exit = np.minimum(np.minimum(np.maximum(tx1, tx2), np.maximum(ty1, ty2)), 1.0)
+        return (t_enter <= t_exit).any(axis=1)
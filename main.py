@@ -1,18 +1,29 @@
 import pygame
 import random
+import numpy as np
 from player import Player
 from level import Level, APARTMENT_WALLS
 from rat_nest_spawner import create_rat_nests
 from barricade import Barricade
-from enemy import Enemy, load_burn_frames
+from enemy import Enemy, load_burn_frames, set_camera_view, BURN_CINDERS
 from brood_fly import BroodFly
 from rat_enemy import RatEnemy
-from plasma_cannon import PlasmaBlob, PlasmaPuddle
+from rat_swarm import RatSwarm, SwarmRat
+from particle_system import ParticleSystem
+from plasma_cannon import PlasmaPuddle, explode_at
 from flamethrower import Flamethrower
 from minigun import Minigun
 from hud import HUD
-from fog_of_war import FogOfWar
+from fog_of_war import GridFogOfWar
 from pause_menu import PauseMenu
+from los_batch import LineOfSightBatch
+from spatial_index import EntityGrid
+from projectile_collision import sweep_hits
+from object_pool import release_to_pool
+from flow_field import FlowField
+from visibility_polygon import PlayerSight
+from asset_manager import ASSETS
+from texture_atlas import load_atlas
 
 pygame.init()
 pygame.mixer.init()
@@ -21,6 +32,8 @@ WIDTH, HEIGHT = 1200, 800
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 clock = pygame.time.Clock()
 
+# Packed sprite frames (tools/build_atlas.py); without it they load file by file
+ASSETS.add_atlas(load_atlas())
 load_burn_frames()
 
 # Entities
@@ -48,6 +61,14 @@ def get_camera_offset(player, level_width, level_height, screen_width, screen_he
     y = max(0, min(y, level_height - screen_height))
     return (x, y)
 
+# Sprites, burn overlays and health bars reach up to this far past an entity's rect
+CULL_MARGIN = 96
+
+def get_camera_view(camera_offset, screen_width, screen_height):
+    """The world rect on screen, grown by CULL_MARGIN on every side."""
+    return pygame.Rect(int(camera_offset[0]) - CULL_MARGIN, int(camera_offset[1]) - CULL_MARGIN,
+                       screen_width + 2 * CULL_MARGIN, screen_height + 2 * CULL_MARGIN)
+
 # --- LEVEL SETUP ---
 levels = [
     Level(
@@ -93,8 +114,65 @@ barricades = [
     Barricade(350, 126, 32, 64, nests_required_to_clear=10),
     Barricade(2656, 674, 100, 32, nests_required_to_clear=4)
 ]
+current_level.obstacles.set_barricades(barricades)
+
+# Exploration kept as one alpha byte per 8px cell
+fog = GridFogOfWar(current_level.width, current_level.height, cell_size=8)
+
+# Line-of-sight fog: reveal only what the player can see past walls and barricades,
+# and only draw the enemies no wall hides from the player. False = the old see-through-walls circle.
+LINE_OF_SIGHT_FOG = True
+sight = PlayerSight(current_level.obstacles, radius=250)
+
+# Batched enemy/nest -> player line of sight, resolved once per frame
+los = LineOfSightBatch(current_level.wall_index)
+
+# Per-frame broadphase for bullet / puddle hit tests
+enemy_grid = EntityGrid(cell_size=64)
+nest_grid = EntityGrid(cell_size=128)
+
+# Shared path toward the player for chasing enemies (re-run when the player changes cell)
+flow = FlowField(current_level.obstacles, current_level.width, current_level.height)
+
+def drawn_enemies(enemies):
+    """Enemies with something to draw: swarm rats' bodies are blitted by RatSwarm.draw, leaving only burn overlays."""
+    return [e for e in enemies if e.is_burning or not isinstance(e, SwarmRat)]
+
+
+def on_screen(entities, view):
+    """The entities whose rect overlaps the camera view, in list order."""
+    return [e for e in entities if view.colliderect(e.rect)]
+
 
-fog = FogOfWar(current_level.width, current_level.height)
+def rebuild_grids():
+    """Hash the live enemies and active nests by cell, at their current positions."""
+    enemy_grid.rebuild(e for e in enemies if not isinstance(e, SwarmRat))
+    rat_swarm.add_to_grid(enemy_grid)
+    nest_grid.rebuild(nest for nest in rat_nests if nest.active)
+
+
+def player_sees(xs, ys):
+    """
+    Vectorized: which points no wall or barricade hides from the player, at
+    any distance (the fog's sight polygon only reaches its reveal radius).
+    """
+    return los.visible_from(xs, ys, player, current_level.obstacles.active_barricades)
+
+
+def in_sight(entities):
+    """The entities the player can see (all of them without line-of-sight fog)."""
+    if not LINE_OF_SIGHT_FOG or not entities:
+        return entities
+    seen = player_sees(np.array([e.x for e in entities], dtype=np.float64),
+                       np.array([e.y for e in entities], dtype=np.float64))
+    return [e for e, visible in zip(entities, seen.tolist()) if visible]
+
+
+# Every rat the nests spawn, updated and drawn as one batch (handles live in `enemies`)
+rat_swarm = RatSwarm()
+
+# Every cosmetic particle (nest smoke, embers, plasma splashes, cinders), updated and drawn as one batch
+particles = ParticleSystem()
 
 
 def reset_game():
@@ -105,12 +183,19 @@ def reset_game():
     player.current_weapon = player.weapons[player.current_weapon_index]
     player.bullets.clear()
 
+    for enemy in enemies:
+        release_to_pool(enemy)
     enemies.clear()
+    rat_swarm.clear()
+    particles.clear()
     puddles.clear()
     burns.clear()
     health_packs.clear()
     rat_nests = create_rat_nests(current_level.name)
-    fog = Fog
+    fog.reset()
+    sight.reset()
+    enemy_grid.clear()
+    nest_grid.clear()
 
 
     for barricade in barricades:
@@ -196,6 +281,8 @@ while running:
 
 # --- CAMERA ---
     camera_offset = get_camera_offset(player, current_level.width, current_level.height, WIDTH, HEIGHT)
+    camera_view = get_camera_view(camera_offset, WIDTH, HEIGHT)
+    set_camera_view(camera_view)  # off-screen enemies and nests bank their animation time
 
     # --- Events ---
     for event in pygame.event.get():
@@ -226,17 +313,19 @@ while running:
 
     keys = pygame.key.get_pressed()
     if not pause_menu.active:
-        player.handle_input(dt, keys, current_level.width, current_level.height, current_level.walls, barricades)
+        player.handle_input(dt, keys, current_level.width, current_level.height, current_level.obstacles)
 
 
     if pause_menu.active:
         # Draw level fully darkened behind menu
         current_level.draw(screen, camera_offset)
         player.draw(screen)
-        for enemy in enemies:
+        rat_swarm.draw(screen, camera_offset, player_sees if LINE_OF_SIGHT_FOG else None)
+        for enemy in in_sight(on_screen(drawn_enemies(enemies), camera_view)):
             enemy.draw(screen, camera_offset)
-        for nest in rat_nests:
+        for nest in on_screen(rat_nests, camera_view):
             nest.draw(screen, camera_offset)
+        particles.draw(screen, camera_offset)
             
         fog.draw(screen, camera_offset)
 
@@ -255,38 +344,40 @@ while running:
 
 
     if isinstance(player.current_weapon, Flamethrower):
+        # The cone queries the grids: include this frame's spawns, drop last frame's dead
+        rebuild_grids()
+
         # Fire weapon logic (handles enemies, warmup, cooldown)
         player.current_weapon.fire(
             player.x, player.y, mouse_pos, player.bullets,
-            mouse_held, enemies, burns, current_level.walls, player
+            mouse_held, enemies, burns, current_level.obstacles, player,
+            enemy_grid=enemy_grid, particles=particles
         )
 
-        # --- Flamethrower damage to nests ---
+        # --- Flamethrower damage to nests (reuses this tick's cone) ---
         if player.current_weapon.firing and player.current_weapon.ready_to_fire:
-            for nest in rat_nests:
-                if not nest.active:
-                    continue
-
-                in_cone, dist, visible_range = player.current_weapon.can_hit_point(
-                    player.x, player.y, mouse_pos, nest.x, nest.y, current_level.walls
+            cone = player.current_weapon.cone(player.x, player.y, mouse_pos, current_level.obstacles)
+            nearby_nests = [n for n in nest_grid.query_rect(cone.bounds(pad=16)) if n.active] if cone else []
+            for nest, dist in cone.hits(nearby_nests) if nearby_nests else ():
+                damage = player.current_weapon._calc_instant_damage(dist)
+                nest.take_damage(damage * dt, health_packs)
+                nest.start_burning(
+                    dps=player.current_weapon.burn_dps,
+                    duration=player.current_weapon.burn_duration
                 )
 
-                if in_cone:
-                    damage = player.current_weapon._calc_instant_damage(dist)
-                    nest.take_damage(damage * dt, health_packs)
-                    nest.start_burning(
-                        dps=player.current_weapon.burn_dps,
-                        duration=player.current_weapon.burn_duration
-                    )
-
     else:
         player.current_weapon.fire(player.x, player.y, mouse_pos, player.bullets, mouse_held)
 
     if hasattr(player.current_weapon, "reset_trigger") and not mouse_held:
         player.current_weapon.reset_trigger()
     
-    # Reveal area around player
-    fog.reveal_circle(player.x, player.y, radius=250)
+    # Reveal area around player (the view is only recast when the player changes cell)
+    if LINE_OF_SIGHT_FOG:
+        if sight.update(player.x, player.y):
+            fog.reveal_polygon(sight.polygon, sight.radius)
+    else:
+        fog.reveal_circle(player.x, player.y, radius=250)
 
     # --- Check for Game Over ---
     if player.health <= 0:
@@ -297,14 +388,22 @@ while running:
         reset_game()
         continue  # skip the rest of this loop iteration
 
+    # Resolve every enemy/nest -> player sight line in one vectorized pass
+    # (the rat swarm batches its own from its position arrays)
+    los.resolve([e for e in enemies if not isinstance(e, SwarmRat)] +
+                [nest for nest in rat_nests if nest.active], player,
+                current_level.obstacles.active_barricades)
+    flow.update(player.x, player.y)
+
     # Update nests
     for nest in rat_nests:
-        nest.update(dt, enemies, walls=current_level.walls, player=player)
+        nest.update(dt, enemies, walls=current_level.obstacles, player=player, los=los,
+                    rat_swarm=rat_swarm, particles=particles)
         
     active_nests = sum(1 for nest in rat_nests if nest.active)
     
     # --- Update ---
-    player.update(dt, puddles)
+    player.update(dt, puddles, particles)
     
      # --- Win condition: all nests destroyed and player reaches exit ---
     if active_nests == 0 and exit_zone.colliderect(player.rect):
@@ -325,63 +424,77 @@ while running:
 
 
         
+    rat_swarm.update(dt, player, current_level.obstacles, los=los, flow=flow)
     for enemy in enemies:
-        enemy.update(dt, player=player, walls=current_level.walls, enemies=enemies, barricades=barricades)
-        if isinstance(enemy, BroodFly):
-            enemy.projectiles.draw(screen)
-        
-    # --- Bullet collisions ---
-    for bullet in list(player.bullets):
+        enemy.update(dt, player=player, walls=current_level.obstacles, enemies=enemies, los=los, flow=flow)
+
+    # --- Broadphase: hash enemies + live nests by cell for this frame ---
+    rebuild_grids()
+
+    # --- Bullet collisions (swept along the path since last frame) ---
+    # Wall hits and the "anything nearby?" filter run over the whole store
+    # at once; only rounds that may hit something go through sweep_hits.
+    bullets = player.bullets
+    wall_t = bullets.wall_hits(current_level.wall_index)
+    maybe_hit = np.flatnonzero(np.isfinite(wall_t) | bullets.near(enemy_grid, nest_grid))
+    spent = []
+    for i in maybe_hit.tolist():
         bullet_hit = False  # track if bullet should be removed
-        
-        for nest in rat_nests:
-            if nest.active and nest.rect.collidepoint(bullet.x, bullet.y):
-                nest.take_damage(getattr(bullet, "damage", 0), health_packs)
-                if bullet in player.bullets:
-                    player.bullets.remove(bullet)
+        x0, y0, x1, y1 = bullets.segment(i)
+        pierced = bullets.pierced[i]
+        explodes = bullets.explodes[i]
+        damage = float(bullets.damage[i])
+        t_wall = float(wall_t[i]) if np.isfinite(wall_t[i]) else None
+
+        hits = sweep_hits(x0, y0, x1, y1, None, enemy_grid, nest_grid,
+                          skip=pierced or (), wall_t=t_wall)
+
+        # Resolve hits in order along the segment
+        for t, kind, target in hits:
+            if kind == "nest":
+                if not target.active:
+                    continue
+                target.take_damage(damage, health_packs)
+                bullet_hit = True
+
+            elif kind == "enemy":
+                target.take_damage(damage, player)
+                if explodes:
+                    explode_at(x0 + (x1 - x0) * t, y0 + (y1 - y0) * t, puddles, particles)
+                    bullet_hit = True  # plasma still behaves normally
+                elif pierced is not None:
+                    bullets.hits_left[i] -= 1
+                    pierced.add(target)
+
+                    # visually show weakening — bullet shrinks slightly after each pierce
+                    bullets.radius[i] = max(3, bullets.radius[i] - 1)
+                    bullets.color[i] = (200, 200, 255) if bullets.hits_left[i] == 1 else (255, 255, 255)
+
+                    if bullets.hits_left[i] <= 0:
+                        bullet_hit = True  # remove after it pierces enough enemies
+                else:
+                    bullet_hit = True  # non-piercing rounds stop at the first enemy
+                # don't stop on a pierce — later enemies on the segment can still be hit
+
+            else:  # wall — always the last hit reported
+                if explodes:
+                    explode_at(x0 + (x1 - x0) * t, y0 + (y1 - y0) * t, puddles, particles)
+                bullet_hit = True
+
+            if bullet_hit:
                 break
 
-        # Check collision with enemies
-        for enemy in enemies:
-            if enemy.rect.collidepoint(bullet.x, bullet.y):
-                if isinstance(bullet, PlasmaBlob):
-                    enemy.take_damage(bullet.damage, player)
-                    bullet.explode(puddles)
-                    bullet_hit = True
-                    break  # plasma still behaves normally
-                else:
-                    enemy.take_damage(getattr(bullet, "damage", 0), player)
-                    if hasattr(bullet, "pierce_count"):
-                        bullet.pierce_count -= 1
-
-                        # visually show weakening — bullet shrinks slightly after each pierce
-                        bullet.radius = max(3, 8 - (3 - bullet.pierce_count))
-                        bullet.color = (200, 200, 255) if bullet.pierce_count == 1 else (255, 255, 255)
-
-                        if bullet.pierce_count <= 0:
-                            bullet_hit = True  # remove after it pierces enough enemies
-                    else:
-                        bullet_hit = True  # fallback for non-piercing bullets
-                # don't break — allow it to pierce multiple enemies
-
-        # Check collision with walls (only if bullet still active)
-        if not bullet_hit:
-            for wall in current_level.walls:
-                if wall.collidepoint(bullet.x, bullet.y):  # ✅ walls are Rects
-                    if isinstance(bullet, PlasmaBlob):
-                        bullet.explode(puddles)
-                    bullet_hit = True
-                    break
-
-        # Remove bullet if it hit anything
-        if bullet_hit and bullet in player.bullets:
-            player.bullets.remove(bullet)
+        if bullet_hit:
+            spent.append(i)
+
+    # Swap-with-last removal, after the loop so row numbers stay valid
+    bullets.remove_many(spent)
 
     # --- Puddle and burn updates ---
     for puddle in list(puddles):
         puddle.update(dt)
         
-        for enemy in enemies:
+        for enemy in enemy_grid.query_circle(puddle.x, puddle.y, puddle.radius):
             dx = enemy.x - puddle.x
             dy = enemy.y - puddle.y
             dist_sq = dx*dx + dy*dy
@@ -403,6 +516,7 @@ while running:
 
         if not puddle.is_alive():
             puddles.remove(puddle)
+            PlasmaPuddle.pool.release(puddle)
 
     # After checking all puddles, finalize enemy speed multipliers
     for enemy in enemies:
@@ -427,8 +541,21 @@ while running:
             burns.pop(enemy, None)
         elif not enemy.is_burning:
             enemy.start_burning()
+        else:
+            particles.emit_over(BURN_CINDERS, enemy.x, enemy.y - enemy.size // 4, dt)
+
+    survivors = []
+    for enemy in enemies:
+        if enemy.is_alive():
+            survivors.append(enemy)
+        else:
+            # Pooled enemies (larvae, roachlings) are recycled; drop any burn first
+            burns.pop(enemy, None)
+            release_to_pool(enemy)
+    enemies = survivors
+    rat_swarm.prune()  # so the rats killed this frame aren't drawn once more
 
-    enemies = [e for e in enemies if e.is_alive()]
+    particles.update(dt)
 
     # --- Level update ---
     new_enemies = current_level.update(dt, player, enemies)
@@ -446,19 +573,23 @@ while running:
             print("You win!")
             running = False
     
-    # --- DRAW ---
+    # --- DRAW (only what overlaps the camera view) ---
     current_level.draw(screen, camera_offset)
     player.draw(screen)
-    for nest in rat_nests:
+    for nest in on_screen(rat_nests, camera_view):
         nest.draw(screen, camera_offset)
-    for enemy in enemies:
+    rat_swarm.draw(screen, camera_offset, player_sees if LINE_OF_SIGHT_FOG else None)
+    for enemy in in_sight(on_screen(drawn_enemies(enemies), camera_view)):
         enemy.draw(screen, camera_offset)
+    for enemy in enemies:
         if isinstance(enemy, BroodFly):
-            for proj in enemy.projectiles:
+            for proj in on_screen(enemy.projectiles, camera_view):
                 screen.blit(proj.image, (proj.rect.x - camera_offset[0], proj.rect.y - camera_offset[1]))
     for puddle in puddles:
-        puddle.draw(screen, camera_offset[0], camera_offset[1])    
-    for barricade in barricades:
+        if camera_view.collidepoint(puddle.x, puddle.y):  # radius is within CULL_MARGIN
+            puddle.draw(screen, camera_offset[0], camera_offset[1])
+    particles.draw(screen, camera_offset)
+    for barricade in on_screen(barricades, camera_view):
         barricade.draw(screen, camera_offset)
         
         # --- DEBUGGING TOOL: Mouse Coordinate Overlay ---
@@ -487,12 +618,13 @@ while running:
     # Flamethrower cone
     # When drawing:
     if isinstance(player.current_weapon, Flamethrower) and pygame.mouse.get_pressed()[0]:
-        player.current_weapon.draw_cone(screen, player.x, player.y, mouse_pos, camera_offset, current_level.walls)
+        player.current_weapon.draw_cone(screen, player.x, player.y, mouse_pos, camera_offset, current_level.obstacles)
 
 
     for pack in health_packs:
         pack.update(player)
-        pack.draw(screen, camera_offset)
+        if camera_view.colliderect(pack.rect):
+            pack.draw(screen, camera_offset)
         
     fog.draw(screen, camera_offset)
 
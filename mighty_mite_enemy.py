@@ -1,12 +1,20 @@
 import pygame
 import math
 import random
-from enemy import Enemy
+from enemy import Enemy, solid_sprite
+from enemy_ai_utils import chase_target, steer_clear_of_walls
+from spatial_index import rect_blocked
 
 
 class MightyMite(Enemy):
     """Tanky enemy that charges at the player once within range."""
 
+    __slots__ = (
+        "charge_speed", "state", "detection_radius", "charge_range", "charge_timer",
+        "recover_timer", "charge_duration", "prep_time", "recover_time",
+        "vel_x", "vel_y", "direction",
+    )
+
     def __init__(self, x, y):
         super().__init__(x, y, health=400)
         self.speed = 70
@@ -24,8 +32,7 @@ class MightyMite(Enemy):
         self.recover_time = 1.5
 
         # Visual setup
-        self.image = pygame.Surface((self.size, self.size))
-        self.image.fill((120, 100, 60))  # dark brown/gray
+        self.image = solid_sprite(self.size, (120, 100, 60))  # dark brown/gray
         self.rect = self.image.get_rect(center=(x, y))
 
         # Movement state
@@ -33,10 +40,10 @@ class MightyMite(Enemy):
         self.vel_y = 0
         self.direction = random.uniform(0, 2 * math.pi)
 
-    def update(self, dt, player=None, walls=None, enemies=None, barricades=None, **kwargs):
+    def update(self, dt, player=None, walls=None, enemies=None, barricades=None, los=None, flow=None, **kwargs):
         """Handle Mighty Mite AI states while using shared collision + LOS."""
         # Shared base update for wall + barricade collisions
-        super().update(dt, player=player, walls=walls, barricades=barricades)
+        super().update(dt, player=player, walls=walls, barricades=barricades, los=los, flow=flow)
 
         player_dx = player.rect.centerx - self.x
         player_dy = player.rect.centery - self.y
@@ -55,7 +62,8 @@ class MightyMite(Enemy):
                 self.state = "charging_prep"
                 self.charge_timer = 0
             else:
-                self.move_toward_point(player.rect.center, self.speed, dt, walls, barricades)
+                target = chase_target(self, player.rect.center, self.sees_player, flow)
+                self.move_toward_point(target, self.speed, dt, walls, barricades)
 
         elif self.state == "charging_prep":
             self.charge_timer += dt
@@ -72,15 +80,11 @@ class MightyMite(Enemy):
             new_x = self.x + self.vel_x * dt
             new_y = self.y + self.vel_y * dt
 
-            obstacles = list(walls or [])
-            if barricades:
-                obstacles += [b.rect for b in barricades if getattr(b, "active", False)]
-
             rect_x = pygame.Rect(new_x - self.size / 2, self.y - self.size / 2, self.size, self.size)
             rect_y = pygame.Rect(self.x - self.size / 2, new_y - self.size / 2, self.size, self.size)
 
             # Simple collision stop if charge hits a wall/barricade
-            blocked = any(rect_x.colliderect(o) or rect_y.colliderect(o) for o in obstacles)
+            blocked = rect_blocked(rect_x, walls, barricades) or rect_blocked(rect_y, walls, barricades)
             if not blocked:
                 self.x = new_x
                 self.y = new_y
@@ -120,20 +124,16 @@ class MightyMite(Enemy):
         if random.random() < 0.01:
             self.direction = random.uniform(0, 2 * math.pi)
 
-        dx = math.cos(self.direction)
-        dy = math.sin(self.direction)
+        # Big hitbox: turn away early rather than grinding along walls
+        dx, dy = steer_clear_of_walls(self, math.cos(self.direction), math.sin(self.direction), walls, reach=40.0)
         new_x = self.x + dx * self.speed * 0.25 * dt
         new_y = self.y + dy * self.speed * 0.25 * dt
 
-        obstacles = list(walls or [])
-        if barricades:
-            obstacles += [b.rect for b in barricades if getattr(b, "active", False)]
-
         rect_x = pygame.Rect(new_x - self.size / 2, self.y - self.size / 2, self.size, self.size)
         rect_y = pygame.Rect(self.x - self.size / 2, new_y - self.size / 2, self.size, self.size)
-        if not any(rect_x.colliderect(o) for o in obstacles):
+        if not rect_blocked(rect_x, walls, barricades):
             self.x = new_x
-        if not any(rect_y.colliderect(o) for o in obstacles):
+        if not rect_blocked(rect_y, walls, barricades):
             self.y = new_y
 
         self.rect.center = (self.x, self.y)
@@ -145,21 +145,16 @@ class MightyMite(Enemy):
         dist = math.hypot(dx, dy)
         if dist == 0:
             return
-        dx /= dist
-        dy /= dist
+        dx, dy = steer_clear_of_walls(self, dx / dist, dy / dist, walls, reach=40.0)
 
         new_x = self.x + dx * speed * dt
         new_y = self.y + dy * speed * dt
 
-        obstacles = list(walls or [])
-        if barricades:
-            obstacles += [b.rect for b in barricades if getattr(b, "active", False)]
-
         rect_x = pygame.Rect(new_x - self.size / 2, self.y - self.size / 2, self.size, self.size)
         rect_y = pygame.Rect(self.x - self.size / 2, new_y - self.size / 2, self.size, self.size)
-        if not any(rect_x.colliderect(o) for o in obstacles):
+        if not rect_blocked(rect_x, walls, barricades):
             self.x = new_x
-        if not any(rect_y.colliderect(o) for o in obstacles):
+        if not rect_blocked(rect_y, walls, barricades):
             self.y = new_y
 
         self.rect.center = (self.x, self.y)
@@ -1,5 +1,6 @@
 import math
 import pygame
+from stats import BulletStats
 
 pygame.mixer.init()
 
@@ -17,6 +18,8 @@ try:
 except:
     MINIGUN_RELOAD_SOUND = None
 
+MINIGUN_ROUND = BulletStats(speed=600, damage=10, lifetime=3.0, radius=3, color=(255, 255, 0))
+
 class Minigun:
     def __init__(self):
         # --- Fire control ---
@@ -127,7 +130,7 @@ class Minigun:
         if self.cooldown <= 0 and mouse_held and not self.reloading:
             if self.ammo > 0:
                 angle = math.atan2(mouse_pos[1] - y, mouse_pos[0] - x)
-                bullet_list.append(MinigunBullet(x, y, angle))
+                bullet_list.spawn(MINIGUN_ROUND, x, y, angle)
                 self.cooldown = self.fire_rate
                 self.ammo -= 1
             else:
@@ -145,22 +148,3 @@ class Minigun:
     def get_ammo_status(self):
         """Returns tuple (current_ammo, max_ammo, reloading_bool)"""
         return self.ammo, self.max_ammo, self.reloading
-
-class MinigunBullet:
-    def __init__(self, x, y, angle):
-        self.x = x
-        self.y = y
-        self.angle = angle
-        self.speed = 600
-        self.radius = 3
-        self.color = (255, 255, 0)
-        self.damage = 10
-
-    def update(self, dt):
-        self.x += math.cos(self.angle) * self.speed * dt
-        self.y += math.sin(self.angle) * self.speed * dt
-
-    def draw(self, surface, camera_x=0, camera_y=0):
-        screen_x = int(self.x - camera_x)
-        screen_y = int(self.y - camera_y)
-        pygame.draw.circle(surface, self.color, (screen_x, screen_y), self.radius)
@@ -0,0 +1,84 @@
+# object_pool.py
+
+
+class ObjectPool:
+    """
+    Free list of recycled instances of one class.
+
+    `acquire(*args)` hands back a released instance after calling its
+    `reset(*args)` hook (a hit), or builds a new one with `cls(*args)` (a
+    miss). Pooled classes write their per-spawn setup in `reset` and call
+    it from `__init__`, keeping expensive one-off work (loaded frames,
+    surfaces) in `__init__` so a reused object skips it.
+
+    `release(obj)` returns an instance once nothing refers to it any more.
+    Counters (hits, misses, releases, live, high_water) are there for
+    tuning `max_free`; see pool_stats().
+    """
+
+    def __init__(self, cls, max_free=256):
+        self.cls = cls
+        self.max_free = max_free
+        self.free = []
+        self.hits = 0
+        self.misses = 0
+        self.releases = 0
+        self.live = 0
+        self.high_water = 0
+        POOLS.append(self)
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+            self.hits += 1
+        else:
+            obj = self.cls(*args, **kwargs)
+            self.misses += 1
+        self.live += 1
+        if self.live > self.high_water:
+            self.high_water = self.live
+        return obj
+
+    def release(self, obj):
+        self.live = max(0, self.live - 1)
+        self.releases += 1
+        if len(self.free) < self.max_free:
+            self.free.append(obj)
+
+    def release_all(self, objs):
+        for obj in objs:
+            self.release(obj)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "releases": self.releases,
+            "live": self.live,
+            "free": len(self.free),
+            "high_water": self.high_water,
+        }
+
+
+# Every pool created, for pool_stats()
+POOLS: list[ObjectPool] = []
+
+
+def pool_stats():
+    """{class name: stats dict} for every pool."""
+    return {pool.cls.__name__: pool.stats() for pool in POOLS}
+
+
+def release_to_pool(obj):
+    """
+    Give obj back to its class's pool (`cls.pool`), if it has one. An
+    `on_release()` hook runs first, so pooled objects obj still holds (a
+    fly's acid globs) go back too.
+    """
+    on_release = getattr(obj, "on_release", None)
+    if on_release is not None:
+        on_release()
+    pool = getattr(type(obj), "pool", None)
+    if pool is not None and pool.cls is type(obj):
+        pool.release(obj)
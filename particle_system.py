@@ -0,0 +1,177 @@
+# particle_system.py
+import numpy as np
+import pygame
+
+_rng = np.random.default_rng()
+
+
+class ParticleSystem:
+    """
+    Structure-of-arrays storage for every live cosmetic particle (nest smoke,
+    flamethrower embers, plasma splashes, cinders off burning enemies).
+
+    Row i is one particle: position, velocity, gravity, radius and how fast
+    it grows, alpha and how fast it fades, lifetime left and colour. A
+    stats.ParticleStyle archetype is the template `emit` copies (with its
+    random ranges sampled per particle).
+
+    `update` moves, fades and culls every row as array operations; dead rows
+    are squeezed out in one pass so the live rows stay packed in [0, count).
+    `draw` blits every visible particle in a single Surface.blits call from
+    a cache of pre-drawn circles keyed by (colour, radius, alpha step), so no
+    surface is created per particle or per frame once the cache is warm.
+    """
+
+    ALPHA_STEP = 8  # alpha is drawn in steps of this much (bounds the sprite cache)
+
+    def __init__(self, capacity=512, limit=4096):
+        self.count = 0
+        self.limit = limit     # emissions past this many live particles are dropped
+        self.high_water = 0    # most particles alive at once, for sizing `capacity`
+        self._alloc(capacity)
+        self._sprites = {}     # (colour, radius, alpha step) -> pre-drawn circle
+
+    def _alloc(self, capacity):
+        self.capacity = capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.gravity = np.zeros(capacity)
+        self.radius = np.zeros(capacity)
+        self.growth = np.zeros(capacity)
+        self.alpha = np.zeros(capacity)
+        self.fade = np.zeros(capacity)
+        self.lifetime = np.zeros(capacity)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+
+    _COLUMNS = ("x", "y", "vx", "vy", "gravity", "radius", "growth", "alpha",
+                "fade", "lifetime", "color")
+
+    def _grow(self, needed):
+        old = {name: getattr(self, name) for name in self._COLUMNS}
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        self._alloc(capacity)
+        for name, column in old.items():
+            getattr(self, name)[:len(column)] = column
+
+    # -------------------------------------------------------------------------
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, style, x, y, count=1, angle=None, spread=None, reach=None):
+        """
+        Add `count` particles of archetype `style` at (x, y).
+
+        They head along `angle` (default style.direction) +/- `spread`
+        (default style.spread). With `reach`, lifetimes are cut so no
+        particle travels further than that: a distance, or a function of the
+        particles' headings such as SightPolygon.reach (so embers stop at the
+        walls that clip the flame).
+        """
+        count = min(int(count), self.limit - self.count)
+        if count <= 0:
+            return
+        if self.count + count > self.capacity:
+            self._grow(self.count + count)
+        rows = slice(self.count, self.count + count)
+
+        heading = style.direction if angle is None else angle
+        spread = style.spread if spread is None else spread
+        theta = heading + _rng.uniform(-spread, spread, count) if spread else np.full(count, heading)
+        speed = _rng.uniform(*style.speed, count)
+        lifetime = _rng.uniform(*style.lifetime, count)
+        if reach is not None:
+            limit = np.broadcast_to(reach(theta) if callable(reach) else reach, lifetime.shape)
+            moving = speed > 0
+            lifetime[moving] = np.minimum(lifetime[moving], limit[moving] / speed[moving])
+
+        jx, jy = style.jitter
+        self.x[rows] = x + (_rng.uniform(-jx, jx, count) if jx else 0.0)
+        self.y[rows] = y + (_rng.uniform(-jy, jy, count) if jy else 0.0)
+        self.vx[rows] = np.cos(theta) * speed
+        self.vy[rows] = np.sin(theta) * speed
+        self.gravity[rows] = style.gravity
+        self.radius[rows] = _rng.integers(style.radius[0], style.radius[1] + 1, count)
+        self.growth[rows] = style.growth
+        self.alpha[rows] = style.alpha
+        self.fade[rows] = _rng.uniform(*style.fade, count)
+        self.lifetime[rows] = lifetime
+        self.color[rows] = style.color
+        self.count += count
+        self.high_water = max(self.high_water, self.count)
+
+    def emit_over(self, style, x, y, dt, **kwargs):
+        """Emit style.rate particles per second on average, for a frame of length dt."""
+        expected = style.rate * dt
+        count = int(expected)
+        if _rng.random() < expected - count:
+            count += 1
+        if count:
+            self.emit(style, x, y, count, **kwargs)
+
+    # -------------------------------------------------------------------------
+    def update(self, dt):
+        """Advance every particle and drop the ones that faded, shrank away or ran out of time."""
+        n = self.count
+        if n == 0:
+            return
+        self.vy[:n] += self.gravity[:n] * dt
+        self.x[:n] += self.vx[:n] * dt
+        self.y[:n] += self.vy[:n] * dt
+        self.radius[:n] += self.growth[:n] * dt
+        self.alpha[:n] -= self.fade[:n] * dt
+        self.lifetime[:n] -= dt
+
+        alive = (self.alpha[:n] > 0) & (self.lifetime[:n] > 0) & (self.radius[:n] >= 0.5)
+        if alive.all():
+            return
+        keep = np.flatnonzero(alive)
+        for name in self._COLUMNS:
+            column = getattr(self, name)
+            column[:len(keep)] = column[keep]
+        self.count = len(keep)
+
+    # -------------------------------------------------------------------------
+    def _sprite(self, color, radius, alpha):
+        key = (color, radius, alpha)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*color, alpha), (radius, radius), radius)
+            self._sprites[key] = sprite
+        return sprite
+
+    def draw(self, surface, camera_offset=(0, 0)):
+        n = self.count
+        if n == 0:
+            return
+        cam_x, cam_y = camera_offset
+        radius = np.rint(self.radius[:n]).astype(np.int32)
+        left = self.x[:n] - radius - cam_x
+        top = self.y[:n] - radius - cam_y
+        width, height = surface.get_size()
+        step = self.ALPHA_STEP
+        alpha = np.minimum(np.ceil(self.alpha[:n] / step) * step, 255).astype(np.int32)
+
+        visible = np.flatnonzero((left < width) & (top < height)
+                                 & (left + 2 * radius > 0) & (top + 2 * radius > 0)
+                                 & (radius > 0))
+        if not len(visible):
+            return
+        sprite = self._sprite
+        colors = self.color[visible].tolist()
+        blits = [
+            (sprite(tuple(c), r, a), (lx, ty))
+            for c, r, a, lx, ty in zip(colors, radius[visible].tolist(), alpha[visible].tolist(),
+                                       left[visible].tolist(), top[visible].tolist())
+        ]
+        surface.blits(blits, doreturn=False)
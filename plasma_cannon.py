@@ -1,5 +1,7 @@
 import math
 import pygame
+from stats import BulletStats, ParticleStyle
+from object_pool import ObjectPool
 
 pygame.mixer.init()
 PLASCAN_FIRE_SOUND = pygame.mixer.Sound("assets/audio/plasmaCannon.wav")
@@ -9,6 +11,14 @@ PLASCAN_FIRE_SOUND.set_volume(0.4)
 PLASCAN_EXPL_SOUND.set_volume(0.2)
 PLASCAN_SIZZ_SOUND.set_volume(0.2)
 
+# Bursts into a puddle on impact or after its 1s lifetime
+PLASMA_BLOB = BulletStats(speed=400, damage=50, lifetime=1.0, radius=10,
+                          color=(0, 200, 255), explodes=True)
+
+# Droplets thrown out when a blob bursts
+PLASMA_SPLASH = ParticleStyle(color=(80, 210, 255), radius=(2, 5), alpha=220, fade=(300, 450),
+                              lifetime=(0.3, 0.6), speed=(120, 260), spread=math.pi, gravity=300.0)
+
 class PlasmaCannon:
     def __init__(self):
         self.fire_rate = 1.5
@@ -18,13 +28,12 @@ class PlasmaCannon:
     def fire(self, x, y, mouse_pos, bullet_list, mouse_held=False):
         if self.cooldown <= 0 and mouse_held and not self.triggered:
             angle = math.atan2(mouse_pos[1] - y, mouse_pos[0] - x)
-            blob = PlasmaBlob(x, y, angle)
             channel = pygame.mixer.find_channel(True)
             if channel:
                 channel.set_volume(0.4)
                 channel.play(PLASCAN_FIRE_SOUND)
             self.sound_channel = channel
-            bullet_list.append(blob)
+            bullet_list.spawn(PLASMA_BLOB, x, y, angle)
             self.cooldown = self.fire_rate
             self.triggered = True  # prevent firing again until button released
 
@@ -36,51 +45,26 @@ class PlasmaCannon:
         self.triggered = False
 
 
-class PlasmaBlob:
-    def __init__(self, x, y, angle):
-        self.x = x
-        self.y = y
-        self.angle = angle
-        self.speed = 400
-        self.radius = 10
-        self.color = (0, 200, 255)
-        self.damage = 50        # direct hit damage
-        self.lifetime = 1.0     # how long the projectile exists before disappearing
-        self.exploded = False   # track if it already exploded
-        
-        
-
-    def update(self, dt, puddle_list):
-        if not self.exploded:
-            # Move the projectile
-            self.x += math.cos(self.angle) * self.speed * dt
-            self.y += math.sin(self.angle) * self.speed * dt
-            self.lifetime -= dt
-            # Lifetime expired → explode
-            if self.lifetime <= 0:
-                self.explode(puddle_list)
-
-    def explode(self, puddle_list):
-        if not self.exploded:
-            self.exploded = True
-            # Leave a puddle at current location
-            puddle_list.append(PlasmaPuddle(self.x, self.y))
-            channel = pygame.mixer.find_channel(True)
-            if channel:
-                channel.set_volume(0.4)
-                channel.play(PLASCAN_EXPL_SOUND)
-            self.sound_channel = channel
-
-    def draw(self, surface, camera_x=0, camera_y=0):
-        """Draw plasma blob relative to the camera offset."""
-        if not self.exploded:
-            screen_x = int(self.x - camera_x)
-            screen_y = int(self.y - camera_y)
-            pygame.draw.circle(surface, self.color, (screen_x, screen_y), self.radius)
+def explode_at(x, y, puddle_list, particles=None):
+    """A plasma blob bursting at (x, y): leaves a puddle, splashes and plays the explosion."""
+    puddle_list.append(PlasmaPuddle.pool.acquire(x, y))
+    if particles is not None:
+        particles.emit(PLASMA_SPLASH, x, y, 24)
+    channel = pygame.mixer.find_channel(True)
+    if channel:
+        channel.set_volume(0.4)
+        channel.play(PLASCAN_EXPL_SOUND)
 
 
 class PlasmaPuddle:
+    __slots__ = ("x", "y", "radius", "base_color", "alpha", "damage_per_second", "duration",
+                 "total_duration", "slow_multiplier", "sound_channel")
+
     def __init__(self, x, y):
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        """Pool hook: a fresh, sizzling puddle at (x, y)."""
         self.x = x
         self.y = y
         self.radius = 50
@@ -123,3 +107,6 @@ class PlasmaPuddle:
         pygame.draw.circle(s, fade_color, (self.radius, self.radius), self.radius)
         surface.blit(s, (int(self.x - self.radius - camera_x),
                          int(self.y - self.radius - camera_y)))
+
+
+PlasmaPuddle.pool = ObjectPool(PlasmaPuddle)
@@ -2,8 +2,12 @@ import pygame
 import math
 from rifle import Rifle
 from minigun import Minigun
-from plasma_cannon import PlasmaCannon, PlasmaBlob
+from plasma_cannon import PlasmaCannon, explode_at
 from flamethrower import Flamethrower
+from spatial_index import WallGrid
+from projectile_store import ProjectileStore
+from sprite_cache import ROTATIONS
+from asset_manager import ASSETS
 
 # --- Player Damage Sound ---
 try:
@@ -29,7 +33,7 @@ class Player:
         self.weapons = [Rifle(), Minigun(), PlasmaCannon(), Flamethrower()]
         self.current_weapon_index = 0
         self.current_weapon = self.weapons[self.current_weapon_index]
-        self.bullets = []
+        self.bullets = ProjectileStore()  # every live round, as NumPy columns
 
         # --- State ---
         self.move_angle = 0.0
@@ -45,11 +49,8 @@ class Player:
         self.camera_y = 0
 
         # --- Animation ---
-        self.walk_frames = [
-            pygame.image.load(f"assets/mech/mechWalk_{i:02}.png").convert_alpha()
-            for i in range(13)
-        ]
-        self.head_image = pygame.image.load("assets/mech/mechHead.png").convert_alpha()
+        self.walk_frames = [ASSETS.image(f"assets/mech/mechWalk_{i:02}.png") for i in range(13)]
+        self.head_image = ASSETS.image("assets/mech/mechHead.png")
         self.anim_timer = 0.0
         self.anim_speed = 10.0  # frames per second
         self.anim_index = 0
@@ -79,15 +80,11 @@ class Player:
             dx += base_speed * dt
 
         # --- Movement & Collision ---
-        obstacles = list(walls or [])
-        if barricades:
-            obstacles += [b.rect for b in barricades if getattr(b, "active", False)]
-
         # Horizontal movement
         if dx != 0:
             new_x = self.x + dx
             player_rect = pygame.Rect(new_x - self.size / 2, self.y - self.size / 2, self.size, self.size)
-            for obstacle in obstacles:
+            for obstacle in self._nearby_obstacles(player_rect, walls, barricades):
                 if player_rect.colliderect(obstacle):
                     new_x = obstacle.left - self.size / 2 if dx > 0 else obstacle.right + self.size / 2
             self.x = new_x
@@ -96,7 +93,7 @@ class Player:
         if dy != 0:
             new_y = self.y + dy
             player_rect = pygame.Rect(self.x - self.size / 2, new_y - self.size / 2, self.size, self.size)
-            for obstacle in obstacles:
+            for obstacle in self._nearby_obstacles(player_rect, walls, barricades):
                 if player_rect.colliderect(obstacle):
                     new_y = obstacle.top - self.size / 2 if dy > 0 else obstacle.bottom + self.size / 2
             self.y = new_y
@@ -134,6 +131,17 @@ class Player:
         # Update rect position for collisions
         self.rect.center = (self.x, self.y)
 
+    # -------------------------------------------------------------------------
+    def _nearby_obstacles(self, rect, walls=None, barricades=None):
+        """Walls near rect (via the level's WallGrid/ObstacleSet when given) plus active barricades."""
+        if isinstance(walls, WallGrid):
+            obstacles = walls.query(rect)
+        else:
+            obstacles = list(walls or [])
+        if barricades:
+            obstacles += [b.rect for b in barricades if getattr(b, "active", False)]
+        return obstacles
+
     # -------------------------------------------------------------------------
     def switch_weapon(self):
         """Cycle through available weapons and stop any ongoing weapon sounds."""
@@ -152,16 +160,17 @@ class Player:
         self.current_weapon.fire(self.x, self.y, mouse_pos, self.bullets)
 
     # -------------------------------------------------------------------------
-    def update(self, dt, puddles):
+    def update(self, dt, puddles, particles=None):
         """Update player, bullets, and weapon state."""
         self.current_weapon.update(dt)
         self.rect.center = (self.x, self.y)
 
-        for bullet in list(self.bullets):
-            if isinstance(bullet, PlasmaBlob):
-                bullet.update(dt, puddles)
-            else:
-                bullet.update(dt)
+        # Move every round at once; expired plasma bursts where it is
+        expired = self.bullets.update(dt)
+        for i in expired.tolist():
+            if self.bullets.explodes[i]:
+                explode_at(float(self.bullets.x[i]), float(self.bullets.y[i]), puddles, particles)
+        self.bullets.remove_many(expired.tolist())
 
     # -------------------------------------------------------------------------
     def take_damage(self, amount):
@@ -182,19 +191,14 @@ class Player:
         screen_x = self.x - self.camera_x
         screen_y = self.y - self.camera_y
 
-        # --- Legs (movement animation) ---
+        # --- Legs (movement animation), pre-rotated copies from the shared cache ---
         frame = self.walk_frames[self.anim_index if self.is_moving else 0]
         legs_angle = -math.degrees(self.move_angle) - 90
-        rotated_legs = pygame.transform.rotate(frame, legs_angle)
-        legs_rect = rotated_legs.get_rect(center=(screen_x, screen_y))
-        surface.blit(rotated_legs, legs_rect)
+        ROTATIONS.blit(surface, frame, legs_angle, (screen_x, screen_y))
 
         # --- Head (rotates toward mouse) ---
         angle_degrees = -math.degrees(self.facing_angle) - 90
-        rotated_head = pygame.transform.rotate(self.head_image, angle_degrees)
-        head_rect = rotated_head.get_rect(center=(screen_x, screen_y))
-        surface.blit(rotated_head, head_rect)
+        ROTATIONS.blit(surface, self.head_image, angle_degrees, (screen_x, screen_y))
 
         # --- Draw Bullets ---
-        for bullet in self.bullets:
-            bullet.draw(surface, self.camera_x, self.camera_y)
+        self.bullets.draw(surface, self.camera_x, self.camera_y)
@@ -0,0 +1,41 @@
+# projectile_collision.py
+import pygame
+from line_of_sight import first_hit, segment_rect_entry
+
+
+def sweep_hits(x0, y0, x1, y1, walls, enemy_grid=None, nest_grid=None, skip=(), wall_t=None):
+    """
+    Swept projectile test along the segment travelled since last frame.
+
+    Returns [(t, kind, target), ...] sorted by t (0..1 along the segment),
+    where kind is "nest", "enemy" or "wall". Nothing past the first wall is
+    reported, and a wall hit (if any) is always the last entry.
+    Entities in `skip` (e.g. enemies a piercing round already went through)
+    are ignored.
+    With `walls=None` the caller has already found the wall hit (e.g. the
+    ProjectileStore's batched wall test) and passes its t as `wall_t`
+    (None = no wall); the reported wall target is then None.
+    """
+    if walls is not None:
+        wall_t, wall = first_hit(x0, y0, x1, y1, walls)
+    else:
+        wall = None
+    limit = 1.0 if wall_t is None else wall_t
+
+    hits = []
+    bounds = pygame.Rect(min(x0, x1), min(y0, y1), abs(x1 - x0) + 1, abs(y1 - y0) + 1)
+    for kind, grid in (("nest", nest_grid), ("enemy", enemy_grid)):
+        if grid is None:
+            continue
+        for target in grid.query_rect(bounds):
+            if target in skip:
+                continue
+            t = segment_rect_entry(x0, y0, x1, y1, target.rect)
+            if t is not None and t <= limit:
+                hits.append((t, kind, target))
+
+    # Nests before enemies at the same t, as the old per-point loop did
+    hits.sort(key=lambda hit: (hit[0], hit[1] != "nest"))
+    if wall_t is not None:
+        hits.append((wall_t, "wall", wall))
+    return hits
@@ -0,0 +1,211 @@
+# projectile_store.py
+import math
+import numpy as np
+import pygame
+from line_of_sight import traverse_cells
+
+
+class ProjectileStore:
+    """
+    Structure-of-arrays storage for every live player projectile.
+
+    Each column is a NumPy array and row i is one round: position, the
+    position at the start of this frame (for swept hits), velocity, damage,
+    radius, colour, hits left before it stops, lifetime and whether it
+    leaves a plasma puddle. A stats.BulletStats archetype is the template
+    `spawn` copies into a row.
+
+    Movement, lifetime and wall tests run as array operations over all rows.
+    Rows are removed by moving the last row into the hole, so removal is
+    O(1) and the live rows stay packed in [0, count).
+    """
+
+    def __init__(self, capacity=256):
+        self.count = 0
+        self.high_water = 0  # most rounds alive at once, for sizing `capacity`
+        self._alloc(capacity)
+        self.pierced = []  # per row: set of enemies already hit (piercing rounds) or None
+        self._sprites = {}  # (radius, colour) -> pre-drawn circle
+        self._wall_boxes = None
+        self._wall_source = None
+
+    def _alloc(self, capacity):
+        self.capacity = capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.prev_x = np.zeros(capacity)
+        self.prev_y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.damage = np.zeros(capacity)
+        self.radius = np.zeros(capacity, dtype=np.int32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.hits_left = np.zeros(capacity, dtype=np.int32)
+        self.lifetime = np.zeros(capacity)
+        self.explodes = np.zeros(capacity, dtype=bool)
+
+    _COLUMNS = ("x", "y", "prev_x", "prev_y", "vx", "vy", "damage", "radius",
+                "color", "hits_left", "lifetime", "explodes")
+
+    def _grow(self):
+        old = {name: getattr(self, name) for name in self._COLUMNS}
+        self._alloc(self.capacity * 2)
+        for name, column in old.items():
+            getattr(self, name)[:len(column)] = column
+
+    # -------------------------------------------------------------------------
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    def clear(self):
+        self.count = 0
+        self.pierced.clear()
+
+    def spawn(self, stats, x, y, angle):
+        """Add one round of archetype `stats` heading along `angle`; returns its row."""
+        if self.count == self.capacity:
+            self._grow()
+        i = self.count
+        self.x[i] = self.prev_x[i] = x
+        self.y[i] = self.prev_y[i] = y
+        self.vx[i] = math.cos(angle) * stats.speed
+        self.vy[i] = math.sin(angle) * stats.speed
+        self.damage[i] = stats.damage
+        self.radius[i] = stats.radius
+        self.color[i] = stats.color
+        self.hits_left[i] = max(1, stats.pierce)
+        self.lifetime[i] = stats.lifetime
+        self.explodes[i] = stats.explodes
+        self.pierced.append(set() if stats.pierce > 0 else None)
+        self.count += 1
+        self.high_water = max(self.high_water, self.count)
+        return i
+
+    def remove(self, i):
+        """Remove row i by moving the last row into it."""
+        last = self.count - 1
+        if i != last:
+            for name in self._COLUMNS:
+                column = getattr(self, name)
+                column[i] = column[last]
+            self.pierced[i] = self.pierced[last]
+        self.pierced.pop()
+        self.count = last
+
+    def remove_many(self, rows):
+        """Remove several rows (highest first, so no pending row gets moved)."""
+        for i in sorted(set(rows), reverse=True):
+            self.remove(i)
+
+    # -------------------------------------------------------------------------
+    def update(self, dt):
+        """Advance every round; returns the rows whose lifetime ran out (not yet removed)."""
+        n = self.count
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+        self.x[:n] += self.vx[:n] * dt
+        self.y[:n] += self.vy[:n] * dt
+        self.lifetime[:n] -= dt
+        return np.flatnonzero(self.lifetime[:n] <= 0)
+
+    def segment(self, i):
+        """This frame's swept segment (x0, y0, x1, y1) for row i."""
+        return float(self.prev_x[i]), float(self.prev_y[i]), float(self.x[i]), float(self.y[i])
+
+    def wall_hits(self, walls):
+        """
+        Parameter t (0..1 along this frame's segment) of the first wall each
+        round touches, or inf. With the level's DistanceField, rounds that
+        are clearly in open space skip the slab test entirely.
+        """
+        n = self.count
+        t_hit = np.full(n, np.inf)
+        if n == 0:
+            return t_hit
+
+        if self._wall_source is not walls:
+            self._wall_source = walls
+            self._wall_boxes = np.array(
+                [(w.left, w.top, w.right, w.bottom) for w in walls or ()], dtype=np.float64
+            ).reshape(-1, 4)
+        boxes = self._wall_boxes
+        if not len(boxes):
+            return t_hit
+
+        x0, y0 = self.prev_x[:n], self.prev_y[:n]
+        dx, dy = self.x[:n] - x0, self.y[:n] - y0
+        todo = np.ones(n, dtype=bool)
+        field = getattr(walls, "distance", None)
+        if field is not None:
+            step = np.maximum(np.abs(dx), np.abs(dy))
+            todo = field.clearance_many(x0, y0) - field.slack <= step
+
+        rows = np.flatnonzero(todo)
+        if len(rows):
+            sx, sy = x0[rows, None], y0[rows, None]
+            ddx = np.where(dx[rows] == 0.0, 1e-12, dx[rows])[:, None]
+            ddy = np.where(dy[rows] == 0.0, 1e-12, dy[rows])[:, None]
+            tx1 = (boxes[:, 0] - sx) / ddx
+            tx2 = (boxes[:, 2] - sx) / ddx
+            ty1 = (boxes[:, 1] - sy) / ddy
+            ty2 = (boxes[:, 3] - sy) / ddy
+            t_enter = np.maximum(np.maximum(np.minimum(tx1, tx2), np.minimum(ty1, ty2)), 0.0)
+            t_exit = np.minimum(np.minimum(np.maximum(tx1, tx2), np.maximum(ty1, ty2)), 1.0)
+            t_enter = np.where(t_enter <= t_exit, t_enter, np.inf)
+            t_hit[rows] = t_enter.min(axis=1)
+        return t_hit
+
+    def near(self, *grids):
+        """Mask of rounds whose segment passes through a cell holding anything in the EntityGrids."""
+        n = self.count
+        mask = np.zeros(n, dtype=bool)
+        for grid in grids:
+            if grid is None or not grid.cells:
+                continue
+            cs = grid.cell_size
+            occupied = np.array([cx * 65536 + cy for cx, cy in grid.cells], dtype=np.int64)
+            cx0 = np.floor(self.prev_x[:n] / cs).astype(np.int64)
+            cy0 = np.floor(self.prev_y[:n] / cs).astype(np.int64)
+            cx1 = np.floor(self.x[:n] / cs).astype(np.int64)
+            cy1 = np.floor(self.y[:n] / cs).astype(np.int64)
+            # The two ends plus the other two bbox corners cover every cell
+            # a segment shorter than one cell can cross
+            for cx, cy in ((cx0, cy0), (cx1, cy1), (cx0, cy1), (cx1, cy0)):
+                mask |= np.isin(cx * 65536 + cy, occupied)
+            # Longer steps (a frame hitch) can cross cells in between: walk those
+            cells = grid.cells
+            long_steps = np.flatnonzero(~mask & ((np.abs(cx1 - cx0) > 1) | (np.abs(cy1 - cy0) > 1)))
+            for i in long_steps.tolist():
+                segment = (self.prev_x[i], self.prev_y[i], self.x[i], self.y[i])
+                if any(key in cells for key, _ in traverse_cells(*segment, cs)):
+                    mask[i] = True
+        return mask
+
+    # -------------------------------------------------------------------------
+    def _sprite(self, radius, color):
+        key = (radius, color)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, color, (radius, radius), radius)
+            self._sprites[key] = sprite
+        return sprite
+
+    def draw(self, surface, camera_x=0, camera_y=0):
+        """Blit every on-screen round in one Surface.blits call."""
+        n = self.count
+        if n == 0:
+            return
+        sx = self.x[:n].astype(np.int64) - int(camera_x)
+        sy = self.y[:n].astype(np.int64) - int(camera_y)
+        r = self.radius[:n]
+        w, h = surface.get_size()
+        visible = np.flatnonzero((sx + r >= 0) & (sx - r < w) & (sy + r >= 0) & (sy - r < h))
+        colors = self.color
+        surface.blits([
+            (self._sprite(int(r[i]), tuple(colors[i].tolist())), (int(sx[i] - r[i]), int(sy[i] - r[i])))
+            for i in visible.tolist()
+        ], doreturn=False)
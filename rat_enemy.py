@@ -2,35 +2,49 @@ import pygame
 import math
 import random
 from enemy import Enemy
+from spatial_index import rect_blocked
+from enemy_ai_utils import chase_target, steer_clear_of_walls
+from asset_manager import ASSETS
 
 # --- Load squeak sounds --
 RAT_SQUEAK_SOUNDS = []
 for i in range(5):
     path = f"assets/audio/ratSqueak_{i}.wav"
-    try:
-        snd = pygame.mixer.Sound(path)
-        snd.set_volume(0.4)  # make it loud enough
-        RAT_SQUEAK_SOUNDS.append(snd)
-        print("Loaded rat squeak:", path)
-    except Exception as e:
-        print("FAILED to load:", path, e)
-        RAT_SQUEAK_SOUNDS.append(None)
+    snd = ASSETS.sound(path, volume=0.4)  # make it loud enough
+    RAT_SQUEAK_SOUNDS.append(snd)
+    print("Loaded rat squeak:" if snd else "FAILED to load:", path)
 
 
+# {direction: frames}, built by the first rat and shared by all of them
+_ANIMATIONS = {}
+
+
+def rat_animations():
+    """{direction: frames} (0=N, 1=E, 2=S, 3=W), the same lists for every rat."""
+    if not _ANIMATIONS:
+        for direction in range(4):
+            _ANIMATIONS[direction] = [
+                ASSETS.image(f"assets/rat/rat_{direction}{frame}.png") for frame in range(3)
+            ]
+    return _ANIMATIONS
+
 
 class RatEnemy(Enemy):
+    __slots__ = (
+        "damage", "animations", "direction", "current_frame", "frame_timer", "frame_speed",
+        "state", "timer", "attack_cooldown", "detection_range", "attack_range",
+        "windup_time", "attack_duration", "recover_time", "lunge_speed",
+        "wander_dir", "wander_timer", "has_attacked", "last_seen_player", "squeak_cooldown",
+    )
+
     def __init__(self, x, y):
         super().__init__(x, y, health=30)
         self.speed = 180.0
         self.size = 20
         self.damage = 5
 
-        # --- Load directional frames ---
-        self.animations = {d: [] for d in range(4)}  # 0=N, 1=E, 2=S, 3=W
-        for direction in range(4):
-            for frame in range(3):
-                img = pygame.image.load(f"assets/rat/rat_{direction}{frame}.png").convert_alpha()
-                self.animations[direction].append(img)
+        # --- Directional frames (loaded once, shared) ---
+        self.animations = rat_animations()  # 0=N, 1=E, 2=S, 3=W
 
         self.direction = random.choice([0, 1, 2, 3])
         self.current_frame = 0
@@ -86,21 +100,16 @@ class RatEnemy(Enemy):
         dist = math.hypot(dx, dy)
         if dist == 0:
             return
-        dx /= dist
-        dy /= dist
+        dx, dy = steer_clear_of_walls(self, dx / dist, dy / dist, walls)
 
         new_x = self.x + dx * speed * dt
         new_y = self.y + dy * speed * dt
 
-        obstacles = list(walls or [])
-        if barricades:
-            obstacles += [b.rect for b in barricades if getattr(b, "active", False)]
-
         rect_x = pygame.Rect(new_x - self.size / 2, self.y - self.size / 2, self.size, self.size)
-        if not any(rect_x.colliderect(o) for o in obstacles):
+        if not rect_blocked(rect_x, walls, barricades):
             self.x = new_x
         rect_y = pygame.Rect(self.x - self.size / 2, new_y - self.size / 2, self.size, self.size)
-        if not any(rect_y.colliderect(o) for o in obstacles):
+        if not rect_blocked(rect_y, walls, barricades):
             self.y = new_y
 
         self.rect.center = (self.x, self.y)
@@ -128,6 +137,13 @@ class RatEnemy(Enemy):
             self.current_frame = (self.current_frame + 1) % len(self.animations[self.direction])
             self.image = self.animations[self.direction][self.current_frame]
 
+    def skip_animation(self, lag):
+        """Move the walk cycle on by `lag` seconds at once (see Enemy.animate_if_visible)."""
+        frames = self.animations[self.direction]
+        steps, self.frame_timer = divmod(self.frame_timer + lag, self.frame_speed)
+        self.current_frame = (self.current_frame + int(steps)) % len(frames)
+        self.image = frames[self.current_frame]
+
     def try_squeak(self, dt, player):
         # Reduce cooldown
         self.squeak_cooldown -= dt
@@ -151,12 +167,12 @@ class RatEnemy(Enemy):
 
 
     # --- Main AI ---
-    def update(self, dt, player=None, walls=None, enemies=None, barricades=None, **kwargs):
+    def update(self, dt, player=None, walls=None, enemies=None, barricades=None, los=None, flow=None, **kwargs):
         """Handle rat AI behavior and attacks with visible windup."""
         # Only update LOS memory manually (don’t move via base)
         if walls is not None:
-            from enemy_ai_utils import has_line_of_sight
-            can_see = has_line_of_sight(self, player, (walls or []) + [b.rect for b in (barricades or []) if b.active])
+            from enemy_ai_utils import can_see_player
+            can_see = can_see_player(self, player, walls, barricades, los)
         else:
             can_see = True
 
@@ -177,6 +193,7 @@ class RatEnemy(Enemy):
                 self.state = "wander"
                 return
             if dist > self.attack_range:
+                target = chase_target(self, target, can_see, flow)
                 self.move_toward_point(target, self.speed, dt, walls, barricades)
             else:
                 if self.attack_cooldown <= 0:
@@ -213,5 +230,5 @@ class RatEnemy(Enemy):
         self.try_squeak(dt, player)
         
         self.attack_cooldown = max(0, self.attack_cooldown - dt)
-        self.animate(dt)
+        self.animate_if_visible(dt)
         self.update_burning(dt)
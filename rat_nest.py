@@ -4,33 +4,15 @@ import random
 import enemy  # dynamically access BURN_FRAMES and use same burn logic
 from rat_enemy import RatEnemy
 from brood_fly import BroodFly
-from enemy_ai_utils import has_line_of_sight
+import enemy_ai_utils
 from health_pack import HealthPack
+from spatial_index import spot_clear
+from stats import ParticleStyle
+from asset_manager import ASSETS
 
-class SmokeParticle:
-    """Simple rising smoke particle for angry nest visual."""
-    def __init__(self, x, y):
-        self.x = x + random.randint(-10, 10)
-        self.y = y + random.randint(-5, 5)
-        self.radius = random.randint(4, 10)
-        self.alpha = 180
-        self.lifetime = random.uniform(0.8, 1.6)
-        self.elapsed = 0.0
-        self.rise_speed = random.uniform(20, 40)
-        self.fade_rate = random.uniform(100, 130)
-
-    def update(self, dt):
-        self.elapsed += dt
-        self.y -= self.rise_speed * dt
-        self.alpha -= self.fade_rate * dt
-        return self.alpha > 0 and self.elapsed < self.lifetime
-
-    def draw(self, surface, camera_offset=(0, 0)):
-        cam_x, cam_y = camera_offset
-        if self.alpha > 0:
-            s = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(s, (80, 80, 80, int(self.alpha)), (self.radius, self.radius), self.radius)
-            surface.blit(s, (self.x - self.radius - cam_x, self.y - self.radius - cam_y))
+# Rising grey puffs over an angry nest
+NEST_SMOKE = ParticleStyle(color=(80, 80, 80), radius=(4, 10), alpha=180, fade=(100, 130),
+                           lifetime=(0.8, 1.6), speed=(20, 40), jitter=(10, 5))
 
 class RatNest:
     def __init__(self, x, y, health=300, spawn_interval=4000, max_spawned_rats=5, max_spawned_flies = 3):
@@ -45,15 +27,8 @@ class RatNest:
         self.last_fly_spawn_time = pygame.time.get_ticks()
         self.fly_spawn_interval = spawn_interval * 1.8
         self.max_spawned_flies = max_spawned_flies
-        # --- Animated Nest Frames ---
-        # --- Animated Nest Frames ---
-        self.nest_frames = []
-        for i in range(6):
-            try:
-                frame = pygame.image.load(f"assets/ratNest/ratNest_{i}.png").convert_alpha()
-                self.nest_frames.append(frame)
-            except:
-                print(f"⚠ Missing nest frame: ratNest_{i}.png")
+        # --- Animated Nest Frames (loaded once, shared by every nest) ---
+        self.nest_frames = ASSETS.frames(f"assets/ratNest/ratNest_{i}.png" for i in range(6))
 
         # Fallback (ensure no crashes)
         if not self.nest_frames:
@@ -65,6 +40,7 @@ class RatNest:
         self.frame_speed = 0.34     # normal animation speed
         self.angry_frame_speed = 0.15  # faster animation when angry
         self.frame_timer = 0.0
+        self.anim_lag = 0.0  # time spent off screen, skipped ahead on return (skip_animation)
 
         # Randomize starting frame so nests are not synced
         self.frame_index = random.randint(0, len(self.nest_frames) - 1)
@@ -85,13 +61,22 @@ class RatNest:
         
         # Angry state & smoke
         self.is_angry = False
-        self.smoke_particles: list[SmokeParticle] = []
         self.smoke_timer = 0.0
         self.smoke_interval = 0.08  # seconds between new smoke particles
 
     # ----------------------------------------------------------------
-    def update(self, dt, enemies_list, walls=None, player=None):
-        self.animate(dt)
+    def update(self, dt, enemies_list, walls=None, player=None, los=None, rat_swarm=None, particles=None):
+        """
+        `rat_swarm` (a RatSwarm), when given, owns the rats this nest spawns;
+        `particles` (a ParticleSystem) gets its smoke.
+        """
+        if enemy.in_camera_view(self.rect):
+            if self.anim_lag:
+                self.skip_animation(self.anim_lag)
+                self.anim_lag = 0.0
+            self.animate(dt)
+        else:
+            self.anim_lag += dt
         # --- Update burning animation + damage ---
         if self.is_burning:
             self.update_burning(dt)
@@ -99,6 +84,8 @@ class RatNest:
             self.take_damage(self.burn_dps * dt)
             if self.burn_duration <= 0:
                 self.stop_burning()
+            elif particles is not None:
+                particles.emit_over(enemy.BURN_CINDERS, self.x, self.y - self.rect.height // 6, dt)
 
         if not self.active:
             return
@@ -116,7 +103,7 @@ class RatNest:
             distance = (dx**2 + dy**2)**0.5
 
             # Check line of sight to player
-            can_see_player = has_line_of_sight(self, player, walls) if walls else True
+            can_see_player = enemy_ai_utils.can_see_player(self, player, walls, los=los) if walls else True
 
             if can_see_player:
                 # When player is visible and near, spawn faster and reduce nearby-rat awareness
@@ -132,14 +119,18 @@ class RatNest:
 
         # --- Spawn rats periodically ---
         now = pygame.time.get_ticks()
-        nearby_rats = [
-            e for e in enemies_list
-            if isinstance(e, RatEnemy)
-            and (abs(e.x - self.x) < effective_range and abs(e.y - self.y) < effective_range)
-        ]
-
-        if now - self.last_spawn_time > effective_interval and len(nearby_rats) < self.max_spawned_rats:
-            self.spawn_enemy(RatEnemy, enemies_list, walls)
+        if rat_swarm is not None:
+            nearby_rats = rat_swarm.count_near(self.x, self.y, effective_range)
+        else:
+            nearby_rats = sum(
+                1 for e in enemies_list
+                if isinstance(e, RatEnemy)
+                and (abs(e.x - self.x) < effective_range and abs(e.y - self.y) < effective_range)
+            )
+
+        if now - self.last_spawn_time > effective_interval and nearby_rats < self.max_spawned_rats:
+            rat_factory = rat_swarm.spawn if rat_swarm is not None else RatEnemy
+            self.spawn_enemy(rat_factory, enemies_list, walls)
             self.last_spawn_time = now
             
         # --- Brood fly spawn ---
@@ -154,13 +145,11 @@ class RatNest:
                 self.last_fly_spawn_time = now
                 
         # --- Update smoke if angry ---
-        if self.is_angry:
+        if self.is_angry and particles is not None:
             self.smoke_timer += dt
             if self.smoke_timer >= self.smoke_interval:
                 self.smoke_timer = 0.0
-                self.smoke_particles.append(SmokeParticle(self.x, self.y - 20))
-
-        self.smoke_particles = [p for p in self.smoke_particles if p.update(dt)]
+                particles.emit(NEST_SMOKE, self.x, self.y - 20)
 
     # ----------------------------------------------------------------
     def spawn_enemy(self, enemy_class, enemies_list, walls=None):
@@ -173,15 +162,13 @@ class RatNest:
             spawn_y = self.y + offset_y
 
             enemy_size = 24
-            spawn_rect = pygame.Rect(spawn_x - enemy_size / 2, spawn_y - enemy_size / 2, enemy_size, enemy_size)
-
-            if walls and any(spawn_rect.colliderect(w) for w in walls):
+            if not spot_clear(spawn_x, spawn_y, enemy_size / 2, walls):
                 continue  # retry
 
             enemies_list.append(enemy_class(spawn_x, spawn_y))
             return  # success
 
-        print(f"⚠️ RatNest at ({self.x:.0f}, {self.y:.0f}) could not find clear spawn spot for {enemy_class.__name__}.")
+        print(f"⚠️ RatNest at ({self.x:.0f}, {self.y:.0f}) could not find clear spawn spot for {getattr(enemy_class, '__qualname__', enemy_class)}.")
     def take_damage(self, dmg, health_packs_list=None):
         if not self.active:
             return
@@ -193,7 +180,6 @@ class RatNest:
         self.active = False
         if health_packs_list is not None and random.random() < 0.5:
             health_packs_list.append(HealthPack(self.x, self.y))
-        self.smoke_particles.clear()
         print("💥 Rat Nest destroyed!")
 
     # ----------------------------------------------------------------
@@ -257,6 +243,15 @@ class RatNest:
         self.rect = self.image.get_rect(center=(self.x, self.y))
 
 
+    def skip_animation(self, lag):
+        """Move the idle loop on by `lag` seconds at once (used after time off screen)."""
+        if not self.active:
+            return
+        speed = self.angry_frame_speed if self.is_angry else self.frame_speed
+        steps, self.frame_timer = divmod(self.frame_timer + lag, speed)
+        self.frame_index = (self.frame_index + int(steps)) % len(self.nest_frames)
+        self.image = self.nest_frames[self.frame_index]
+
     # ----------------------------------------------------------------
     def draw(self, surface, camera_offset=(0, 0)):
         cam_x, cam_y = camera_offset
@@ -266,24 +261,18 @@ class RatNest:
 
         # 🔥 Draw fire overlay if burning
         if self.is_burning and self.burn_state:
-            frames = enemy.BURN_FRAMES[self.burn_state]
-            frame_index = min(self.burn_frame, len(frames) - 1)
-            frame = frames[frame_index]
-
-            # 🔥 Scale fire relative to nest size
+            # 🔥 Scale fire relative to nest size (pre-scaled frames, shared)
             base_flame_size = 30
             scale_factor = self.rect.width / 30.0  # nest is ~80px wide
             scaled_size = int(base_flame_size * scale_factor)
-            scaled_frame = pygame.transform.scale(frame, (scaled_size, scaled_size))
+            frames = enemy.burn_frames(scaled_size)[self.burn_state]
+            frame_index = min(self.burn_frame, len(frames) - 1)
+            scaled_frame = frames[frame_index]
 
             flame_rect = scaled_frame.get_rect(center=rect.center)
             flame_rect.centery -= self.rect.height // 6  # move slightly up
             surface.blit(scaled_frame, flame_rect)
             
-        # Smoke draw (only while angry)
-        for particle in self.smoke_particles:
-            particle.draw(surface, camera_offset)
-
         # Health bar
         if self.active:
             bar_width, bar_height = 60, 6
@@ -0,0 +1,547 @@
+# rat_swarm.py
+import random
+import numpy as np
+import pygame
+from rat_enemy import RatEnemy, RAT_SQUEAK_SOUNDS, rat_animations
+from los_batch import LineOfSightBatch
+
+# State codes (RatEnemy.state strings, as small ints)
+WANDER, CHASE, WINDUP, ATTACK, RECOVER = range(5)
+STATE_NAMES = ("wander", "chase", "windup", "attack", "recover")
+
+
+def _column(name):
+    """Property reading/writing one swarm column for this rat's row (or its final value once removed)."""
+    def get(self):
+        if self.row is None:
+            return self._final[name]
+        return getattr(self.swarm, name).item(self.row)
+
+    def set(self, value):
+        if self.row is None:
+            self._final[name] = value
+        else:
+            getattr(self.swarm, name)[self.row] = value
+
+    return property(get, set)
+
+
+class SwarmRat(RatEnemy):
+    """
+    Handle for one rat living in a RatSwarm.
+
+    Position and health are views onto the swarm's arrays, so bullets,
+    the flamethrower, puddles and burns treat it like any other enemy
+    (take_damage, start_burning, rect, ...). The swarm runs the AI and
+    draws the body; `update` is a no-op and `draw` only adds the flames.
+    """
+
+    __slots__ = ("swarm", "row", "_final")
+
+    x = _column("x")
+    y = _column("y")
+    health = _column("health")
+
+    def __init__(self, swarm, row):
+        self.swarm = swarm
+        self.row = row
+        self._final = None
+        self.size = swarm.size
+        self.speed = swarm.speed
+        self.damage = swarm.damage
+
+        # Per-rat state the rest of the game reads/writes directly
+        self.is_burning = False
+        self.burn_state = None
+        self.burn_timer = 0.0
+        self.burn_frame = 0
+        self.last_known = None
+        self.sees_player = False
+        self.speed_multiplier = 1.0
+        self.in_puddle = False
+        self.puddle_slow = 1.0
+        self.puddle_tick_timer = 0.0
+
+    @property
+    def rect(self):
+        if self.row is None:
+            return self._final["rect"]
+        return self.swarm.rect_of(self.row)
+
+    @property
+    def state(self):
+        if self.row is None:
+            return self._final["state"]
+        return STATE_NAMES[self.swarm.state.item(self.row)]
+
+    def _detach(self):
+        """Called by the swarm when this rat's row goes away; keeps the last values readable."""
+        self._final = {"x": self.x, "y": self.y, "health": self.health,
+                       "rect": self.rect, "state": self.state}
+        self.row = None
+
+    # -------------------------------------------------------------------------
+    def update(self, dt, player=None, walls=None, enemies=None, barricades=None, los=None, flow=None, **kwargs):
+        """Nothing to do: RatSwarm.update advances every rat at once."""
+
+    def draw(self, surface, camera_offset):
+        """The body is drawn by RatSwarm.draw; only the burn overlay is per rat."""
+        if self.is_burning:
+            self.draw_burning(surface, self.x - camera_offset[0], self.y - camera_offset[1])
+
+
+class RatSwarm:
+    """
+    Every RatEnemy of a level as NumPy columns.
+
+    Runs the same wander/chase/windup/attack/recover machine as
+    RatEnemy.update, but as array operations over the whole swarm: state
+    timers, line of sight (LineOfSightBatch.visible_from), flow-field
+    chasing, wall steering and sliding. Wall sliding only falls back to the
+    per-rect collision test for rats the DistanceField puts close to a wall
+    or a barricade. Sprites are loaded once and shared.
+
+    Each rat also has a SwarmRat handle (`rats`, same order as the rows)
+    that lives in main's enemy list. Dead rats' rows are dropped at the
+    start of the next update by moving the last row into the hole.
+    """
+
+    # Tuning (same numbers as RatEnemy)
+    health_max = 30
+    speed = 180.0
+    size = 20
+    damage = 5
+    detection_range = 300
+    attack_range = 45
+    windup_time = 0.35
+    attack_duration = 0.25
+    recover_time = 0.6
+    attack_cooldown_time = 0.8
+    lunge_speed = 280
+    frame_speed = 0.15
+    squeak_range = 500
+    squeak_chance = 0.015
+
+    _frames = None  # shared sprites: index direction * 3 + frame
+
+    def __init__(self, capacity=256):
+        self.count = 0
+        self.rats = []
+        self._alloc(capacity)
+        self._los = None
+        self._los_walls = None
+        self._boxes_source = None
+        self._boxes = None
+        self._load_frames()
+        self.image_w, self.image_h = self._frames[0].get_size()
+
+    @classmethod
+    def _load_frames(cls):
+        if cls._frames is None:
+            animations = rat_animations()
+            cls._frames = [frame for direction in range(4) for frame in animations[direction]]
+
+    def _alloc(self, capacity):
+        self.capacity = capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.health = np.zeros(capacity)
+        self.state = np.zeros(capacity, dtype=np.int8)
+        self.timer = np.zeros(capacity)
+        self.attack_cooldown = np.zeros(capacity)
+        self.has_attacked = np.zeros(capacity, dtype=bool)
+        self.wander_x = np.zeros(capacity)
+        self.wander_y = np.zeros(capacity)
+        self.wander_timer = np.zeros(capacity)
+        self.seen = np.zeros(capacity, dtype=bool)  # has a last-seen player position
+        self.seen_x = np.zeros(capacity)
+        self.seen_y = np.zeros(capacity)
+        self.squeak_cooldown = np.zeros(capacity)
+        self.direction = np.zeros(capacity, dtype=np.int8)
+        self.frame = np.zeros(capacity, dtype=np.int8)
+        self.frame_timer = np.zeros(capacity)
+        self.shown = np.zeros(capacity, dtype=np.int16)  # sprite index on screen
+        self.rect_x = np.zeros(capacity, dtype=np.int32)  # hit rect top-left
+        self.rect_y = np.zeros(capacity, dtype=np.int32)
+
+    _COLUMNS = ("x", "y", "health", "state", "timer", "attack_cooldown", "has_attacked",
+                "wander_x", "wander_y", "wander_timer", "seen", "seen_x", "seen_y",
+                "squeak_cooldown", "direction", "frame", "frame_timer", "shown",
+                "rect_x", "rect_y")
+
+    def _grow(self):
+        old = {name: getattr(self, name) for name in self._COLUMNS}
+        self._alloc(self.capacity * 2)
+        for name, column in old.items():
+            getattr(self, name)[:len(column)] = column
+
+    # -------------------------------------------------------------------------
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        for rat in self.rats:
+            rat._detach()
+        self.rats.clear()
+        self.count = 0
+
+    def spawn(self, x, y):
+        """Add a rat at (x, y) and return its SwarmRat handle."""
+        if self.count == self.capacity:
+            self._grow()
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.health[i] = self.health_max
+        self.state[i] = WANDER
+        self.timer[i] = 0.0
+        self.attack_cooldown[i] = 0.0
+        self.has_attacked[i] = False
+        wx, wy = self._random_dirs(1)
+        self.wander_x[i] = wx[0]
+        self.wander_y[i] = wy[0]
+        self.wander_timer[i] = random.uniform(1.5, 3.0)
+        self.seen[i] = False
+        self.squeak_cooldown[i] = random.uniform(2.0, 5.0)
+        self.direction[i] = random.choice([0, 1, 2, 3])
+        self.frame[i] = 0
+        self.frame_timer[i] = 0.0
+        self.shown[i] = self.direction[i] * 3
+        self._place_rects(np.array([i]))
+        self.count += 1
+
+        rat = SwarmRat(self, i)
+        self.rats.append(rat)
+        return rat
+
+    def remove(self, i):
+        """Drop row i, moving the last row (and its handle) into it."""
+        self.rats[i]._detach()
+        last = self.count - 1
+        if i != last:
+            for name in self._COLUMNS:
+                column = getattr(self, name)
+                column[i] = column[last]
+            moved = self.rats[last]
+            moved.row = i
+            self.rats[i] = moved
+        self.rats.pop()
+        self.count = last
+
+    def prune(self):
+        """Drop every rat whose health ran out (main calls this with its survivors pass, before drawing)."""
+        dead = np.flatnonzero(self.health[:self.count] <= 0)
+        for i in dead[::-1].tolist():
+            self.remove(i)
+
+    def rect_of(self, i):
+        return pygame.Rect(self.rect_x.item(i), self.rect_y.item(i), self.image_w, self.image_h)
+
+    def add_to_grid(self, grid):
+        """Insert every rat's handle into an EntityGrid (after it was rebuilt with the other enemies)."""
+        n = self.count
+        grid.insert_many(self.rats, self.rect_x[:n], self.rect_y[:n],
+                         self.rect_x[:n] + self.image_w, self.rect_y[:n] + self.image_h)
+
+    def count_near(self, x, y, reach):
+        """Rats within `reach` on both axes of (x, y) (a RatNest's 'nearby' box)."""
+        n = self.count
+        return int(np.count_nonzero((np.abs(self.x[:n] - x) < reach) & (np.abs(self.y[:n] - y) < reach)))
+
+    @staticmethod
+    def _random_dirs(k):
+        """k random unit headings, drawn like RatEnemy's normalized square samples."""
+        dx = np.random.uniform(-1, 1, k)
+        dy = np.random.uniform(-1, 1, k)
+        length = np.hypot(dx, dy)
+        length[length == 0.0] = 1.0
+        return dx / length, dy / length
+
+    def _place_rects(self, rows):
+        # rect.center = (x, y): pygame rounds half away from zero
+        cx = np.sign(self.x[rows]) * np.floor(np.abs(self.x[rows]) + 0.5)
+        cy = np.sign(self.y[rows]) * np.floor(np.abs(self.y[rows]) + 0.5)
+        self.rect_x[rows] = cx.astype(np.int32) - self.image_w // 2
+        self.rect_y[rows] = cy.astype(np.int32) - self.image_h // 2
+
+    # -------------------------------------------------------------------------
+    def update(self, dt, player, walls=None, los=None, flow=None):
+        """Advance every rat one frame (RatEnemy.update for the whole swarm)."""
+        self.prune()
+        n = self.count
+        if n == 0 or player is None:
+            return
+
+        x, y = self.x[:n], self.y[:n]
+        state, timer = self.state[:n], self.timer[:n]
+
+        # --- Line of sight + memory ---
+        if walls is not None:
+            if los is None:
+                if self._los is None or self._los_walls is not walls:
+                    self._los, self._los_walls = LineOfSightBatch(walls), walls
+                los = self._los
+            can_see = los.visible_from(x, y, player, getattr(walls, "active_barricades", None))
+        else:
+            can_see = np.ones(n, dtype=bool)
+        self.seen[:n] |= can_see
+        self.seen_x[:n][can_see] = player.x
+        self.seen_y[:n][can_see] = player.y
+
+        pcx, pcy = player.rect.center
+        half_w, half_h = self.image_w // 2, self.image_h // 2
+        dist = np.hypot(pcx - (self.rect_x[:n] + half_w), pcy - (self.rect_y[:n] + half_h))
+        near = dist < self.detection_range
+
+        # Snapshot of who is in which state before any transition this frame
+        wandering = np.flatnonzero(state == WANDER)
+        chasing = np.flatnonzero(state == CHASE)
+        winding = np.flatnonzero(state == WINDUP)
+        attacking = np.flatnonzero(state == ATTACK)
+        recovering = np.flatnonzero(state == RECOVER)
+
+        # --- Movement: one heading + speed per moving rat ---
+        move_rows, heading_x, heading_y, speeds = [], [], [], []
+
+        # wander
+        if len(wandering):
+            move_rows.append(wandering)
+            heading_x.append(self.wander_x[wandering] * 40)
+            heading_y.append(self.wander_y[wandering] * 40)
+            speeds.append(np.full(len(wandering), self.speed * 0.4))
+
+        # chase: toward the player when seen, else along the flow field
+        if len(chasing):
+            lost = chasing[~can_see[chasing] & ~self.seen[chasing]]
+            state[lost] = WANDER
+            chasing = chasing[can_see[chasing] | self.seen[chasing]]
+            far = dist[chasing] > self.attack_range
+            runners = chasing[far]
+            if len(runners):
+                seen_now = can_see[runners]
+                tx = np.where(seen_now, player.x, self.seen_x[runners])
+                ty = np.where(seen_now, player.y, self.seen_y[runners])
+                if flow is not None:
+                    wx, wy, valid = flow.waypoints(x[runners], y[runners])
+                    use = valid & ~seen_now
+                    tx = np.where(use, wx, tx)
+                    ty = np.where(use, wy, ty)
+                move_rows.append(runners)
+                heading_x.append(tx - x[runners])
+                heading_y.append(ty - y[runners])
+                speeds.append(np.full(len(runners), self.speed))
+            ready = chasing[~far]
+            ready = ready[self.attack_cooldown[ready] <= 0]
+            state[ready] = WINDUP
+            timer[ready] = self.windup_time
+
+        # windup: hold position
+        timer[winding] -= dt
+        done = winding[timer[winding] <= 0]
+        state[done] = ATTACK
+        timer[done] = self.attack_duration
+        self.has_attacked[done] = False
+
+        # attack: lunge at the player
+        if len(attacking):
+            move_rows.append(attacking)
+            heading_x.append(pcx - x[attacking])
+            heading_y.append(pcy - y[attacking])
+            speeds.append(np.full(len(attacking), float(self.lunge_speed)))
+
+        if move_rows:
+            self._move(np.concatenate(move_rows), np.concatenate(heading_x),
+                       np.concatenate(heading_y), np.concatenate(speeds), dt, walls)
+
+        # wander timers / facing (the wander heading wins over the steered one)
+        if len(wandering):
+            # Facing uses the heading the rat walked with this frame
+            self.direction[wandering] = self._directions(self.wander_x[wandering], self.wander_y[wandering])
+            self.wander_timer[wandering] -= dt
+            expired = wandering[self.wander_timer[wandering] <= 0]
+            if len(expired):
+                wx, wy = self._random_dirs(len(expired))
+                self.wander_x[expired] = wx
+                self.wander_y[expired] = wy
+                self.wander_timer[expired] = np.random.uniform(1.5, 3.0, len(expired))
+            became = wandering[near[wandering] & can_see[wandering]]
+            state[became] = CHASE
+
+        if len(attacking):
+            self._resolve_attacks(attacking, player)
+            timer[attacking] -= dt
+            done = attacking[timer[attacking] <= 0]
+            state[done] = RECOVER
+            timer[done] = self.recover_time
+            self.attack_cooldown[done] = self.attack_cooldown_time
+
+        timer[recovering] -= dt
+        done = recovering[timer[recovering] <= 0]
+        state[done] = np.where(near[done], CHASE, WANDER)
+
+        # --- Squeaks, cooldowns, animation, burning ---
+        self._squeak(dt, dist)
+        np.maximum(self.attack_cooldown[:n] - dt, 0.0, out=self.attack_cooldown[:n])
+        self._animate(dt)
+        for rat in self.rats:
+            if rat.is_burning:
+                rat.update_burning(dt)
+
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _directions(dx, dy):
+        """RatEnemy.get_direction_from_angle for arrays (0=N, 1=E, 2=S, 3=W)."""
+        angle = np.degrees(np.arctan2(dy, dx))
+        return np.select(
+            [(angle >= -45) & (angle < 45), (angle >= 45) & (angle < 135), (angle >= -135) & (angle < -45)],
+            [1, 2, 0], default=3,
+        )
+
+    def _move(self, rows, dx, dy, speed, dt, walls):
+        """move_toward_point for many rats: steer, then slide on x then y."""
+        length = np.hypot(dx, dy)
+        moving = length > 0
+        rows, dx, dy, speed, length = rows[moving], dx[moving], dy[moving], speed[moving], length[moving]
+        if not len(rows):
+            return
+        dx /= length
+        dy /= length
+        dx, dy = self._steer(rows, dx, dy, walls)
+
+        new_x = self.x[rows] + dx * speed * dt
+        ok = self._clear(new_x, self.y[rows], walls)
+        self.x[rows] = np.where(ok, new_x, self.x[rows])
+        new_y = self.y[rows] + dy * speed * dt
+        ok = self._clear(self.x[rows], new_y, walls)
+        self.y[rows] = np.where(ok, new_y, self.y[rows])
+
+        self._place_rects(rows)
+        self.direction[rows] = self._directions(dx, dy)
+
+    def _steer(self, rows, dx, dy, walls, reach=20.0):
+        """steer_clear_of_walls for many rats."""
+        field = getattr(walls, "distance", None)
+        if field is None:
+            return dx, dy
+        x, y = self.x[rows], self.y[rows]
+        gap = field.clearance_many(x, y) - self.size / 2
+        close = np.flatnonzero(gap < reach)
+        if not len(close):
+            return dx, dy
+
+        gx, gy = field.gradient_many(x[close], y[close])
+        into = dx[close] * gx + dy[close] * gy
+        push = np.minimum(1.0, (reach - gap[close]) / reach)
+        sx = dx[close] - gx * into * push
+        sy = dy[close] - gy * into * push
+        length = np.hypot(sx, sy)
+        bend = (into < 0) & (length >= 1e-6)
+        dx, dy = dx.copy(), dy.copy()
+        dx[close[bend]] = sx[bend] / length[bend]
+        dy[close[bend]] = sy[bend] / length[bend]
+        return dx, dy
+
+    def _clear(self, xs, ys, walls):
+        """
+        True where a size x size box at (xs, ys) hits no wall or barricade
+        (rect_blocked for arrays). Boxes the DistanceField puts well clear of
+        every wall skip the box test; the rest are tested against all wall
+        and barricade boxes at once.
+        """
+        ok = np.ones(len(xs), dtype=bool)
+        if not walls:
+            return ok
+        half = self.size / 2
+        # Same corner as pygame.Rect(x - half, ...), which truncates
+        left = np.trunc(xs - half)
+        top = np.trunc(ys - half)
+
+        field = getattr(walls, "distance", None)
+        if field is not None:
+            # +1 covers that truncation
+            todo = np.flatnonzero(field.clearance_many(xs, ys) - field.slack < half + 1)
+        else:
+            todo = np.arange(len(xs))
+
+        boxes = self._wall_boxes(walls)
+        rects = getattr(walls, "barricade_rects", ())
+        if rects:
+            boxes = np.concatenate([boxes, [(r.left, r.top, r.right, r.bottom) for r in rects]])
+            # Barricades are not in the distance field
+            near = np.zeros(len(xs), dtype=bool)
+            for r in rects:
+                near |= ((left < r.right) & (left + self.size > r.left) &
+                         (top < r.bottom) & (top + self.size > r.top))
+            todo = np.union1d(todo, np.flatnonzero(near))
+        if not len(todo) or not len(boxes):
+            return ok
+
+        l, t = left[todo, None], top[todo, None]
+        hit = ((l < boxes[:, 2]) & (l + self.size > boxes[:, 0]) &
+               (t < boxes[:, 3]) & (t + self.size > boxes[:, 1]))
+        ok[todo] = ~hit.any(axis=1)
+        return ok
+
+    def _wall_boxes(self, walls):
+        """Static wall rects as an (N, 4) array of left, top, right, bottom (cached)."""
+        source = getattr(walls, "walls", walls)
+        if self._boxes_source is not source:
+            self._boxes_source = source
+            self._boxes = np.array([(w.left, w.top, w.right, w.bottom) for w in source],
+                                   dtype=np.float64).reshape(-1, 4)
+        return self._boxes
+
+    def _resolve_attacks(self, rows, player):
+        rows = rows[~self.has_attacked[rows]]
+        if not len(rows):
+            return
+        p = player.rect
+        hit = ((self.rect_x[rows] < p.right) & (self.rect_x[rows] + self.image_w > p.left) &
+               (self.rect_y[rows] < p.bottom) & (self.rect_y[rows] + self.image_h > p.top))
+        for i in rows[hit].tolist():
+            player.take_damage(self.damage)
+            self.has_attacked[i] = True
+
+    def _squeak(self, dt, dist):
+        n = self.count
+        cooldown = self.squeak_cooldown[:n]
+        cooldown -= dt
+        ready = np.flatnonzero((cooldown <= 0) & (dist <= self.squeak_range))
+        if not len(ready):
+            return
+        lucky = ready[np.random.random(len(ready)) < self.squeak_chance]
+        for i in lucky.tolist():
+            snd = random.choice(RAT_SQUEAK_SOUNDS)
+            if snd:
+                snd.play()
+            cooldown[i] = random.uniform(2.0, 5.0)
+
+    def _animate(self, dt):
+        n = self.count
+        self.frame_timer[:n] += dt
+        tick = np.flatnonzero(self.frame_timer[:n] >= self.frame_speed)
+        self.frame_timer[tick] = 0.0
+        self.frame[tick] = (self.frame[tick] + 1) % 3
+        # Like RatEnemy.animate, the sprite only changes on a frame tick
+        self.shown[tick] = self.direction[tick] * 3 + self.frame[tick]
+
+    # -------------------------------------------------------------------------
+    def draw(self, surface, camera_offset, visible=None):
+        """
+        Blit every on-screen rat in one Surface.blits call; with `visible`, a
+        function of (xs, ys) -> bool mask, only the on-screen rats it passes.
+        """
+        n = self.count
+        if n == 0:
+            return
+        cam_x, cam_y = camera_offset
+        # Same placement as Enemy.draw: image centred on the camera-relative position
+        sx = np.floor(self.x[:n] - cam_x + 0.5).astype(np.int64) - self.image_w // 2
+        sy = np.floor(self.y[:n] - cam_y + 0.5).astype(np.int64) - self.image_h // 2
+        w, h = surface.get_size()
+        rows = np.flatnonzero((sx + self.image_w > 0) & (sx < w) & (sy + self.image_h > 0) & (sy < h))
+        if visible is not None and len(rows):
+            rows = rows[visible(self.x[rows], self.y[rows])]
+        frames = self._frames
+        surface.blits([(frames[k], (x, y)) for k, x, y in zip(
+            self.shown[rows].tolist(), sx[rows].tolist(), sy[rows].tolist())], doreturn=False)
@@ -1,11 +1,16 @@
 import math
 import pygame
+from stats import BulletStats
 
 pygame.mixer.init()
 # Load sound once at module import
 RIFLE_FIRE_SOUND = pygame.mixer.Sound("assets/audio/rifle.mp3")
 RIFLE_FIRE_SOUND.set_volume(0.15)  # adjust 0–1 for loudness
 
+# Piercing round: goes through up to 3 enemies, shrinking after each
+RIFLE_ROUND = BulletStats(speed=1000, damage=40, lifetime=3.0, radius=8,
+                          color=(255, 255, 255), pierce=3)
+
 class Rifle:
     def __init__(self):
         self.fire_rate = 0.4  # seconds between shots
@@ -31,35 +36,11 @@ class Rifle:
                 
                 RIFLE_FIRE_SOUND.play()
 
-                # You can adjust this number for testing (e.g., 3 pierces)
-                bullet = RifleBullet(x, y, angle, pierce_count=3)
-                bullet_list.append(bullet)
+                # Pierce count lives on RIFLE_ROUND (e.g. 3 pierces)
+                bullet_list.spawn(RIFLE_ROUND, x, y, angle)
         else:
             self.triggered = False
 
 
     def reset_trigger(self):
         self.triggered = False
-
-
-class RifleBullet:
-    def __init__(self, x, y, angle, pierce_count=3):
-        self.x = x
-        self.y = y
-        self.angle = angle
-        self.speed = 1000
-        self.radius = 8
-        self.color = (255, 255, 255)
-        self.damage = 40
-        self.pierce_count = pierce_count  # how many enemies the bullet can go through
-        self.alive = True  # track if bullet should remain in play
-
-    def update(self, dt):
-        self.x += math.cos(self.angle) * self.speed * dt
-        self.y += math.sin(self.angle) * self.speed * dt
-
-    def draw(self, surface, camera_x=0, camera_y=0):
-        screen_x = int(self.x - camera_x)
-        screen_y = int(self.y - camera_y)
-        pygame.draw.circle(surface, self.color, (screen_x, screen_y), self.radius)
-
@@ -0,0 +1,237 @@
+# spatial_index.py
+import pygame
+from barricade import Barricade
+
+
+def cell_keys(rect, cell_size):
+    """All grid cells touched by rect (inclusive of its far edges)."""
+    x0 = int(rect.left // cell_size)
+    y0 = int(rect.top // cell_size)
+    x1 = int(rect.right // cell_size)
+    y1 = int(rect.bottom // cell_size)
+    return [(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+
+
+class WallGrid:
+    """
+    Uniform-grid index over static wall rects.
+
+    Built once per level so collision tests only look at the walls in the
+    cells a rect overlaps instead of scanning the whole wall list.
+    Iterating the grid yields the original walls, so code that still wants
+    the plain list keeps working.
+    """
+
+    def __init__(self, walls, cell_size=64):
+        self.walls = list(walls or [])
+        self.cell_size = cell_size
+        self.cells = {}  # (cx, cy) -> list of wall rects
+        self.visibility = None  # optional VisibilityTable baked by the level
+        self.distance = None  # optional DistanceField baked by the level
+        self.shadows = None  # optional ShadowCaster (wall segments) built by the level
+
+        for wall in self.walls:
+            for key in cell_keys(wall, cell_size):
+                self.cells.setdefault(key, []).append(wall)
+
+    # -------------------------------------------------------------------------
+    def __iter__(self):
+        return iter(self.walls)
+
+    def __len__(self):
+        return len(self.walls)
+
+    def __bool__(self):
+        return bool(self.walls)
+
+    # -------------------------------------------------------------------------
+    def query(self, rect):
+        """Return the walls stored in the cells rect overlaps (no duplicates)."""
+        found = []
+        seen = set()
+        for key in cell_keys(rect, self.cell_size):
+            for wall in self.cells.get(key, ()):
+                if id(wall) not in seen:
+                    seen.add(id(wall))
+                    found.append(wall)
+        return found
+
+    def collides(self, rect):
+        """True if rect overlaps any wall."""
+        cells = self.cells
+        for key in cell_keys(rect, self.cell_size):
+            bucket = cells.get(key)
+            if bucket and rect.collidelist(bucket) != -1:
+                return True
+        return False
+
+    def collide_point(self, x, y):
+        """True if the point (x, y) lies inside any wall."""
+        cs = self.cell_size
+        bucket = self.cells.get((int(x // cs), int(y // cs)))
+        if not bucket:
+            return False
+        return any(wall.collidepoint(x, y) for wall in bucket)
+
+
+class ObstacleSet(WallGrid):
+    """
+    Everything that blocks movement on a level: the static WallGrid plus the
+    level's barricades, shared read-only by every mover.
+
+    Shares the wall grid's cells instead of copying them. The active
+    barricade rects are cached and only rebuilt when a barricade opens or
+    closes; `version` goes up each time that happens so other caches (flow
+    fields, visibility overlays) can key off it.
+    """
+
+    def __init__(self, wall_grid, barricades=None):
+        self.walls = wall_grid.walls
+        self.cell_size = wall_grid.cell_size
+        self.cells = wall_grid.cells
+        self.visibility = wall_grid.visibility
+        self.distance = wall_grid.distance
+        self.shadows = wall_grid.shadows
+        self.wall_grid = wall_grid
+
+        self.version = 0
+        self._barricades = []
+        self._seen_state = None
+        self._active_barricades = ()
+        self._barricade_rects = ()
+        self.set_barricades(barricades)
+
+    def set_barricades(self, barricades):
+        """Attach the level's barricades (called once after they are created)."""
+        self._barricades = list(barricades or [])
+        self._seen_state = None
+
+    def _refresh(self):
+        if self._seen_state != Barricade.state_version:
+            self._seen_state = Barricade.state_version
+            self._active_barricades = tuple(b for b in self._barricades if b.active)
+            self._barricade_rects = tuple(b.rect for b in self._active_barricades)
+            self.version += 1
+
+    @property
+    def active_barricades(self):
+        self._refresh()
+        return self._active_barricades
+
+    @property
+    def barricade_rects(self):
+        self._refresh()
+        return self._barricade_rects
+
+    # -------------------------------------------------------------------------
+    def query(self, rect):
+        """Nearby walls plus any active barricade rect overlapping rect."""
+        found = super().query(rect)
+        found.extend(r for r in self.barricade_rects if r.colliderect(rect))
+        return found
+
+    def collides(self, rect):
+        if super().collides(rect):
+            return True
+        rects = self.barricade_rects
+        return bool(rects) and rect.collidelist(rects) != -1
+
+
+class EntityGrid:
+    """
+    Spatial hash for things that move every frame (enemies, nests).
+
+    Rebuilt once per frame from the live entity lists; hit tests then only
+    look at the entities sharing a cell with the query. Buckets keep the
+    insertion order, so results come back in the same order as the list
+    the grid was built from.
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}  # (cx, cy) -> list of entities
+
+    def clear(self):
+        self.cells.clear()
+
+    def insert(self, entity):
+        for key in cell_keys(entity.rect, self.cell_size):
+            self.cells.setdefault(key, []).append(entity)
+
+    def rebuild(self, entities):
+        """Replace the contents with `entities` at their current rects."""
+        self.cells.clear()
+        for entity in entities:
+            self.insert(entity)
+
+    def insert_many(self, entities, left, top, right, bottom):
+        """
+        Bulk insert for entities whose rects are already in arrays (e.g. a
+        RatSwarm's columns): the cell ranges are computed in one go instead
+        of building a Rect per entity.
+        """
+        cs = self.cell_size
+        cells = self.cells
+        for entity, x0, y0, x1, y1 in zip(entities, (left // cs).tolist(), (top // cs).tolist(),
+                                          (right // cs).tolist(), (bottom // cs).tolist()):
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    cells.setdefault((cx, cy), []).append(entity)
+
+    # -------------------------------------------------------------------------
+    def query_point(self, x, y):
+        """Entities whose rect contains (x, y)."""
+        cs = self.cell_size
+        bucket = self.cells.get((int(x // cs), int(y // cs)))
+        if not bucket:
+            return []
+        return [e for e in bucket if e.rect.collidepoint(x, y)]
+
+    def query_rect(self, rect):
+        """Entities stored in the cells rect overlaps (candidates, no duplicates)."""
+        found = []
+        seen = set()
+        for key in cell_keys(rect, self.cell_size):
+            for entity in self.cells.get(key, ()):
+                if id(entity) not in seen:
+                    seen.add(id(entity))
+                    found.append(entity)
+        return found
+
+    def query_circle(self, x, y, radius):
+        """Candidates near a circle; callers still do their own exact distance test."""
+        return self.query_rect(pygame.Rect(x - radius, y - radius, radius * 2, radius * 2))
+
+
+def spot_clear(x, y, half_size, walls=None):
+    """
+    Spawn check: True if a square of half-size `half_size` centred on (x, y)
+    touches no wall or active barricade. With the level's DistanceField the
+    wall part is a single lookup (slightly conservative right next to walls).
+    """
+    rect = pygame.Rect(x - half_size, y - half_size, half_size * 2, half_size * 2)
+    field = getattr(walls, "distance", None)
+    if field is not None:
+        if not field.fits(x, y, half_size):
+            return False
+        return not rect_blocked(rect, getattr(walls, "barricade_rects", ()))
+    return not (walls and rect_blocked(rect, walls))
+
+
+def rect_blocked(rect, walls=None, barricades=None):
+    """
+    Shared mover collision test: True if rect hits a wall or an active barricade.
+    `walls` may be the level's ObstacleSet (which already covers barricades),
+    a WallGrid or a plain list of rects.
+    """
+    if walls:
+        if isinstance(walls, WallGrid):
+            if walls.collides(rect):
+                return True
+        elif rect.collidelist(walls) != -1:
+            return True
+    if barricades:
+        for b in barricades:
+            if b.active and rect.colliderect(b.rect):
+                return True
+    return False
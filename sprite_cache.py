@@ -0,0 +1,65 @@
+# sprite_cache.py
+import math
+from collections import OrderedDict
+import pygame
+
+
+class RotationCache:
+    """
+    Pre-rotated copies of sprites, with the angle quantized to `steps`
+    buckets per full turn.
+
+    `get(image, degrees)` returns (rotated surface, (dx, dy)) where (dx, dy)
+    is the offset from the sprite's centre to the rotated surface's
+    top-left, so drawing centred on (x, y) is a single blit at
+    (x + dx, y + dy). Rotations are made on first use and kept
+    least-recently-used first, up to `max_bytes` of pixels; any sprite
+    (pass the same Surface object each time) can share one cache.
+    """
+
+    def __init__(self, steps=128, max_bytes=16 * 1024 * 1024):
+        self.steps = steps
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # (image, bucket) -> (surface, offset, bytes)
+
+    def bucket(self, degrees):
+        return round(degrees * self.steps / 360.0) % self.steps
+
+    def get(self, image, degrees):
+        key = (image, self.bucket(degrees))
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0], entry[1]
+
+        self.misses += 1
+        rotated = pygame.transform.rotate(image, key[1] * 360.0 / self.steps)
+        w, h = rotated.get_size()
+        size = w * h * rotated.get_bytesize()
+        self._entries[key] = (rotated, (-(w // 2), -(h // 2)), size)
+        self.bytes += size
+        while self.bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, _, evicted) = self._entries.popitem(last=False)
+            self.bytes -= evicted
+        return rotated, (-(w // 2), -(h // 2))
+
+    def blit(self, surface, image, degrees, center):
+        """Draw `image` rotated by `degrees` (counter-clockwise, like transform.rotate) centred on `center`."""
+        rotated, (dx, dy) = self.get(image, degrees)
+        # Rounded like Rect.center, which get_rect(center=...) uses
+        surface.blit(rotated, (math.floor(center[0] + 0.5) + dx, math.floor(center[1] + 0.5) + dy))
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self.bytes}
+
+
+# Shared by every rotated sprite in the game
+ROTATIONS = RotationCache()
@@ -1,10 +1,30 @@
+import math
 from dataclasses import dataclass
 
 @dataclass
 class BulletStats:
-    speed: float
-    damage: int
+    """Archetype for one kind of projectile (the row template ProjectileStore.spawn copies)."""
+    speed: float = 500
+    damage: int = 10
     lifetime: float = 2.0
-    def __init__(self, speed=500, damage=10):
-        self.speed = speed
-        self.damage = damage
\ No newline at end of file
+    radius: int = 4
+    color: tuple = (255, 255, 0)
+    pierce: int = 0          # enemies a round can pass through (0 = stops at the first)
+    explodes: bool = False   # leaves a plasma puddle where it stops or expires
+
+
+@dataclass
+class ParticleStyle:
+    """Archetype for one kind of particle (the row template ParticleSystem.emit copies)."""
+    color: tuple = (80, 80, 80)
+    radius: tuple = (4, 10)          # px, picked per particle from this range
+    growth: float = 0.0              # px per second (smoke swells, embers shrink)
+    alpha: int = 180
+    fade: tuple = (100, 130)         # alpha lost per second
+    lifetime: tuple = (0.8, 1.6)     # seconds
+    speed: tuple = (0.0, 0.0)        # px per second
+    direction: float = -math.pi / 2  # heading when emit() is given no angle (up)
+    spread: float = 0.0              # +/- radians around the heading
+    gravity: float = 0.0             # px/s^2 added to vy (positive is down)
+    jitter: tuple = (0, 0)           # +/- px spawn offset in x, y
+    rate: float = 0.0                # particles per second for ParticleSystem.emit_over
@@ -0,0 +1,61 @@
+# texture_atlas.py
+import json
+import os
+import pygame
+
+
+class TextureAtlas:
+    """
+    Sprite frames packed into a few large page images (see
+    tools/build_atlas.py), looked up by the path each frame was packed from,
+    e.g. "assets/rat/rat_00.png".
+
+    `frame(name)` hands out a subsurface of its page, so every frame shares
+    the page's pixels and blitting many frames reads from one source
+    surface. The same Surface object is returned for a name every time.
+    """
+
+    def __init__(self, pages, frames):
+        self.pages = pages      # [Surface]
+        self.frames = frames    # name -> (page index, Rect)
+        self._subsurfaces = {}
+
+    @classmethod
+    def load(cls, index_path):
+        """Read an atlas index (JSON) and load its pages, which sit next to it."""
+        with open(index_path) as f:
+            index = json.load(f)
+        folder = os.path.dirname(index_path)
+        pages = [pygame.image.load(os.path.join(folder, page)).convert_alpha()
+                 for page in index["pages"]]
+        frames = {name: (page, pygame.Rect(x, y, w, h))
+                  for name, (page, x, y, w, h) in index["frames"].items()}
+        return cls(pages, frames)
+
+    def __contains__(self, name):
+        return name in self.frames
+
+    def __len__(self):
+        return len(self.frames)
+
+    def frame(self, name):
+        surface = self._subsurfaces.get(name)
+        if surface is None:
+            page, rect = self.frames[name]
+            surface = self.pages[page].subsurface(rect)
+            self._subsurfaces[name] = surface
+        return surface
+
+    def page_bytes(self):
+        return sum(p.get_width() * p.get_height() * p.get_bytesize() for p in self.pages)
+
+
+def load_atlas(index_path="assets/atlas/atlas.json"):
+    """The built atlas, or None if it hasn't been built (assets then load file by file)."""
+    if not os.path.exists(index_path):
+        return None
+    try:
+        return TextureAtlas.load(index_path)
+    except (pygame.error, OSError, ValueError, KeyError) as e:
+        print(f"⚠ Could not load texture atlas {index_path}: {e}")
+        return None
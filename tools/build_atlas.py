@@ -0,0 +1,111 @@
+# tools/build_atlas.py
+"""
+Pack the game's sprite frames into atlas pages plus a JSON index that
+texture_atlas.TextureAtlas loads at startup (main.py registers it with
+asset_manager.ASSETS, which then slices frames out of the pages instead of
+opening one PNG per frame).
+
+Frames are keyed by the path the game loads them from, so nothing else
+needs to change when a sprite moves into the atlas. Rebuild whenever a
+sprite is added or edited; delete the output folder to go back to loose
+files.
+
+Run from the repo root:  python tools/build_atlas.py [--out assets/atlas] [--size 1024] [folders...]
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+# Folders whose PNGs are animation frames (larva frames live in assets/fly)
+SOURCES = ["assets/rat", "assets/fly", "assets/mech", "assets/fire", "assets/ratNest"]
+
+PADDING = 1  # transparent pixels between frames
+
+
+def collect(folders):
+    images = {}
+    for folder in folders:
+        paths = sorted(glob.glob(os.path.join(folder, "*.png")))
+        if not paths:
+            print(f"⚠ No frames in {folder}, skipped")
+        for path in paths:
+            images[path.replace(os.sep, "/")] = pygame.image.load(path)
+    return images
+
+
+def pack(sizes, page_size):
+    """
+    Shelf-pack {name: (w, h)} into pages of at most page_size x page_size.
+    Returns ([(w, h) used per page], {name: (page, x, y)}).
+    """
+    placed = {}
+    pages = []
+    page, x, y, shelf_h, used_w = 0, 0, 0, 0, 0
+    # Tallest first keeps the shelves tight
+    for name, (w, h) in sorted(sizes.items(), key=lambda item: (-item[1][1], item[0])):
+        if w > page_size or h > page_size:
+            raise ValueError(f"{name} ({w}x{h}) does not fit a {page_size}px page")
+        if x + w > page_size:                     # next shelf
+            x, y, shelf_h = 0, y + shelf_h + PADDING, 0
+        if y + h > page_size:                     # next page
+            pages.append((used_w, y - PADDING))
+            page, x, y, shelf_h, used_w = page + 1, 0, 0, 0, 0
+        placed[name] = (page, x, y)
+        x += w + PADDING
+        shelf_h = max(shelf_h, h)
+        used_w = max(used_w, x - PADDING)
+    if placed:
+        pages.append((used_w, y + shelf_h))
+    return pages, placed
+
+
+def build(folders, out_dir, page_size):
+    images = collect(folders)
+    if not images:
+        print("Nothing to pack.")
+        return 1
+    page_sizes, placed = pack({name: img.get_size() for name, img in images.items()}, page_size)
+
+    pages = [pygame.Surface(size, pygame.SRCALPHA) for size in page_sizes]
+    for page in pages:
+        page.fill((0, 0, 0, 0))
+    frames = {}
+    for name, (page, x, y) in placed.items():
+        image = images[name]
+        pages[page].blit(image, (x, y))
+        frames[name] = [page, x, y, image.get_width(), image.get_height()]
+
+    os.makedirs(out_dir, exist_ok=True)
+    page_names = []
+    for i, page in enumerate(pages):
+        page_names.append(f"atlas_{i}.png")
+        pygame.image.save(page, os.path.join(out_dir, page_names[-1]))
+    with open(os.path.join(out_dir, "atlas.json"), "w") as f:
+        json.dump({"pages": page_names, "frames": frames}, f, indent=1, sort_keys=True)
+
+    area = sum(w * h for w, h in page_sizes)
+    used = sum(w * h for _, _, _, w, h in frames.values())
+    print(f"Packed {len(frames)} frames into {len(pages)} page(s) "
+          f"{', '.join(f'{w}x{h}' for w, h in page_sizes)} ({used / area:.0%} filled) -> {out_dir}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("folders", nargs="*", default=SOURCES)
+    parser.add_argument("--out", default="assets/atlas")
+    parser.add_argument("--size", type=int, default=1024, help="largest page width/height")
+    args = parser.parse_args()
+
+    pygame.init()
+    return build(args.folders, args.out, args.size)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+# visibility_polygon.py
+import math
+import numpy as np
+
+TAU = 2.0 * math.pi
+
+
+def rect_segments(rects):
+    """The four edges of every rect as an (N * 4, 4) float array of [ax, ay, bx, by]."""
+    segs = []
+    for r in rects:
+        l, t, rt, b = r.left, r.top, r.right, r.bottom
+        segs.extend(((l, t, rt, t), (rt, t, rt, b), (rt, b, l, b), (l, b, l, t)))
+    return np.array(segs, dtype=np.float64).reshape(-1, 4)
+
+
+class SightPolygon:
+    """
+    What can be seen from (x, y): for rays sorted by angle (relative to
+    `start`, spanning `span` radians) the distance each one travels before a
+    wall or the radius stops it. The outline is star-shaped around the
+    origin, so containment is a binary search plus one edge intersection.
+    """
+
+    def __init__(self, x, y, start, span, rel_angles, dists):
+        self.x = x
+        self.y = y
+        self.start = start
+        self.span = span
+        self.full = span >= TAU
+        self.rel_angles = rel_angles
+        self.dists = dists
+        # Vertices relative to the origin
+        self.px = np.cos(start + rel_angles) * dists
+        self.py = np.sin(start + rel_angles) * dists
+
+    # -------------------------------------------------------------------------
+    def points(self):
+        """Outline vertices in world space, in angle order."""
+        return list(zip((self.px + self.x).tolist(), (self.py + self.y).tolist()))
+
+    def fan(self):
+        """Outline for drawing: the origin first when this is a sector."""
+        pts = self.points()
+        return pts if self.full else [(self.x, self.y)] + pts
+
+    def bounds(self):
+        """(left, top, right, bottom) of the outline, origin included."""
+        xs = self.px + self.x
+        ys = self.py + self.y
+        return (min(xs.min(), self.x), min(ys.min(), self.y),
+                max(xs.max(), self.x), max(ys.max(), self.y))
+
+    def contains(self, px, py):
+        """
+        Vectorized point test. px, py are arrays of world coordinates;
+        returns (inside mask, distance from the origin).
+        """
+        vx = np.asarray(px, dtype=np.float64) - self.x
+        vy = np.asarray(py, dtype=np.float64) - self.y
+        dist = np.hypot(vx, vy)
+        rel = np.mod(np.arctan2(vy, vx) - self.start, TAU)
+        inside = (rel <= self.span) & (dist <= self._reach(rel))
+        inside |= dist == 0
+        return inside, dist
+
+    def reach(self, angles):
+        """Vectorized distance from the origin to the outline along world `angles` (0 outside the span)."""
+        rel = np.mod(np.asarray(angles, dtype=np.float64) - self.start, TAU)
+        return np.where(rel <= self.span, self._reach(rel), 0.0)
+
+    def _reach(self, rel):
+        i = np.clip(np.searchsorted(self.rel_angles, rel, side="right") - 1, 0, len(self.rel_angles) - 2)
+        ax, ay = self.px[i], self.py[i]
+        ex, ey = self.px[i + 1] - ax, self.py[i + 1] - ay
+        ux, uy = np.cos(rel + self.start), np.sin(rel + self.start)
+        denom = ux * ey - uy * ex
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(np.abs(denom) > 1e-9, (ax * ey - ay * ex) / denom,
+                            np.maximum(self.dists[i], self.dists[i + 1]))
+
+
+class ShadowCaster:
+    """
+    Builds SightPolygons from wall segments.
+
+    The static walls are split into segments once; active barricades are
+    passed per call (usually ObstacleSet.barricade_rects) and their
+    segments are cached until that tuple changes. Rays go to both sides of
+    every nearby segment endpoint plus regular arc samples, and all of them
+    are intersected with all nearby segments in one NumPy pass.
+    """
+
+    def __init__(self, walls, arc_step=math.radians(3.0)):
+        self.segments = rect_segments(walls)
+        self.arc_step = arc_step
+        self._barricade_rects = ()
+        self._barricade_segments = np.zeros((0, 4))
+
+    def _segments(self, barricades):
+        if barricades is not self._barricade_rects:
+            self._barricade_rects = barricades
+            self._barricade_segments = rect_segments(barricades)
+        if len(self._barricade_segments):
+            return np.concatenate([self.segments, self._barricade_segments])
+        return self.segments
+
+    # -------------------------------------------------------------------------
+    def cast(self, x, y, radius, start=None, end=None, barricades=()):
+        """
+        Visibility from (x, y) out to `radius`, over the sector start..end
+        (radians, clockwise in screen space) or the full circle when omitted.
+        """
+        if start is None or end is None:
+            start, span = -math.pi, TAU
+        else:
+            span = min(TAU, end - start)
+
+        segs = self._segments(barricades)
+        # Only segments whose bounding box touches the circle
+        near = ((np.minimum(segs[:, 0], segs[:, 2]) <= x + radius) &
+                (np.maximum(segs[:, 0], segs[:, 2]) >= x - radius) &
+                (np.minimum(segs[:, 1], segs[:, 3]) <= y + radius) &
+                (np.maximum(segs[:, 1], segs[:, 3]) >= y - radius))
+        segs = segs[near] - (x, y, x, y)
+
+        # Ray angles (relative to start): just either side of each endpoint,
+        # the sector edges, and arc samples so the round part stays round
+        ends = np.concatenate([segs[:, :2], segs[:, 2:]])
+        corner = np.mod(np.arctan2(ends[:, 1], ends[:, 0]) - start, TAU)
+        eps = 1e-4
+        rel = np.concatenate([
+            corner - eps, corner, corner + eps,
+            np.arange(0.0, span, self.arc_step), [span],
+        ])
+        rel = np.unique(rel[(rel >= 0.0) & (rel <= span)])
+
+        theta = rel + start
+        dx = np.cos(theta)[:, None]
+        dy = np.sin(theta)[:, None]
+        dists = np.full(len(rel), float(radius))
+        if len(segs):
+            qx, qy = segs[:, 0], segs[:, 1]
+            sx, sy = segs[:, 2] - qx, segs[:, 3] - qy
+            denom = dx * sy - dy * sx
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t = (qx * sy - qy * sx) / denom
+                u = (qx * dy - qy * dx) / denom
+            hit = (np.abs(denom) > 1e-12) & (t >= 0.0) & (u >= 0.0) & (u <= 1.0)
+            t = np.where(hit, t, np.inf).min(axis=1)
+            dists = np.minimum(dists, t)
+
+        return SightPolygon(x, y, start, span, rel, dists)
+
+
+class PlayerSight:
+    """
+    The player's wall-clipped view out to `radius`: one full-circle
+    SightPolygon from the level's ShadowCaster and active barricades, for
+    the fog (GridFogOfWar.reveal_polygon). It stops at the reveal radius, so
+    enemy culling tests wall occlusion instead (LineOfSightBatch).
+
+    `update` is called every frame but only recasts when the player moves to
+    another `cell_size` cell or a barricade opens/closes (via
+    ObstacleSet.version); it returns True when the polygon is new.
+    """
+
+    def __init__(self, obstacles, radius=250, cell_size=16):
+        self.obstacles = obstacles
+        self.radius = radius
+        self.cell_size = cell_size
+        self.polygon = None
+        self._key = None
+
+    def update(self, x, y):
+        barricades = self.obstacles.barricade_rects  # refreshes `version` first
+        key = (int(x // self.cell_size), int(y // self.cell_size), self.obstacles.version)
+        if key == self._key:
+            return False
+        self._key = key
+        self.polygon = self.obstacles.shadows.cast(x, y, self.radius, barricades=barricades)
+        return True
+
+    def visible(self, xs, ys):
+        """Vectorized: which points the player can see (all of them before the first update)."""
+        if self.polygon is None:
+            return np.ones(len(xs), dtype=bool)
+        return self.polygon.contains(xs, ys)[0]
+
+    def reset(self):
+        self.polygon = None
+        self._key = None
@@ -0,0 +1,232 @@
+# visibility_table.py
+import numpy as np
+from barricade import Barricade
+
+# Cell-pair verdicts stored in the table
+HIDDEN = 0    # every segment between the two cells crosses a wall
+VISIBLE = 1   # no wall touches the convex hull of the two cells
+PARTIAL = 2   # depends on the exact points -> run the ray test
+
+
+class VisibilityTable:
+    """
+    Potentially-visible-set for a static wall layout.
+
+    The level is split into square cells and every cell pair is baked once
+    into HIDDEN / VISIBLE / PARTIAL. Both verdicts are conservative:
+    VISIBLE means no wall touches the convex hull of the two cells, HIDDEN
+    means a run of walls covers a whole grid line every segment between the
+    cells has to cross. Anything else is PARTIAL and falls back to an exact ray.
+
+    Barricades are not baked in. They can only turn VISIBLE pairs into
+    PARTIAL ones, which is tracked in a small overlay that is thrown away
+    whenever a barricade opens or closes (see Barricade.state_version).
+    """
+
+    def __init__(self, walls, width, height, cell_size=128, line_step=16):
+        # Candidate lines must land on cell edges, and 16px lines always
+        # cross the 33px-thick apartment walls
+        assert cell_size % line_step == 0
+        self.cell_size = cell_size
+        self.cols = -(-int(width) // cell_size)
+        self.rows = -(-int(height) // cell_size)
+        self.width = int(width)
+        self.height = int(height)
+
+        # int32 [x0, y0, x1, y1] for every wall
+        self.wall_boxes = np.array(
+            [(w.left, w.top, w.right, w.bottom) for w in walls], dtype=np.int32
+        ).reshape(-1, 4)
+
+        n = self.cols * self.rows
+        self.table = np.full((n, n), PARTIAL, dtype=np.int8)
+        self._bake(line_step)
+
+        # Barricade overlay: (cell_a, cell_b) -> verdict with barricades applied
+        self._overlay = {}
+        self._overlay_version = -1
+
+    # -------------------------------------------------------------------------
+    def cell_of(self, x, y):
+        """Flat cell index for a point, or None if it lies outside the grid."""
+        if x < 0 or y < 0:
+            return None
+        cx = int(x // self.cell_size)
+        cy = int(y // self.cell_size)
+        if cx >= self.cols or cy >= self.rows:
+            return None
+        return cy * self.cols + cx
+
+    def lookup(self, x0, y0, x1, y1, barricades=None):
+        """
+        Answer a line-of-sight query from the table.
+        Returns True / False, or None when the exact ray test is needed.
+        """
+        a = self.cell_of(x0, y0)
+        b = self.cell_of(x1, y1)
+        if a is None or b is None:
+            return None
+
+        verdict = self.table[a, b]
+        if verdict == HIDDEN:
+            return False
+        if verdict == PARTIAL:
+            return None
+
+        if barricades:
+            verdict = self._overlay_verdict(a, b, barricades)
+            if verdict == PARTIAL:
+                return None
+        return True
+
+    # -------------------------------------------------------------------------
+    def _overlay_verdict(self, a, b, barricades):
+        """VISIBLE pairs whose hull touches an active barricade drop to PARTIAL."""
+        if self._overlay_version != Barricade.state_version:
+            self._overlay.clear()
+            self._overlay_version = Barricade.state_version
+
+        key = (a, b) if a <= b else (b, a)
+        verdict = self._overlay.get(key)
+        if verdict is None:
+            verdict = VISIBLE
+            for barricade in barricades:
+                if barricade.active and self._hull_touches(key[0], key[1], barricade.rect):
+                    verdict = PARTIAL
+                    break
+            self._overlay[key] = verdict
+        return verdict
+
+    def _hull_touches(self, a, b, rect):
+        """Separating-axis test of rect against the convex hull of cells a and b."""
+        cs = self.cell_size
+        ax, ay = (a % self.cols) * cs, (a // self.cols) * cs
+        bx, by = (b % self.cols) * cs, (b // self.cols) * cs
+        if max(ax, bx) + cs < rect.left or rect.right < min(ax, bx):
+            return False
+        if max(ay, by) + cs < rect.top or rect.bottom < min(ay, by):
+            return False
+
+        ox, oy = bx - ax, by - ay
+        if ox == 0 or oy == 0:
+            return True
+        nx, ny = -oy, ox
+        hull = [nx * px + ny * py for px in (ax, ax + cs) for py in (ay, ay + cs)]
+        box = [nx * px + ny * py for px in (rect.left, rect.right) for py in (rect.top, rect.bottom)]
+        return not (max(hull) < min(box) or max(box) < min(hull))
+
+    # -------------------------------------------------------------------------
+    def _bake(self, line_step):
+        cs = self.cell_size
+        cols, rows = self.cols, self.rows
+        gx, gy = np.meshgrid(np.arange(cols), np.arange(rows))
+        gx = gx.ravel()
+        gy = gy.ravel()
+
+        # Run ends of blocked spans along vertical (x = k * line_step) and
+        # horizontal (y = k * line_step) grid lines
+        v_cover = self._line_cover(self.wall_boxes, self.width, self.height, line_step)
+        h_cover = self._line_cover(self.wall_boxes[:, [1, 0, 3, 2]], self.height, self.width, line_step)
+
+        for di in range(0, cols):
+            for dj in range(-(rows - 1), rows):
+                if di == 0 and dj < 0:
+                    continue  # symmetric pair already handled
+                keep = (gx + di < cols) & (gy + dj >= 0) & (gy + dj < rows)
+                ax, ay = gx[keep], gy[keep]
+                a = ay * cols + ax
+                b = (ay + dj) * cols + (ax + di)
+
+                verdict = np.full(a.shape, PARTIAL, dtype=np.int8)
+                verdict[self._hull_clear(ax * cs, ay * cs, di * cs, dj * cs)] = VISIBLE
+
+                hidden = np.zeros(a.shape, dtype=bool)
+                if di >= 1:
+                    hidden |= self._separated(v_cover, ax * cs, ay * cs, di, dj, line_step, self.height)
+                if abs(dj) >= 1:
+                    # Swap axes; for dj < 0 walk from B to A so the offset is positive
+                    if dj > 0:
+                        hidden |= self._separated(h_cover, ay * cs, ax * cs, dj, di, line_step, self.width)
+                    else:
+                        hidden |= self._separated(h_cover, (ay + dj) * cs, (ax + di) * cs,
+                                                  -dj, -di, line_step, self.width)
+                verdict[hidden] = HIDDEN
+
+                self.table[a, b] = verdict
+                self.table[b, a] = verdict
+
+    def _hull_clear(self, ax, ay, ox, oy):
+        """Per cell position: True if no wall touches hull(A, A + offset)."""
+        cs = self.cell_size
+        w = self.wall_boxes
+        if len(w) == 0:
+            return np.ones(ax.shape, dtype=bool)
+
+        hx0 = (ax + min(0, ox))[:, None]
+        hx1 = (ax + cs + max(0, ox))[:, None]
+        hy0 = (ay + min(0, oy))[:, None]
+        hy1 = (ay + cs + max(0, oy))[:, None]
+        apart = (hx1 < w[:, 0]) | (w[:, 2] < hx0) | (hy1 < w[:, 1]) | (w[:, 3] < hy0)
+
+        if ox != 0 and oy != 0:
+            # Hull edges parallel to the offset: project on its normal
+            nx, ny = -oy, ox
+            wx = np.stack([w[:, 0], w[:, 2]], axis=1) * nx
+            wy = np.stack([w[:, 1], w[:, 3]], axis=1) * ny
+            wproj = (wx[:, :, None] + wy[:, None, :]).reshape(len(w), 4)
+            w_min, w_max = wproj.min(axis=1), wproj.max(axis=1)
+            corners = [(0, 0), (cs, 0), (0, cs), (cs, cs)]
+            hproj = np.stack([nx * (ax + cx) + ny * (ay + cy) for cx, cy in corners], axis=1)
+            h_min = hproj.min(axis=1)[:, None]
+            h_max = hproj.max(axis=1)[:, None]
+            apart |= (h_max < w_min) | (w_max < h_min)
+
+        return apart.all(axis=1)
+
+    @staticmethod
+    def _line_cover(boxes, extent, span, step):
+        """
+        For grid lines at u = k * step (u along `extent`), an array of shape
+        (lines, span + 1) holding, at each v, the last v still inside the same
+        run of walls crossing that line, or -1 if v is open.
+        """
+        lines = extent // step + 1
+        cover = np.full((lines, span + 1), -1, dtype=np.int32)
+        v = np.arange(span + 1)
+        for k in range(lines):
+            u = k * step
+            on_line = boxes[(boxes[:, 0] <= u) & (u <= boxes[:, 2])]
+            blocked = np.zeros(span + 1, dtype=bool)
+            for _, v0, _, v1 in on_line:
+                blocked[max(0, v0):min(span, v1) + 1] = True
+            if not blocked.any():
+                continue
+            # run end = next open index - 1, scanning from the far end
+            nxt_open = np.where(blocked, span + 1, v)
+            nxt_open = np.minimum.accumulate(nxt_open[::-1])[::-1]
+            cover[k] = np.where(blocked, nxt_open - 1, -1)
+        return cover
+
+    def _separated(self, cover, au, av, du, dv, step, span):
+        """
+        Cells A at (au, av) and B = A + (du, dv) cells, with du >= 1 along u.
+        True where some grid line between them is blocked over the whole span
+        of v that segments from A to B can occupy when they cross it.
+        """
+        cs = self.cell_size
+        length = du * cs
+        dv_px = dv * cs
+
+        # Candidate lines from A's far edge to B's near edge (rows) per cell (cols)
+        offset = np.arange(0, (du - 1) * cs + 1, step)[:, None]
+        w_min = offset / length
+        w_max = (offset + cs) / length
+        lo = av[None, :] + np.minimum(dv_px * w_min, dv_px * w_max)
+        hi = av[None, :] + cs + np.maximum(dv_px * w_min, dv_px * w_max)
+
+        line = (au[None, :] + cs + offset) // step
+        valid = (line < cover.shape[0]) & (lo >= 0) & (hi <= span)
+        line = np.where(valid, line, 0)
+        lo_i = np.clip(np.floor(lo).astype(np.int64), 0, span)
+        hi_i = np.clip(np.ceil(hi).astype(np.int64), 0, span)
+        return (valid & (cover[line, lo_i] >= hi_i)).any(axis=0)